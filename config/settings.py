@@ -158,7 +158,44 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 50,
 }
 
+# Read API response cache: seconds to keep a response (0 disables). Local memory by default; set CACHE_URL
+# (e.g. redis://redis:6379/1) to share one cache, and its invalidations, between web and worker processes
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", "300"))
+CACHE_URL = os.getenv("CACHE_URL", "")
+if CACHE_URL:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": CACHE_URL}}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "climate-summariser"}}
+# In-process series cache for /api/series/ and summaries: memory ceiling per worker in bytes (0 disables) and
+# the longest an entry is served before rechecking the database
+SERIES_CACHE_MAX_BYTES = int(os.getenv("SERIES_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SERIES_CACHE_TIMEOUT = int(os.getenv("SERIES_CACHE_TIMEOUT", "300"))
+# Longest each process uses its in-memory regions/parameters before reloading them
+REFERENCE_CACHE_TIMEOUT = int(os.getenv("REFERENCE_CACHE_TIMEOUT", "60"))
+
 METOFFICE_BASE_URL = "https://www.metoffice.gov.uk/pub/data/weather/uk/climate/datasets"
+# Concurrent ingestion: download threads and max requests/second per host (0 = unlimited)
+METOFFICE_INGEST_WORKERS = int(os.getenv("METOFFICE_INGEST_WORKERS", "4"))
+METOFFICE_HOST_RATE_LIMIT = float(os.getenv("METOFFICE_HOST_RATE_LIMIT", "4"))
+# Shared HTTP session for dataset downloads: pool size, timeouts (seconds), retries on 429/5xx with backoff
+METOFFICE_HTTP_POOL_SIZE = int(os.getenv("METOFFICE_HTTP_POOL_SIZE", "10"))
+METOFFICE_HTTP_CONNECT_TIMEOUT = float(os.getenv("METOFFICE_HTTP_CONNECT_TIMEOUT", "5"))
+METOFFICE_HTTP_READ_TIMEOUT = float(os.getenv("METOFFICE_HTTP_READ_TIMEOUT", "30"))
+METOFFICE_HTTP_RETRIES = int(os.getenv("METOFFICE_HTTP_RETRIES", "3"))
+METOFFICE_HTTP_BACKOFF = float(os.getenv("METOFFICE_HTTP_BACKOFF", "0.5"))
+# Raw dataset mirror (off unless a directory is set): serve copies younger than TTL seconds without a request (0 = always
+# revalidate), evict entries older than MAX_AGE_DAYS and the oldest ones beyond MAX_MB; unreferenced payloads
+# are only deleted once older than PRUNE_GRACE seconds, as another worker may be about to index them
+METOFFICE_MIRROR_DIR = os.getenv("METOFFICE_MIRROR_DIR", "")
+METOFFICE_MIRROR_TTL = int(os.getenv("METOFFICE_MIRROR_TTL", "0"))
+METOFFICE_MIRROR_MAX_AGE_DAYS = int(os.getenv("METOFFICE_MIRROR_MAX_AGE_DAYS", "90"))
+METOFFICE_MIRROR_MAX_MB = int(os.getenv("METOFFICE_MIRROR_MAX_MB", "512"))
+METOFFICE_MIRROR_PRUNE_GRACE = int(os.getenv("METOFFICE_MIRROR_PRUNE_GRACE", "600"))
+# Streaming ingestion: parse and persist the body in batches of N year rows while it downloads. Memory stays
+# flat, but each body downloads on the writer thread, so datasets are ingested one at a time and
+# METOFFICE_INGEST_WORKERS is ignored
+METOFFICE_STREAM_INGEST = env_bool("METOFFICE_STREAM_INGEST", default=False)
+METOFFICE_STREAM_BATCH_ROWS = int(os.getenv("METOFFICE_STREAM_BATCH_ROWS", "200"))
 
 # Celery / task processing
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
@@ -166,6 +203,11 @@ CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
 CELERY_TASK_DEFAULT_QUEUE = os.getenv("CELERY_TASK_DEFAULT_QUEUE", "default")
 CELERY_TASK_ALWAYS_EAGER = env_bool("CELERY_TASK_ALWAYS_EAGER", default=False)
 CELERY_TASK_EAGER_PROPAGATES = env_bool("CELERY_TASK_EAGER_PROPAGATES", default=True)
+# Run /api/ingest/ jobs inside the request instead of queueing them (for setups without a worker)
+INGEST_INLINE = env_bool("INGEST_INLINE", default=False)
+# Per-dataset subtasks: retries on transient download errors, base backoff in seconds (doubles each retry)
+METOFFICE_TASK_MAX_RETRIES = int(os.getenv("METOFFICE_TASK_MAX_RETRIES", "3"))
+METOFFICE_TASK_RETRY_BACKOFF = int(os.getenv("METOFFICE_TASK_RETRY_BACKOFF", "10"))
 
 # Database locking tolerances (useful for SQLite dev setups)
 DB_LOCK_RETRY_ATTEMPTS = int(os.getenv("DB_LOCK_RETRY_ATTEMPTS", "5"))
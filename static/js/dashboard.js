@@ -1,7 +1,3 @@
-const MONTH_ORDER = [
-  "jan","feb","mar","apr","may","jun","jul","aug","sep","oct","nov","dec"
-];
-
 document.addEventListener("DOMContentLoaded", () => {
   const config = window.dashboardConfig || {};
   const regionSelect = document.getElementById("regionSelect");
@@ -21,6 +17,11 @@ document.addEventListener("DOMContentLoaded", () => {
 
   if (config.defaultRegion) regionSelect.value = config.defaultRegion;
   if (config.defaultParameter) parameterSelect.value = config.defaultParameter;
+  if (config.defaultPeriodType) periodTypeSelect.value = config.defaultPeriodType;
+
+  // Payload for the default selection, embedded by DashboardView.
+  const bootstrapElement = document.getElementById("dashboard-data");
+  const bootstrap = bootstrapElement ? JSON.parse(bootstrapElement.textContent) : null;
 
   let chartInstance;
 
@@ -36,54 +37,39 @@ document.addEventListener("DOMContentLoaded", () => {
     params.set("region", regionSelect.value);
     params.set("parameter", parameterSelect.value);
     params.set("period_type", periodTypeSelect.value);
-    params.set("ordering", "year,period");
-    params.set("limit", "5000");
+    if (config.chartPoints) params.set("max_points", config.chartPoints);
     if (startYearInput.value) params.set("start_year", startYearInput.value);
     if (endYearInput.value) params.set("end_year", endYearInput.value);
     return params;
   }
 
-  function updateTable(records, total) {
-    if (!records.length) {
+  function updateTable(table, total) {
+    if (!table.year.length) {
       tableBody.innerHTML = `<tr><td colspan="3">No data available.</td></tr>`;
       tableMeta.textContent = "0 rows";
       return;
     }
 
-    tableBody.innerHTML = records
+    tableBody.innerHTML = table.year
       .map(
-        (record) => `
+        (year, index) => `
       <tr>
-        <td>${record.year}</td>
-        <td>${record.period.toUpperCase()}</td>
-        <td>${formatValue(record.value)}</td>
+        <td>${year}</td>
+        <td>${table.period[index].toUpperCase()}</td>
+        <td>${formatValue(table.value[index])}</td>
       </tr>`
       )
       .join("");
 
-    tableMeta.textContent = `${records.length} of ${total} rows`;
-  }
-
-  function periodToOrder(record) {
-    if (record.period_type === "month") {
-      return MONTH_ORDER.indexOf(record.period.toLowerCase());
-    }
-    const order = { win: 0, spr: 1, sum: 2, aut: 3, ann: 4 };
-    return order[record.period.toLowerCase()] ?? 0;
+    tableMeta.textContent = `Newest ${table.year.length} of ${total} rows`;
   }
 
-  function updateChart(records) {
-    const sorted = [...records].sort((a, b) => {
-      if (a.year === b.year) {
-        return periodToOrder(a) - periodToOrder(b);
-      }
-      return a.year - b.year;
-    });
-
-    const labels = sorted.map(
-      (record) => `${record.year}-${record.period.toUpperCase()}`
+  function updateChart(payload) {
+    // The series arrives in chronological order.
+    const labels = payload.year.map(
+      (year, index) => `${year}-${payload.period[index].toUpperCase()}`
     );
-    const values = sorted.map((record) => Number(record.value));
+    const values = payload.value;
 
     const ctx = document.getElementById("climateChart").getContext("2d");
     if (chartInstance) {
@@ -127,7 +113,10 @@ document.addEventListener("DOMContentLoaded", () => {
     const periodLabel = periodTypeSelect.options[
       periodTypeSelect.selectedIndex
     ].text;
-    chartMeta.textContent = `${periodLabel} values (${records.length} points)`;
+    const shown = payload.downsampled_from
+      ? `${payload.count} of ${payload.downsampled_from} points`
+      : `${payload.count} points`;
+    chartMeta.textContent = `${periodLabel} values (${shown})`;
   }
 
   function updateSummary(summary) {
@@ -143,34 +132,34 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
+  function render(payload) {
+    updateTable(payload.table, payload.summary.count ?? 0);
+    updateChart(payload);
+    updateSummary(payload.summary);
+  }
+
+  function isDefaultSelection() {
+    return (
+      regionSelect.value === config.defaultRegion &&
+      parameterSelect.value === config.defaultParameter &&
+      periodTypeSelect.value === config.defaultPeriodType &&
+      !startYearInput.value &&
+      !endYearInput.value
+    );
+  }
+
   async function refreshData() {
     const params = buildQuery();
-    const recordsUrl = `${config.endpoints.records}?${params.toString()}`;
-    const summaryUrl = `${config.endpoints.summary}?${params.toString()}`;
+    const dashboardUrl = `${config.endpoints.dashboard}?${params.toString()}`;
 
     tableBody.innerHTML = `<tr><td colspan="3">Loading...</td></tr>`;
 
     try {
-      const [recordsResponse, summaryResponse] = await Promise.all([
-        fetch(recordsUrl),
-        fetch(summaryUrl),
-      ]);
-
-      if (!recordsResponse.ok) {
-        throw new Error("Failed to fetch records");
+      const response = await fetch(dashboardUrl);
+      if (!response.ok) {
+        throw new Error("Failed to fetch dashboard data");
       }
-
-      const recordsPayload = await recordsResponse.json();
-      const summaryPayload = summaryResponse.ok
-        ? await summaryResponse.json()
-        : { count: 0 };
-
-      const records = recordsPayload.results ?? recordsPayload;
-      const total = recordsPayload.count ?? records.length;
-
-      updateTable(records, total);
-      updateChart(records);
-      updateSummary(summaryPayload);
+      render(await response.json());
     } catch (error) {
       console.error(error);
       tableBody.innerHTML = `<tr><td colspan="3">Error loading data.</td></tr>`;
@@ -200,6 +189,10 @@ document.addEventListener("DOMContentLoaded", () => {
   });
 
   setActiveGroup();
-  refreshData();
+  if (bootstrap && isDefaultSelection()) {
+    render(bootstrap);
+  } else {
+    refreshData();
+  }
 });
 
@@ -1,6 +1,9 @@
+from collections import defaultdict
+
 from django.contrib import admin
 
-from .models import ClimateRecord, Parameter, Region
+from .models import ClimateRecord, ClimateRollup, ClimateSeries, DatasetFetchState, IngestJob, Parameter, Region
+from .services import api_cache, rollups, series
 
 
 @admin.register(Region)
@@ -18,5 +21,58 @@ class ParameterAdmin(admin.ModelAdmin):
 @admin.register(ClimateRecord)
 class ClimateRecordAdmin(admin.ModelAdmin):
     list_display = ("region", "parameter", "year", "period_type", "period", "value")
+    ordering = ("parameter", "region", "year", "period")
     list_filter = ("period_type", "region", "parameter")
     search_fields = ("region__code", "parameter__code", "year", "period")
+
+    # Ingestion keeps rollups, the series store and cached API responses
+    # current; edits made here refresh the periods they touch, before and
+    # after the edit when it moves a record to another dataset or period.
+    def save_model(self, request, obj, form, change):
+        original = ClimateRecord.objects.filter(pk=obj.pk).first() if change else None
+        super().save_model(request, obj, form, change)
+        _refresh_record_rollups([obj] if original is None else [original, obj])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        _refresh_record_rollups([obj])
+
+    def delete_queryset(self, request, queryset):
+        records = list(queryset)
+        super().delete_queryset(request, queryset)
+        _refresh_record_rollups(records)
+
+
+def _refresh_record_rollups(records) -> None:
+    periods = defaultdict(set)
+    for record in records:
+        periods[(record.region_id, record.parameter_id)].add((record.period_type, record.period))
+    for (region_id, parameter_id), keys in periods.items():
+        rollups.refresh_rollups(region_id, parameter_id, keys)
+        series.refresh_store(region_id, parameter_id, {period_type for period_type, _ in keys})
+    api_cache.invalidate_records(records)
+
+
+@admin.register(DatasetFetchState)
+class DatasetFetchStateAdmin(admin.ModelAdmin):
+    list_display = ("region", "parameter", "source_last_updated", "checked_at", "changed_at")
+    list_filter = ("region", "parameter")
+
+
+@admin.register(ClimateRollup)
+class ClimateRollupAdmin(admin.ModelAdmin):
+    list_display = ("region", "parameter", "period_type", "period", "count", "first_year", "last_year", "updated_at")
+    list_filter = ("period_type", "region", "parameter")
+
+
+@admin.register(ClimateSeries)
+class ClimateSeriesAdmin(admin.ModelAdmin):
+    list_display = ("region", "parameter", "period_type", "first_year", "source_last_updated", "updated_at")
+    list_filter = ("period_type", "region", "parameter")
+    exclude = ("values",)
+
+
+@admin.register(IngestJob)
+class IngestJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "region", "parameter", "status", "created_at", "finished_at")
+    list_filter = ("status", "region", "parameter")
@@ -1,39 +1,161 @@
+import time
+import uuid
+
+from django.conf import settings
 from django.db.models import Avg, Max, Min
-from rest_framework import status, viewsets
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django_filters.rest_framework import DjangoFilterBackend
+from kombu.exceptions import OperationalError as BrokerError
+from rest_framework import generics, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 
 from .filters import ClimateRecordFilter
-from .models import ClimateRecord, Parameter, Region
+from .models import ClimateRecord, IngestJob, Parameter, Region
+from .pagination import KeysetPagination
+from .renderers import StreamingJSONRenderer
 from .serializers import (
+    CLIMATE_RECORD_VALUES,
+    AnomalyQuerySerializer,
     ClimateRecordSerializer,
+    ComparisonQuerySerializer,
+    DownsampleQuerySerializer,
+    IngestJobSerializer,
     IngestRequestSerializer,
     IngestTriggerSerializer,
     ParameterSerializer,
     RegionSerializer,
+    RollingMeanQuerySerializer,
+    TrendQuerySerializer,
+    climate_record_rows,
 )
-from .services import metoffice
-from .tasks import ingest_metoffice_task
+from .services import analytics, api_cache, dashboard, ingest_jobs, metoffice, reference, rollups, series
+from .services.series_cache import datasets
+from .tasks import ingest_metoffice_task, run_ingest_job_task
+
+
+class CachedResponseMixin:
+    """
+    Serve ``list`` (and any view calling ``cached_response``) from the
+    versioned API cache, with ETag/Last-Modified for conditional requests
+    (Last-Modified only once the second after the data's version has passed).
+
+    Only JSON responses are cached; the browsable API renders per request.
+    """
+
+    def get_cache_scopes(self) -> list[str]:
+        return [api_cache.REFERENCE_SCOPE]
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs))
+
+    def cached_response(self, request, build):
+        if not api_cache.enabled() or request.accepted_renderer.format != "json":
+            return build()
+
+        key, version = api_cache.response_key(
+            request.path, request.query_params, request.accepted_media_type, self.get_cache_scopes()
+        )
+        # Versions are nanosecond stamps but HTTP dates whole seconds, so a later
+        # bump in the same second would share the date. Round up, and only
+        # validate by date once that second is over and no bump can join it;
+        # until then the ETag alone decides.
+        last_modified = version // 1_000_000_000 + 1
+        if last_modified > time.time():
+            last_modified = None
+        validators = {"ETag": api_cache.etag(key), "Cache-Control": "no-cache"}
+        if last_modified is not None:
+            validators["Last-Modified"] = http_date(last_modified)
+        response = get_conditional_response(request, etag=validators["ETag"], last_modified=last_modified)
+        if response is None:
+            entry = api_cache.get(key)
+            if entry is not None:
+                response = HttpResponse(entry["content"], content_type=entry["content_type"])
+            else:
+                response = build()
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                if response.streaming:
+                    response.streaming_content = api_cache.store_streamed(
+                        key, response.streaming_content, response["Content-Type"]
+                    )
+                    return self._with_validators(response, validators)
+                response.accepted_renderer = request.accepted_renderer
+                response.accepted_media_type = request.accepted_media_type
+                response.renderer_context = self.get_renderer_context()
+                response.render()
+                api_cache.store(key, response.content, response["Content-Type"])
+        return self._with_validators(response, validators)
 
+    @staticmethod
+    def _with_validators(response, validators: dict):
+        for header, value in validators.items():
+            response[header] = value
+        return response
 
-class RegionViewSet(viewsets.ReadOnlyModelViewSet):
+
+def _records_cache_scopes(request) -> list[str]:
+    params = request.query_params
+    return [api_cache.REFERENCE_SCOPE, api_cache.records_scope(params.get("region"), params.get("parameter"))]
+
+
+def _cleaned_filters(view, request, queryset) -> dict:
+    # Call after view.filter_queryset, which has already rejected invalid filters.
+    filterset = DjangoFilterBackend().get_filterset(request, queryset, view)
+    filterset.is_valid()
+    return filterset.form.cleaned_data
+
+
+def _requested_dataset(params) -> series.PackedDataset:
+    """The dataset named by the ``region`` and ``parameter`` query parameters, both required."""
+    missing = {name: "This filter is required." for name in ("region", "parameter") if not params.get(name)}
+    if missing:
+        raise ValidationError(missing)
+    dataset = datasets.get(params["region"], params["parameter"])
+    if dataset is None:
+        registry = reference.current()
+        try:
+            region = registry.by_code(Region, params["region"])
+            parameter = registry.by_code(Parameter, params["parameter"])
+        except (Region.DoesNotExist, Parameter.DoesNotExist) as exc:
+            raise Http404(str(exc)) from exc
+        dataset = series.load_dataset(region, parameter)
+    return dataset
+
+
+class RegionViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Region.objects.all()
     serializer_class = RegionSerializer
     lookup_field = "code"
 
 
-class ParameterViewSet(viewsets.ReadOnlyModelViewSet):
+class ParameterViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Parameter.objects.all()
     serializer_class = ParameterSerializer
     lookup_field = "code"
 
 
-class ClimateRecordViewSet(viewsets.ReadOnlyModelViewSet):
+class ClimateRecordViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = ClimateRecordSerializer
+    renderer_classes = [StreamingJSONRenderer, BrowsableAPIRenderer]
     filterset_class = ClimateRecordFilter
     ordering_fields = ["year", "period", "value", "fetched_at"]
-    ordering = ["year", "period"]
+    # id breaks ties between datasets so offset pages are stable.
+    ordering = ["year", "period", "id"]
+
+    @property
+    def paginator(self):
+        # Opt-in keyset pagination (?pagination=keyset); limit/offset stays the default.
+        params = self.request.query_params
+        if not hasattr(self, "_paginator") and params.get(KeysetPagination.mode_query_param) == KeysetPagination.mode:
+            self._paginator = KeysetPagination()
+        return super().paginator
 
     def get_queryset(self):
         return (
@@ -41,12 +163,89 @@ class ClimateRecordViewSet(viewsets.ReadOnlyModelViewSet):
             .exclude(value__isnull=True)
         )
 
+    def get_cache_scopes(self) -> list[str]:
+        return _records_cache_scopes(self.request)
+
+    def list(self, request, *args, **kwargs):
+        # JSON pages skip the serializer and stream; the browsable API keeps the generic path.
+        if not isinstance(request.accepted_renderer, StreamingJSONRenderer):
+            return super().list(request, *args, **kwargs)
+        return self.cached_response(request, lambda: self._stream_list(request))
+
+    def _stream_list(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).values(*CLIMATE_RECORD_VALUES)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            data = climate_record_rows(queryset.iterator())
+        else:
+            data = self.get_paginated_response(climate_record_rows(page)).data
+        renderer = request.accepted_renderer
+        return StreamingHttpResponse(
+            renderer.stream(data, request.accepted_media_type, self.get_renderer_context()),
+            content_type=renderer.media_type,
+        )
+
     @action(detail=False, methods=["get"])
     def summary(self, request):
+        return self.cached_response(request, lambda: self._summary(request))
+
+    def _summary(self, request):
         queryset = self.filter_queryset(self.get_queryset())
+        filters = _cleaned_filters(self, request, queryset)
+        aggregates = None
+        active = {name for name, value in filters.items() if value not in (None, "")}
+        if {"region", "parameter"} <= active <= rollups.ROLLUP_FILTERS:
+            dataset = datasets.get(filters["region"], filters["parameter"])
+            aggregates = None if dataset is None else dataset.summary(filters)
+        if aggregates is None:
+            aggregates = rollups.summarise(filters)
+        if aggregates is None:
+            aggregates = self._summarise_records(queryset)
+        if aggregates["count"] == 0:
+            return Response({"count": 0})
+
+        payload = {
+            **aggregates,
+            "region": request.query_params.get("region"),
+            "parameter": request.query_params.get("parameter"),
+            "period_type": request.query_params.get("period_type"),
+            "period": request.query_params.get("period"),
+        }
+        return Response(payload)
+
+    @action(detail=False, methods=["get"])
+    def anomalies(self, request):
+        return self.cached_response(
+            request,
+            lambda: self._analytics(request, AnomalyQuerySerializer, analytics.anomalies),
+        )
+
+    @action(detail=False, methods=["get"], url_path="rolling-means")
+    def rolling_means(self, request):
+        return self.cached_response(
+            request,
+            lambda: self._analytics(request, RollingMeanQuerySerializer, analytics.rolling_means),
+        )
+
+    @action(detail=False, methods=["get"])
+    def trend(self, request):
+        return self.cached_response(
+            request,
+            lambda: self._analytics(request, TrendQuerySerializer, analytics.trend),
+        )
+
+    def _analytics(self, request, options_class, compute):
+        options = options_class(data=request.query_params)
+        options.is_valid(raise_exception=True)
+        dataset = _requested_dataset(request.query_params)
+        filters = _cleaned_filters(self, request, self.filter_queryset(self.get_queryset()))
+        return Response(compute(dataset, filters, **options.validated_data))
+
+    @staticmethod
+    def _summarise_records(queryset) -> dict:
         count = queryset.count()
         if count == 0:
-            return Response({"count": 0})
+            return {"count": 0}
 
         aggregates = queryset.aggregate(
             min_value=Min("value"),
@@ -59,49 +258,144 @@ class ClimateRecordViewSet(viewsets.ReadOnlyModelViewSet):
         def _convert(value):
             return None if value is None else float(value)
 
-        payload = {
+        return {
             "count": count,
             "min_value": _convert(aggregates["min_value"]),
             "max_value": _convert(aggregates["max_value"]),
             "avg_value": _convert(aggregates["avg_value"]),
             "first_year": aggregates["first_year"],
             "last_year": aggregates["last_year"],
-            "region": request.query_params.get("region"),
-            "parameter": request.query_params.get("parameter"),
-            "period_type": request.query_params.get("period_type"),
-            "period": request.query_params.get("period"),
         }
-        return Response(payload)
+
+
+class SeriesView(CachedResponseMixin, generics.GenericAPIView):
+    """
+    One dataset in columnar form: region/parameter details once, then
+    parallel ``year``/``period``/``value`` arrays in chronological order.
+
+    ``region`` and ``parameter`` are required; the other record filters
+    (period type, period, year range) apply as on ``/api/records/``.
+    ``max_points`` downsamples the series, keeping each bucket's extremes.
+    """
+
+    queryset = ClimateRecord.objects.all()
+    filterset_class = ClimateRecordFilter
+    filter_backends = [DjangoFilterBackend]
+
+    def get_cache_scopes(self) -> list[str]:
+        return _records_cache_scopes(self.request)
+
+    def get(self, request):
+        return self.cached_response(request, lambda: self._series(request))
+
+    def _series(self, request):
+        options = DownsampleQuerySerializer(data=request.query_params)
+        options.is_valid(raise_exception=True)
+        dataset = _requested_dataset(request.query_params)
+        filters = _cleaned_filters(self, request, self.filter_queryset(self.get_queryset()))
+        return Response(self.build(dataset, filters, options.validated_data.get("max_points")))
+
+    def build(self, dataset: series.PackedDataset, filters: dict, max_points: int | None) -> dict:
+        result = dataset.series(filters)
+        return (result.downsample(max_points) if max_points else result).as_dict()
+
+
+class DashboardDataView(SeriesView):
+    """
+    Everything the dashboard shows for a selection in one response: the
+    series (as on ``/api/series/``) plus ``summary`` stats and a ``table``
+    of the newest cells.
+    """
+
+    def build(self, dataset: series.PackedDataset, filters: dict, max_points: int | None) -> dict:
+        return dashboard.build_payload(dataset, filters, max_points)
+
+
+class ComparisonView(CachedResponseMixin, APIView):
+    """
+    Several series side by side on one year axis, read in a single query.
+
+    ``regions`` and ``parameters`` (repeated or comma-separated) are required;
+    ``periods`` defaults to the annual value and ``start_year``/``end_year``
+    trim the axis.
+    """
+
+    def get_cache_scopes(self) -> list[str]:
+        params = self.request.query_params
+        region, parameter = params.get("regions", ""), params.get("parameters", "")
+        # Several codes in one parameter span several datasets.
+        return [
+            api_cache.REFERENCE_SCOPE,
+            api_cache.records_scope(
+                None if "," in region or len(params.getlist("regions")) > 1 else region,
+                None if "," in parameter or len(params.getlist("parameters")) > 1 else parameter,
+            ),
+        ]
+
+    def get(self, request):
+        return self.cached_response(request, lambda: self._compare(request))
+
+    def _compare(self, request):
+        query = ComparisonQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        options = query.validated_data
+        return Response(
+            series.load_comparison(
+                options["regions"],
+                options["parameters"],
+                options["periods"],
+                options.get("start_year"),
+                options.get("end_year"),
+            )
+        )
 
 
 class DatasetIngestView(APIView):
     """
-    Accepts a Met Office dataset link and ingests it into the local database.
+    Queue an ingest of one Met Office dataset link and return its job.
+
+    The download, parse and upsert run on a Celery worker; the job's URL
+    (``Location``) reports their progress. With ``INGEST_INLINE`` set they
+    run inside the request and the finished job is returned instead. If the
+    broker can't take the task the job is failed and a 503 returned.
     """
 
     def post(self, request):
         serializer = IngestRequestSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        url = serializer.validated_data["url"]
 
         try:
-            result = metoffice.sync_dataset_from_url(url)
+            job = ingest_jobs.create_job(serializer.validated_data["url"], task_id=str(uuid.uuid4()))
         except metoffice.MetOfficeDatasetError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
+        if settings.INGEST_INLINE:
+            ingest_jobs.run_job(job)
+            return Response(IngestJobSerializer(job).data, status=status.HTTP_200_OK)
+
+        try:
+            run_ingest_job_task.apply_async((job.pk,), task_id=job.task_id)
+        except BrokerError as exc:
+            ingest_jobs.fail_job(job, exc)
+            return Response(
+                {"detail": "The task queue is unavailable; try again later.", **IngestJobSerializer(job).data},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        location = reverse("weather:ingest-job", args=[job.pk], request=request)
         return Response(
-            {
-                "message": "Ingestion started successfully.",
-                "region": result["region"],
-                "parameter": result["parameter"],
-                "rows_processed": result["rows"],
-                "source_url": result["source_url"],
-                "last_updated": result["last_updated"],
-            },
+            {"message": "Ingestion queued.", "status_url": location, **IngestJobSerializer(job).data},
             status=status.HTTP_202_ACCEPTED,
+            headers={"Location": location},
         )
 
 
+class IngestJobView(generics.RetrieveAPIView):
+    """Status and per-stage progress of an ``/api/ingest/`` job."""
+
+    queryset = IngestJob.objects.select_related("region", "parameter")
+    serializer_class = IngestJobSerializer
+
+
 class DatasetIngestTriggerView(APIView):
     """
     Kick off a background ingestion job via Celery.
@@ -0,0 +1,145 @@
+"""
+Reference implementations and timing helpers for the ``benchmark_ingest`` command.
+
+The ``legacy_*`` functions preserve the original row-at-a-time code paths so
+the optimised versions can be checked for identical output and measured
+against them.
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework import mixins
+
+from weather.api import ClimateRecordViewSet
+from weather.constants import ANNUAL_COLUMN, MONTH_COLUMNS, SEASON_COLUMNS
+from weather.models import ClimateRecord, Parameter, Region
+
+
+def sample_text() -> str:
+    return (Path(settings.BASE_DIR) / "sample.txt").read_text()
+
+
+def synthetic_text(multiplier: int) -> str:
+    """``sample.txt`` with its data rows repeated ``multiplier`` times."""
+    lines = sample_text().splitlines()
+    header_idx = next(idx for idx, line in enumerate(lines) if line.lower().startswith("year"))
+    rows = [line for line in lines[header_idx + 1 :] if line.strip()]
+    return "\n".join(lines[: header_idx + 1] + rows * multiplier) + "\n"
+
+
+def time_callable(func: Callable[[], object], repeat: int) -> float:
+    """Return the median wall time of ``func`` in milliseconds over ``repeat`` runs."""
+    timings = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def pad_records(target_rows: int) -> int:
+    """
+    Insert synthetic records until the table holds ``target_rows`` (PostgreSQL).
+
+    Rows cover every region/parameter pair and period, in years after the
+    latest real one. Returns the number of rows added.
+    """
+    missing = target_rows - ClimateRecord.objects.count()
+    if missing <= 0:
+        return 0
+    periods = (
+        [(ClimateRecord.PeriodType.MONTH.value, month) for month in MONTH_COLUMNS]
+        + [(ClimateRecord.PeriodType.SEASON.value, season) for season in SEASON_COLUMNS]
+        + [(ClimateRecord.PeriodType.ANNUAL.value, ANNUAL_COLUMN)]
+    )
+    per_year = Region.objects.count() * Parameter.objects.count() * len(periods)
+    first_year = (ClimateRecord.objects.aggregate(year=Max("year"))["year"] or 1883) + 1
+    last_year = first_year + math.ceil(missing / per_year) - 1
+    table = ClimateRecord._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (region_id, parameter_id, year, period_type, period, value, fetched_at) "
+            "SELECT r.id, p.id, y, periods.period_type, periods.period, round((random() * 30)::numeric, 2), now() "
+            "FROM weather_region r CROSS JOIN weather_parameter p CROSS JOIN generate_series(%s, %s) y "
+            f"CROSS JOIN (VALUES {', '.join(['(%s, %s)'] * len(periods))}) AS periods (period_type, period) "
+            "LIMIT %s",
+            [first_year, last_year, *(value for period in periods for value in period), missing],
+        )
+        cursor.execute(f"ANALYZE {table}")
+    return missing
+
+
+def response_body(response) -> bytes:
+    """Render a view's response, draining it if it streams."""
+    if hasattr(response, "render"):
+        response.render()
+    return response.getvalue()
+
+
+def _coerce_decimal(value) -> Decimal | None:
+    if value is None:
+        return None
+    if pd.isna(value):
+        return None
+    return Decimal(str(float(value)))
+
+
+def legacy_build_records(
+    dataframe: pd.DataFrame,
+    region: Region,
+    parameter: Parameter,
+    last_updated: datetime | None,
+) -> list[ClimateRecord]:
+    records: list[ClimateRecord] = []
+    fetched_at = timezone.now()
+
+    for _, row in dataframe.iterrows():
+        year = int(row["year"])
+
+        def append_record(period_type: str, period: str, value):
+            decimal_value = _coerce_decimal(value)
+            if decimal_value is None:
+                return
+            records.append(
+                ClimateRecord(
+                    region=region,
+                    parameter=parameter,
+                    year=year,
+                    period_type=period_type,
+                    period=period.lower(),
+                    value=decimal_value,
+                    source_last_updated=last_updated,
+                    fetched_at=fetched_at,
+                )
+            )
+
+        for month in MONTH_COLUMNS:
+            append_record(ClimateRecord.PeriodType.MONTH, month, row.get(month))
+
+        for season in SEASON_COLUMNS:
+            append_record(ClimateRecord.PeriodType.SEASON, season, row.get(season))
+
+        if ANNUAL_COLUMN in row:
+            append_record(ClimateRecord.PeriodType.ANNUAL, ANNUAL_COLUMN, row.get(ANNUAL_COLUMN))
+
+    return records
+
+
+class LegacyClimateRecordViewSet(ClimateRecordViewSet):
+    """The records list through model instances and ``ClimateRecordSerializer``, rendered in one piece."""
+
+    def list(self, request, *args, **kwargs):
+        return mixins.ListModelMixin.list(self, request, *args, **kwargs)
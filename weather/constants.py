@@ -67,3 +67,10 @@ MONTH_COLUMNS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep",
 SEASON_COLUMNS = ["win", "spr", "sum", "aut"]
 ANNUAL_COLUMN = "ann"
 
+# (period_type, column) of every dataset column in calendar order: months,
+# seasons, then annual. Period types are ClimateRecord.PeriodType values.
+PERIOD_COLUMNS = (
+    [("month", column) for column in MONTH_COLUMNS]
+    + [("season", column) for column in SEASON_COLUMNS]
+    + [("annual", ANNUAL_COLUMN)]
+)
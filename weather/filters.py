@@ -1,16 +1,27 @@
 import django_filters
+from django.db.models import Subquery
 
-from .models import ClimateRecord
+from .models import ClimateRecord, Parameter, Region
 
 
 class ClimateRecordFilter(django_filters.FilterSet):
     start_year = django_filters.NumberFilter(field_name="year", lookup_expr="gte")
     end_year = django_filters.NumberFilter(field_name="year", lookup_expr="lte")
-    region = django_filters.CharFilter(field_name="region__code", lookup_expr="iexact")
-    parameter = django_filters.CharFilter(field_name="parameter__code", lookup_expr="iexact")
-    period = django_filters.CharFilter(field_name="period", lookup_expr="iexact")
+    region = django_filters.CharFilter(field_name="region", method="filter_code")
+    parameter = django_filters.CharFilter(field_name="parameter", method="filter_code")
+    period = django_filters.CharFilter(field_name="period", method="filter_period")
 
     class Meta:
         model = ClimateRecord
         fields = ["region", "parameter", "period_type", "period"]
 
+    def filter_code(self, queryset, name, value):
+        # Resolve the code to an id up front (one index probe, evaluated once)
+        # instead of joining the region/parameter table into every row.
+        model = {"region": Region, "parameter": Parameter}[name]
+        matching = model.objects.filter(code__iexact=value).order_by().values("pk")[:1]
+        return queryset.filter(**{f"{name}_id": Subquery(matching)})
+
+    def filter_period(self, queryset, name, value):
+        # Periods are stored lower-case, so an exact match can use the indexes.
+        return queryset.filter(period=value.lower())
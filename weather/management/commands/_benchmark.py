@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+
+class BenchmarkCommand(BaseCommand):
+    """Runs the ``bench_<suite>`` methods named on the command line (default: all ``suites``)."""
+
+    suites: list[str] = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "suites",
+            nargs="*",
+            help=f"Benchmarks to run: {', '.join(self.suites)} (default: all).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Runs per measurement; the median is reported.",
+        )
+
+    def handle(self, *args, **options):
+        self.repeat = options["repeat"]
+        self.options = options
+        unknown = set(options["suites"]) - set(self.suites)
+        if unknown:
+            raise CommandError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+        for suite in options["suites"] or self.suites:
+            getattr(self, f"bench_{suite}")()
+
+    def _report(
+        self, label: str, baseline_ms: float, candidate_ms: float, rows: int, repeat: int | None = None
+    ) -> None:
+        self.stdout.write(f"{label} ({rows} rows, median of {repeat or self.repeat})")
+        self.stdout.write(f"   before: {baseline_ms:9.2f} ms")
+        self.stdout.write(f"   after:  {candidate_ms:9.2f} ms")
+        self.stdout.write(self.style.SUCCESS(f"   speedup: {baseline_ms / candidate_ms:.1f}x"))
@@ -0,0 +1,199 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from weather import benchmarks
+from weather.api import ClimateRecordViewSet, ComparisonView, SeriesView
+from weather.models import ClimateRecord, ClimateSeries, Parameter, Region
+from weather.pagination import KeysetPagination
+from weather.services import series as series_store
+from weather.services.series_cache import datasets
+
+from ._benchmark import BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    help = "Time read API requests with the response cache disabled."
+
+    suites = ["records", "series", "store", "memory", "compare", "pagination"]
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=2_000_000,
+            help="Pad the records table with synthetic rows up to this size (rolled back afterwards).",
+        )
+        parser.add_argument("--page-size", type=int, default=100)
+
+    def bench_records(self):
+        factory = APIRequestFactory()
+        fast = ClimateRecordViewSet.as_view({"get": "list"})
+        legacy = benchmarks.LegacyClimateRecordViewSet.as_view({"get": "list"})
+        limit = 5000
+        rows = min(limit, ClimateRecord.objects.exclude(value__isnull=True).count())
+        if not rows:
+            self.stdout.write(self.style.WARNING("records: skipped, no records ingested"))
+            return
+
+        def _page(view, page_size):
+            request = factory.get("/api/records/", {"limit": page_size})
+            return lambda: benchmarks.response_body(view(request))
+
+        with override_settings(API_CACHE_TIMEOUT=0):
+            # The 1-row page is the fixed cost of a request; the rest is per-row work.
+            timings = {
+                name: (
+                    benchmarks.time_callable(_page(view, 1), self.repeat),
+                    benchmarks.time_callable(_page(view, limit), self.repeat),
+                )
+                for name, view in (("legacy", legacy), ("fast", fast))
+            }
+        self._report(f"/api/records/?limit={limit} (serializer vs values() + streaming)", timings["legacy"][1], timings["fast"][1], rows)
+        per_row = {name: (page_ms - base_ms) * 1000 / (rows - 1) for name, (base_ms, page_ms) in timings.items()}
+        self.stdout.write(f"   per row: {per_row['legacy']:.1f} us -> {per_row['fast']:.1f} us")
+
+    def bench_series(self):
+        records = ClimateRecordViewSet.as_view({"get": "list"})
+        series = SeriesView.as_view()
+        factory = APIRequestFactory()
+        params = {"region": "UK", "parameter": "Tmax"}
+        rows = ClimateRecord.objects.filter(region__code="UK", parameter__code="Tmax").count()
+        if not rows:
+            self.stdout.write(self.style.WARNING("series: skipped, ingest UK/Tmax first"))
+            return
+
+        def _get(view, extra=None):
+            return lambda: view(factory.get("/", {**params, **(extra or {})})).render()
+
+        with override_settings(API_CACHE_TIMEOUT=0):
+            records_ms = benchmarks.time_callable(_get(records, {"limit": rows}), self.repeat)
+            series_ms = benchmarks.time_callable(_get(series), self.repeat)
+            records_bytes = len(_get(records, {"limit": rows})().content)
+            series_bytes = len(_get(series)().content)
+        self._report("UK/Tmax as /api/records/ vs /api/series/", records_ms, series_ms, rows)
+        self.stdout.write(f"   bytes: {records_bytes:,} -> {series_bytes:,}")
+
+    def bench_store(self):
+        region = Region.objects.filter(code="UK").first()
+        parameter = Parameter.objects.filter(code="Tmax").first()
+        if not ClimateSeries.objects.filter(region=region, parameter=parameter).exists():
+            self.stdout.write(self.style.WARNING("store: skipped, ingest UK/Tmax first"))
+            return
+
+        cases = [
+            ("all periods", {}, {}),
+            (
+                "period=jan, 1991-2020",
+                {"period": "jan", "start_year": 1991, "end_year": 2020},
+                {"period": "jan", "year__gte": 1991, "year__lte": 2020},
+            ),
+        ]
+        for label, filters, lookups in cases:
+            records = ClimateRecord.objects.filter(**lookups)
+            rows_ms = benchmarks.time_callable(lambda: series_store._load_records(region, parameter, records), self.repeat)
+            store_ms = benchmarks.time_callable(lambda: series_store.load_series(region, parameter, filters), self.repeat)
+            count = len(series_store.load_series(region, parameter, filters).value)
+            self._report(f"UK/Tmax series read, {label} (records vs packed store)", rows_ms, store_ms, count)
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                sizes = []
+                for model in (ClimateRecord, ClimateSeries):
+                    cursor.execute("SELECT pg_total_relation_size(%s)", [model._meta.db_table])
+                    sizes.append(cursor.fetchone()[0])
+            self.stdout.write(
+                f"   storage incl. indexes: {ClimateRecord.objects.count():,} records {sizes[0]:,} bytes"
+                f" -> {ClimateSeries.objects.count():,} series {sizes[1]:,} bytes"
+            )
+
+    def bench_memory(self):
+        if not ClimateSeries.objects.filter(region__code="UK", parameter__code="Tmax").exists():
+            self.stdout.write(self.style.WARNING("memory: skipped, ingest UK/Tmax first"))
+            return
+
+        factory = APIRequestFactory()
+        views = {
+            "/api/series/": SeriesView.as_view(),
+            "/api/records/summary/": ClimateRecordViewSet.as_view({"get": "summary"}),
+        }
+        params = {"region": "UK", "parameter": "Tmax", "period_type": "month", "start_year": 1961}
+        cells = ClimateRecord.objects.filter(
+            region__code="UK", parameter__code="Tmax", period_type="month", year__gte=1961, value__isnull=False
+        ).count()
+        for path, view in views.items():
+            request = factory.get(path, params)
+            timings = []
+            for max_bytes in (0, settings.SERIES_CACHE_MAX_BYTES):
+                datasets.clear()
+                with override_settings(API_CACHE_TIMEOUT=0, SERIES_CACHE_MAX_BYTES=max_bytes):
+                    timings.append(benchmarks.time_callable(lambda: view(request).render(), self.repeat))
+                    with CaptureQueriesContext(connection) as queries:
+                        view(request).render()
+            self._report(f"{path} UK/Tmax months since 1961 (database vs in-process cache)", *timings, cells)
+            self.stdout.write(f"   queries per request when warm: {len(queries)}")
+
+    def bench_compare(self):
+        codes = list(
+            ClimateSeries.objects.filter(parameter__code="Tmax", period_type="annual")
+            .order_by("region_id")
+            .values_list("region__code", flat=True)
+        )
+        if len(codes) < 2:
+            self.stdout.write(self.style.WARNING("compare: skipped, ingest Tmax for several regions first"))
+            return
+
+        factory = APIRequestFactory()
+        series_view, compare_view = SeriesView.as_view(), ComparisonView.as_view()
+
+        def _one_per_region():
+            for code in codes:
+                series_view(factory.get("/", {"region": code, "parameter": "Tmax", "period": "ann"})).render()
+
+        def _compare():
+            compare_view(factory.get("/", {"regions": ",".join(codes), "parameters": "Tmax"})).render()
+
+        with override_settings(API_CACHE_TIMEOUT=0, SERIES_CACHE_MAX_BYTES=0):
+            timings = []
+            for run in (_one_per_region, _compare):
+                timings.append(benchmarks.time_callable(run, self.repeat))
+                with CaptureQueriesContext(connection) as queries:
+                    run()
+                timings.append(len(queries))
+        self._report(f"Tmax annual for {len(codes)} regions (/api/series/ each vs /api/compare/)", timings[0], timings[2], len(codes))
+        self.stdout.write(f"   requests: {len(codes)} -> 1, queries: {timings[1]} -> {timings[3]}")
+
+    def bench_pagination(self):
+        if connection.vendor != "postgresql":
+            self.stdout.write(self.style.WARNING("pagination: skipped, synthetic rows need PostgreSQL"))
+            return
+
+        view = ClimateRecordViewSet.as_view({"get": "list"})
+        factory = APIRequestFactory()
+        limit = self.options["page_size"]
+        # Deep offset pages take seconds each, so cap the repeats to keep the run short.
+        repeat = min(self.repeat, 5)
+
+        def _page(params):
+            return lambda: view(factory.get("/api/records/", {"limit": limit, **params})).render()
+
+        with override_settings(API_CACHE_TIMEOUT=0), transaction.atomic():
+            added = benchmarks.pad_records(self.options["rows"])
+            keys = ClimateRecord.objects.exclude(value__isnull=True).order_by(*KeysetPagination.ordering)
+            total = keys.count()
+            self.stdout.write(f"{total:,} records ({added:,} synthetic)")
+
+            for depth in sorted({0, 10_000, 100_000, 1_000_000, total - limit}):
+                if not 0 <= depth <= total - limit:
+                    continue
+                keyset = {"pagination": KeysetPagination.mode}
+                if depth:
+                    position = keys.values_list(*KeysetPagination.ordering)[depth - 1]
+                    keyset["cursor"] = KeysetPagination.encode_cursor(position)
+                offset_ms = benchmarks.time_callable(_page({"offset": depth}), repeat)
+                keyset_ms = benchmarks.time_callable(_page(keyset), repeat)
+                self._report(f"/api/records/ page at depth {depth:,} (offset vs keyset)", offset_ms, keyset_ms, limit, repeat)
+            transaction.set_rollback(True)
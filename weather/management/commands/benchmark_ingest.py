@@ -0,0 +1,84 @@
+from django.db import connection, transaction
+
+from weather import benchmarks
+from weather.models import Parameter, Region
+from weather.services import metoffice
+
+from ._benchmark import BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    help = "Time the ingestion stages on sample.txt against their original implementations."
+
+    suites = ["parser", "builder", "loader"]
+
+    def bench_parser(self):
+        for label, text in (
+            ("sample.txt", benchmarks.sample_text()),
+            ("sample.txt x100", benchmarks.synthetic_text(100)),
+        ):
+            rows = len(metoffice.parse_dataset_fixed_width(text)[0])
+            csv_ms = benchmarks.time_callable(lambda: metoffice.parse_dataset_csv(text), self.repeat)
+            fixed_ms = benchmarks.time_callable(lambda: metoffice.parse_dataset_fixed_width(text), self.repeat)
+            self._report(f"parse_dataset on {label}", csv_ms, fixed_ms, rows)
+
+    def bench_builder(self):
+        region = Region.objects.get(code="UK")
+        parameter = Parameter.objects.get(code="Tmax")
+        dataframe, last_updated = metoffice.parse_dataset(benchmarks.sample_text())
+
+        rows = len(metoffice.build_records_from_dataframe(dataframe, region, parameter, last_updated))
+        legacy_ms = benchmarks.time_callable(
+            lambda: benchmarks.legacy_build_records(dataframe, region, parameter, last_updated),
+            self.repeat,
+        )
+        records_ms = benchmarks.time_callable(
+            lambda: metoffice.build_records_from_dataframe(dataframe, region, parameter, last_updated),
+            self.repeat,
+        )
+        frame_ms = benchmarks.time_callable(lambda: metoffice.build_record_frame(dataframe), self.repeat)
+
+        self._report("build_records_from_dataframe", legacy_ms, records_ms, rows)
+        self._report("build_record_frame (no model instances)", legacy_ms, frame_ms, rows)
+
+    def bench_loader(self):
+        if connection.vendor != "postgresql":
+            self.stdout.write(self.style.WARNING("loader: skipped, the COPY loader needs PostgreSQL"))
+            return
+
+        pairs = [(region, parameter) for region in Region.objects.all() for parameter in Parameter.objects.all()]
+        dataframe, last_updated = metoffice.parse_dataset(benchmarks.sample_text())
+        frame = metoffice.build_record_frame(dataframe)
+        rows = len(frame) * len(pairs)
+        # Each pass rewrites every dataset, so cap the repeats to keep the run short.
+        repeat = min(self.repeat, 3)
+
+        def _bulk_create():
+            for region, parameter in pairs:
+                metoffice.persist_records(metoffice.records_from_frame(frame, region, parameter, last_updated))
+
+        def _copy():
+            for region, parameter in pairs:
+                metoffice.copy_record_frame(frame, region, parameter, last_updated)
+
+        def _incremental():
+            for region, parameter in pairs:
+                metoffice.persist_dataset(dataframe, region, parameter, last_updated)
+
+        # Re-ingest on top of existing rows, and leave the database as it was.
+        with transaction.atomic():
+            _copy()
+            bulk_ms = benchmarks.time_callable(_bulk_create, repeat)
+            copy_ms = benchmarks.time_callable(_copy, repeat)
+            incremental_ms = benchmarks.time_callable(_incremental, repeat)
+            transaction.set_rollback(True)
+
+        self._report(f"re-ingest {len(pairs)} datasets (bulk_create vs COPY)", bulk_ms, copy_ms, rows, repeat)
+        self.stdout.write(f"   rows/sec: {rows / bulk_ms * 1000:,.0f} -> {rows / copy_ms * 1000:,.0f}")
+        self._report(
+            f"re-ingest {len(pairs)} unchanged datasets (bulk_create vs diff-only writes)",
+            bulk_ms,
+            incremental_ms,
+            rows,
+            repeat,
+        )
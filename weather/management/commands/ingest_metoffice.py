@@ -1,7 +1,9 @@
 from django.core.management.base import BaseCommand, CommandError
 
 from weather.models import Parameter, Region
-from weather.services.metoffice import MetOfficeDatasetError, sync_dataset
+from weather.services import mirror, reference
+from weather.services.ingestion import run_ingestion
+from weather.services.metoffice import SYNC_NOT_MODIFIED
 
 
 class Command(BaseCommand):
@@ -18,38 +20,73 @@ class Command(BaseCommand):
             nargs="+",
             help="Parameter codes to ingest (default: all parameters).",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-download and re-parse datasets even if they have not changed.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Concurrent downloads (default: METOFFICE_INGEST_WORKERS).",
+        )
+        parser.add_argument(
+            "--rate-limit",
+            type=float,
+            help="Max requests per second per host, 0 for unlimited (default: METOFFICE_HOST_RATE_LIMIT).",
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            default=None,
+            help="Parse and save each dataset in batches while it downloads (default: METOFFICE_STREAM_INGEST).",
+        )
+        parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Read datasets from the local mirror (METOFFICE_MIRROR_DIR) instead of the Met Office. "
+            "Combine with --force to rebuild every dataset.",
+        )
 
     def handle(self, *args, **options):
-        regions = Region.objects.all()
-        if options.get("regions"):
-            filters = [code.upper() for code in options["regions"]]
-            regions = regions.filter(code__in=filters)
-            if not regions.exists():
-                raise CommandError("No matching regions for the supplied codes.")
-
-        parameters = Parameter.objects.all()
-        if options.get("parameters"):
-            filters = [code for code in options["parameters"]]
-            parameters = parameters.filter(code__in=filters)
-            if not parameters.exists():
-                raise CommandError("No matching parameters for the supplied codes.")
-
-        total_rows = 0
-        for region in regions:
-            for parameter in parameters:
-                self.stdout.write(f"→ Syncing {region.code}/{parameter.code} ...")
-                try:
-                    result = sync_dataset(region, parameter)
-                except MetOfficeDatasetError as exc:
-                    self.stderr.write(self.style.ERROR(str(exc)))
-                    continue
-                total_rows += result["rows"]
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"   Saved {result['rows']} rows "
-                        f"(last updated {result['last_updated']})"
-                    )
-                )
+        if options["offline"] and not mirror.enabled():
+            raise CommandError("--offline needs METOFFICE_MIRROR_DIR to point at a mirror.")
+        registry = reference.current()
+        regions = self._select(registry, Region, registry.regions, options.get("regions"))
+        parameters = self._select(registry, Parameter, registry.parameters, options.get("parameters"))
 
-        self.stdout.write(self.style.SUCCESS(f"Completed! {total_rows} rows processed."))
+        payload = run_ingestion(
+            regions,
+            parameters,
+            force=options["force"],
+            workers=options.get("workers"),
+            rate_limit=options.get("rate_limit"),
+            stream=options["stream"],
+            offline=options["offline"],
+            on_result=self._report,
+        )
 
+        self.stdout.write(self.style.SUCCESS(f"Completed! {payload['total_rows']} rows processed."))
+
+    @staticmethod
+    def _select(registry, model, rows: list, codes: list[str] | None) -> list:
+        if not codes:
+            return rows
+        rows, missing = registry.resolve_codes(model, codes)
+        if missing:
+            raise CommandError(f"Unknown {model.__name__.lower()} codes: {', '.join(missing)}")
+        return rows
+
+    def _report(self, result: dict) -> None:
+        label = f"{result['region']}/{result['parameter']}"
+        if "error" in result:
+            self.stderr.write(self.style.ERROR(f"✗ {label}: {result['error']}"))
+        elif result["status"] == SYNC_NOT_MODIFIED:
+            self.stdout.write(f"→ {label}: not modified (last updated {result['last_updated']})")
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"→ {label}: {result['rows']} rows, {result['inserted']} new, "
+                    f"{result['updated']} changed (last updated {result['last_updated']})"
+                )
+            )
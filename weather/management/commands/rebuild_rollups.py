@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from weather.services.rollups import rebuild_all_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the summary rollups from the climate records table."
+
+    def handle(self, *args, **options):
+        written = rebuild_all_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} rollups."))
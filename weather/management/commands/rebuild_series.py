@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from weather.services.series import rebuild_store
+
+
+class Command(BaseCommand):
+    help = "Rebuild the packed series store from the climate records table."
+
+    def handle(self, *args, **options):
+        written = rebuild_store()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} series."))
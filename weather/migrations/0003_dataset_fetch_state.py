@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-17 00:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0002_seed_reference_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetFetchState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_url', models.URLField(max_length=500)),
+                ('etag', models.CharField(blank=True, max_length=255)),
+                ('last_modified', models.CharField(blank=True, help_text='Raw Last-Modified response header', max_length=64)),
+                ('content_sha256', models.CharField(blank=True, max_length=64)),
+                ('source_last_updated', models.DateTimeField(blank=True, null=True)),
+                ('checked_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('changed_at', models.DateTimeField(blank=True, null=True)),
+                ('parameter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fetch_states', to='weather.parameter')),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fetch_states', to='weather.region')),
+            ],
+            options={
+                'unique_together': {('region', 'parameter')},
+            },
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_rollups(apps, schema_editor):
+    ClimateRecord = apps.get_model("weather", "ClimateRecord")
+    ClimateRollup = apps.get_model("weather", "ClimateRollup")
+
+    series = {}
+    rows = (
+        ClimateRecord.objects.filter(value__isnull=False)
+        .order_by()
+        .values_list("region_id", "parameter_id", "period_type", "period", "year", "value")
+        .iterator()
+    )
+    for region_id, parameter_id, period_type, period, year, value in rows:
+        series.setdefault((region_id, parameter_id, period_type, period), {})[year] = value
+
+    rollups = []
+    for (region_id, parameter_id, period_type, period), by_year in series.items():
+        values = list(by_year.values())
+        first_year, last_year = min(by_year), max(by_year)
+        rollups.append(
+            ClimateRollup(
+                region_id=region_id,
+                parameter_id=parameter_id,
+                period_type=period_type,
+                period=period,
+                count=len(values),
+                value_sum=sum(values),
+                min_value=min(values),
+                max_value=max(values),
+                first_year=first_year,
+                last_year=last_year,
+                yearly_values=[
+                    None if by_year.get(year) is None else float(by_year[year])
+                    for year in range(first_year, last_year + 1)
+                ],
+            )
+        )
+    ClimateRollup.objects.bulk_create(rollups, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0003_dataset_fetch_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClimateRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_type', models.CharField(choices=[('month', 'Month'), ('season', 'Season'), ('annual', 'Annual')], max_length=12)),
+                ('period', models.CharField(max_length=12)),
+                ('count', models.PositiveIntegerField()),
+                ('value_sum', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('min_value', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('max_value', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('first_year', models.PositiveIntegerField()),
+                ('last_year', models.PositiveIntegerField()),
+                ('yearly_values', models.JSONField(default=list, help_text='Value for each year from first_year to last_year (null where missing)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('parameter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='weather.parameter')),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='weather.region')),
+            ],
+            options={
+                'unique_together': {('region', 'parameter', 'period_type', 'period')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0004_climate_rollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='climaterecord',
+            index=models.Index(fields=['year', 'period', 'id'], name='climaterecord_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:18
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0005_climaterecord_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='climaterecord',
+            options={},
+        ),
+        migrations.AddIndex(
+            model_name='climaterecord',
+            index=models.Index(condition=models.Q(('value__isnull', False)), fields=['parameter', 'region', 'period_type', 'year'], include=('period', 'value'), name='climaterecord_dataset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='parameter',
+            index=models.Index(django.db.models.functions.text.Upper('code'), name='parameter_code_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='region',
+            index=models.Index(django.db.models.functions.text.Upper('code'), name='region_code_upper_idx'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.8 on 2026-10-17 01:24
+
+import django.db.models.deletion
+import numpy as np
+from django.db import migrations, models
+
+PERIODS = {
+    "month": ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"],
+    "season": ["win", "spr", "sum", "aut"],
+    "annual": ["ann"],
+}
+
+
+def build_series(apps, schema_editor):
+    ClimateRecord = apps.get_model("weather", "ClimateRecord")
+    ClimateSeries = apps.get_model("weather", "ClimateSeries")
+
+    cells = {}
+    stamps = {}
+    rows = (
+        ClimateRecord.objects.filter(value__isnull=False)
+        .order_by()
+        .values_list("region_id", "parameter_id", "period_type", "period", "year", "value", "source_last_updated")
+        .iterator()
+    )
+    for region_id, parameter_id, period_type, period, year, value, stamp in rows:
+        if period not in PERIODS.get(period_type, ()):
+            continue
+        key = (region_id, parameter_id, period_type)
+        cells.setdefault(key, []).append((year, PERIODS[period_type].index(period), float(value)))
+        if stamp is not None:
+            stamps[key] = max(stamps.get(key, stamp), stamp)
+
+    series = []
+    for (region_id, parameter_id, period_type), type_cells in cells.items():
+        first_year = min(cell[0] for cell in type_cells)
+        last_year = max(cell[0] for cell in type_cells)
+        grid = np.full((last_year - first_year + 1, len(PERIODS[period_type])), np.nan, dtype="<f4")
+        for year, column, value in type_cells:
+            grid[year - first_year, column] = value
+        series.append(
+            ClimateSeries(
+                region_id=region_id,
+                parameter_id=parameter_id,
+                period_type=period_type,
+                first_year=first_year,
+                values=grid.tobytes(),
+                source_last_updated=stamps.get((region_id, parameter_id, period_type)),
+            )
+        )
+    ClimateSeries.objects.bulk_create(series, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0006_record_access_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClimateSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period_type', models.CharField(choices=[('month', 'Month'), ('season', 'Season'), ('annual', 'Annual')], max_length=12)),
+                ('first_year', models.PositiveIntegerField()),
+                ('values', models.BinaryField()),
+                ('source_last_updated', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('parameter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='series', to='weather.parameter')),
+                ('region', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='series', to='weather.region')),
+            ],
+            options={
+                'verbose_name_plural': 'climate series',
+                'unique_together': {('region', 'parameter', 'period_type')},
+            },
+        ),
+        migrations.RunPython(build_series, migrations.RunPython.noop),
+    ]
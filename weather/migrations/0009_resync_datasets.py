@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def forget_fetched_datasets(apps, schema_editor):
+    # Datasets stored before the fixed-width parser may hold cells the old
+    # parser put in the wrong column (an incomplete year's seasons landed in
+    # nov/dec). Dropping the validators makes the next ingest download and
+    # re-parse every dataset, which deletes cells absent from the new parse
+    # and rebuilds the rollups and series of the periods affected.
+    DatasetFetchState = apps.get_model("weather", "DatasetFetchState")
+    DatasetFetchState.objects.update(etag="", last_modified="", content_sha256="")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0008_ingest_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(forget_fetched_datasets, migrations.RunPython.noop),
+    ]
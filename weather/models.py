@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 
@@ -10,6 +12,10 @@ class Region(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            # The API matches codes case-insensitively (code__iexact -> UPPER(code)).
+            models.Index(Upper("code"), name="region_code_upper_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -23,6 +29,9 @@ class Parameter(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [
+            models.Index(Upper("code"), name="parameter_code_upper_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -65,7 +74,120 @@ class ClimateRecord(models.Model):
 
     class Meta:
         unique_together = ("region", "parameter", "year", "period_type", "period")
-        ordering = ["parameter", "region", "year", "period"]
+        # No default ordering: every read path orders explicitly, so other
+        # queries (aggregates, lookups, deletes) don't pay for a sort.
+        indexes = [
+            # Seek index for keyset pagination of /api/records/.
+            models.Index(fields=["year", "period", "id"], name="climaterecord_keyset_idx"),
+            # Filtered reads and summaries of one dataset; the API never returns
+            # null values, and the covered columns allow index-only aggregates.
+            models.Index(
+                fields=["parameter", "region", "period_type", "year"],
+                include=["period", "value"],
+                condition=Q(value__isnull=False),
+                name="climaterecord_dataset_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.region.code} {self.parameter.code} {self.year} {self.period}"
+
+
+class DatasetFetchState(models.Model):
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name="fetch_states")
+    parameter = models.ForeignKey(Parameter, on_delete=models.CASCADE, related_name="fetch_states")
+    source_url = models.URLField(max_length=500)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True, help_text="Raw Last-Modified response header")
+    content_sha256 = models.CharField(max_length=64, blank=True)
+    source_last_updated = models.DateTimeField(null=True, blank=True)
+    checked_at = models.DateTimeField(default=timezone.now)
+    changed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("region", "parameter")
+
+    def __str__(self) -> str:
+        return f"{self.region.code} {self.parameter.code} fetch state"
+
+
+class ClimateRollup(models.Model):
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name="rollups")
+    parameter = models.ForeignKey(Parameter, on_delete=models.CASCADE, related_name="rollups")
+    period_type = models.CharField(max_length=12, choices=ClimateRecord.PeriodType.choices)
+    period = models.CharField(max_length=12)
+    count = models.PositiveIntegerField()
+    value_sum = models.DecimalField(max_digits=12, decimal_places=2)
+    min_value = models.DecimalField(max_digits=6, decimal_places=2)
+    max_value = models.DecimalField(max_digits=6, decimal_places=2)
+    first_year = models.PositiveIntegerField()
+    last_year = models.PositiveIntegerField()
+    yearly_values = models.JSONField(
+        default=list,
+        help_text="Value for each year from first_year to last_year (null where missing)",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("region", "parameter", "period_type", "period")
+
+    def __str__(self) -> str:
+        return f"{self.region.code} {self.parameter.code} {self.period} rollup"
+
+
+class ClimateSeries(models.Model):
+    """
+    One (region, parameter, period_type) series packed for whole-series reads.
+
+    ``values`` is a little-endian float32 array laid out year by year from
+    ``first_year``, with one cell per period of the type in calendar order
+    (12 months, 4 seasons or the annual value) and NaN where a cell is missing.
+    """
+
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name="series")
+    parameter = models.ForeignKey(Parameter, on_delete=models.CASCADE, related_name="series")
+    period_type = models.CharField(max_length=12, choices=ClimateRecord.PeriodType.choices)
+    first_year = models.PositiveIntegerField()
+    values = models.BinaryField()
+    source_last_updated = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("region", "parameter", "period_type")
+        verbose_name_plural = "climate series"
+
+    def __str__(self) -> str:
+        return f"{self.region.code} {self.parameter.code} {self.period_type} series"
+
+
+class IngestJob(models.Model):
+    """
+    One queued ingest of a dataset URL, as posted to ``/api/ingest/``.
+
+    ``stages`` records each finished stage of the sync (``download``,
+    ``parse``, ``store``) with its duration in seconds and what it produced.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name="ingest_jobs")
+    parameter = models.ForeignKey(Parameter, on_delete=models.CASCADE, related_name="ingest_jobs")
+    source_url = models.URLField(max_length=500)
+    status = models.CharField(max_length=12, choices=Status.choices, default=Status.QUEUED)
+    task_id = models.CharField(max_length=255, blank=True)
+    stages = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True, help_text="The sync result once the job has succeeded")
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.region.code} {self.parameter.code} ingest job {self.pk} ({self.status})"
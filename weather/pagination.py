@@ -0,0 +1,103 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over ``(year, period, id)``.
+
+    Each page seeks past the last row of the previous one (an opaque
+    ``cursor``) instead of counting the result set and skipping ``offset``
+    rows, so every page costs the same however deep it is. There is no total
+    count and pages only link forward.
+    """
+
+    mode_query_param = "pagination"
+    mode = "keyset"
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    ordering = ("year", "period", "id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get("ordering"):
+            raise ValidationError({"ordering": "Keyset pagination always orders by year, period and id."})
+        self.request = request
+        self.limit = self.get_limit(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.seek(position))
+
+        page = list(queryset[: self.limit + 1])
+        self.has_next = len(page) > self.limit
+        page = page[: self.limit]
+        self.last_position = self.get_position(page[-1]) if page else None
+        return page
+
+    def seek(self, position: tuple) -> Q:
+        """
+        Rows ordered after ``position``: ``year > y``, or ``year = y`` and
+        ``period > p``, or both equal and ``id > i``. The leading
+        ``year >= y`` repeats what the branches imply so the planner can
+        start an index range scan at ``y``.
+        """
+        keys = list(zip(self.ordering, position))
+        after = Q()
+        for depth, (name, value) in enumerate(keys):
+            after |= Q(**dict(keys[:depth]), **{f"{name}__gt": value})
+        name, value = keys[0]
+        return Q(**{f"{name}__gte": value}) & after
+
+    def get_position(self, row) -> tuple:
+        """Key of ``row``, a model instance or a ``.values()`` dict."""
+        if isinstance(row, dict):
+            return tuple(row[name] for name in self.ordering)
+        return tuple(getattr(row, name) for name in self.ordering)
+
+    def get_limit(self, request) -> int:
+        try:
+            return _positive_int(request.query_params[self.limit_query_param], strict=True)
+        except (KeyError, ValueError):
+            return settings.REST_FRAMEWORK["PAGE_SIZE"]
+
+    def decode_cursor(self, request) -> tuple | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            year, period, pk = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            return int(year), str(period), int(pk)
+        except (TypeError, ValueError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def encode_cursor(position: tuple) -> str:
+        return base64.urlsafe_b64encode(json.dumps(list(position)).encode("utf-8")).decode("ascii")
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last_position))
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
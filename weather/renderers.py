@@ -0,0 +1,58 @@
+from itertools import islice
+
+from rest_framework.renderers import JSONRenderer
+
+SHORT_SEPARATORS = (",", ":")
+LONG_SEPARATORS = (", ", ": ")
+
+
+class StreamingJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that can also produce the body incrementally.
+
+    ``stream`` yields the rendered JSON in chunks, encoding a (paginated)
+    ``results`` list, which may be any iterable, ``chunk_rows`` rows at a
+    time. The joined chunks are byte-for-byte what ``render`` returns.
+    """
+
+    chunk_rows = 500
+
+    def stream(self, data, accepted_media_type=None, renderer_context=None):
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            yield self.render(data, accepted_media_type, renderer_context)
+            return
+
+        encoder = self.encoder_class(
+            ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict,
+            separators=SHORT_SEPARATORS if self.compact else LONG_SEPARATORS,
+        )
+        item_separator, key_separator = encoder.item_separator, encoder.key_separator
+
+        def _encode(value) -> bytes:
+            # Same \u2028/\u2029 escaping as JSONRenderer.render.
+            return encoder.encode(value).replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+        if not isinstance(data, dict):
+            yield from self._stream_list(data, _encode, item_separator)
+            return
+
+        yield b"{"
+        for index, (key, value) in enumerate(data.items()):
+            yield (item_separator if index else "").encode() + _encode(key) + key_separator.encode()
+            if key == "results":
+                yield from self._stream_list(value, _encode, item_separator)
+            else:
+                yield _encode(value)
+        yield b"}"
+
+    def _stream_list(self, rows, encode, item_separator: str):
+        yield b"["
+        rows = iter(rows)
+        first = True
+        while batch := list(islice(rows, self.chunk_rows)):
+            # Encode a batch as one list and drop its brackets.
+            chunk = encode(batch)[1:-1]
+            yield chunk if first else item_separator.encode() + chunk
+            first = False
+        yield b"]"
@@ -1,6 +1,12 @@
+from typing import Iterable, Iterator
+
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.fields import empty
 
-from .models import ClimateRecord, Parameter, Region
+from .models import ClimateRecord, IngestJob, Parameter, Region
+from .services import downsampling, reference
+from .services.series import PERIOD_ORDER
 
 
 class RegionSerializer(serializers.ModelSerializer):
@@ -38,10 +44,140 @@ class ClimateRecordSerializer(serializers.ModelSerializer):
         ]
 
 
+# What ClimateRecordSerializer reads, as .values() lookups joined in SQL.
+CLIMATE_RECORD_VALUES = [
+    "id",
+    "year",
+    "period_type",
+    "period",
+    "value",
+    "region__code",
+    "region__name",
+    "parameter__code",
+    "parameter__name",
+    "source_last_updated",
+    "fetched_at",
+]
+
+
+def climate_record_rows(rows: Iterable[dict]) -> Iterator[dict]:
+    """
+    Format ``.values(*CLIMATE_RECORD_VALUES)`` rows exactly as
+    ``ClimateRecordSerializer`` would, without model instances or per-field
+    serializer calls.
+    """
+    value_format = f".{ClimateRecord._meta.get_field('value').decimal_places}f"
+    current_timezone = timezone.get_current_timezone()
+    # A dataset's rows share a handful of timestamps, so format each one once.
+    formatted: dict = {None: None}
+
+    def _datetime(value):
+        if value not in formatted:
+            # As serializers.DateTimeField: ISO 8601 in the current timezone, UTC as "Z".
+            text = value.astimezone(current_timezone).isoformat()
+            formatted[value] = text[:-6] + "Z" if text.endswith("+00:00") else text
+        return formatted[value]
+
+    for row in rows:
+        value = row["value"]
+        yield {
+            "id": row["id"],
+            "year": row["year"],
+            "period_type": row["period_type"],
+            "period": row["period"],
+            "value": None if value is None else format(value, value_format),
+            "region_code": row["region__code"],
+            "region_name": row["region__name"],
+            "parameter_code": row["parameter__code"],
+            "parameter_name": row["parameter__name"],
+            "source_last_updated": _datetime(row["source_last_updated"]),
+            "fetched_at": _datetime(row["fetched_at"]),
+        }
+
+
+class DownsampleQuerySerializer(serializers.Serializer):
+    max_points = serializers.IntegerField(required=False, min_value=downsampling.MIN_POINTS)
+
+
+class AnomalyQuerySerializer(serializers.Serializer):
+    baseline_start = serializers.IntegerField(default=1961, min_value=0)
+    baseline_end = serializers.IntegerField(default=1990, min_value=0)
+
+    def validate(self, attrs):
+        if attrs["baseline_start"] > attrs["baseline_end"]:
+            raise serializers.ValidationError({"baseline_end": "Must not be before baseline_start."})
+        return attrs
+
+
+class RollingMeanQuerySerializer(serializers.Serializer):
+    window = serializers.IntegerField(default=10, min_value=2, max_value=100)
+
+
+class TrendQuerySerializer(serializers.Serializer):
+    confidence = serializers.FloatField(default=0.95, min_value=0.5, max_value=0.999)
+
+
+class CodeListField(serializers.ListField):
+    """A list of codes from repeated and/or comma-separated query parameters, deduplicated case-insensitively."""
+
+    child = serializers.CharField()
+
+    def get_value(self, dictionary):
+        if not hasattr(dictionary, "getlist"):
+            return super().get_value(dictionary)
+        values = [part.strip() for value in dictionary.getlist(self.field_name) for part in value.split(",")]
+        return [value for value in values if value] or empty
+
+    def to_internal_value(self, data):
+        unique, seen = [], set()
+        for value in super().to_internal_value(data):
+            if value.upper() not in seen:
+                seen.add(value.upper())
+                unique.append(value)
+        return unique
+
+
+class ComparisonQuerySerializer(serializers.Serializer):
+    regions = CodeListField(allow_empty=False)
+    parameters = CodeListField(allow_empty=False)
+    periods = CodeListField(allow_empty=False, required=False, default=["ann"])
+    start_year = serializers.IntegerField(required=False, min_value=0)
+    end_year = serializers.IntegerField(required=False, min_value=0)
+
+    def validate_periods(self, values: list[str]) -> list[str]:
+        periods = [value.lower() for value in values]
+        unknown = [value for value, period in zip(values, periods) if period not in PERIOD_ORDER]
+        if unknown:
+            raise serializers.ValidationError(f"Unknown periods: {', '.join(unknown)}")
+        return periods
+
+
 class IngestRequestSerializer(serializers.Serializer):
     url = serializers.URLField()
 
 
+class IngestJobSerializer(serializers.ModelSerializer):
+    region_code = serializers.CharField(source="region.code", read_only=True)
+    parameter_code = serializers.CharField(source="parameter.code", read_only=True)
+
+    class Meta:
+        model = IngestJob
+        fields = [
+            "id",
+            "status",
+            "region_code",
+            "parameter_code",
+            "source_url",
+            "stages",
+            "result",
+            "error",
+            "task_id",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+
 class IngestTriggerSerializer(serializers.Serializer):
     regions = serializers.ListField(
         child=serializers.CharField(),
@@ -55,28 +191,13 @@ class IngestTriggerSerializer(serializers.Serializer):
     )
 
     @staticmethod
-    def _dedupe(values: list[str]) -> list[str]:
-        unique: list[str] = []
-        for value in values:
-            if value not in unique:
-                unique.append(value)
-        return unique
-
-    def _resolve_codes(self, model, values: list[str]) -> list[str]:
-        cleaned: list[str] = []
-        missing: list[str] = []
-        for value in values:
-            try:
-                obj = model.objects.get(code__iexact=value)
-            except model.DoesNotExist:
-                missing.append(value)
-            else:
-                cleaned.append(obj.code)
+    def _resolve_codes(model, values: list[str]) -> list[str]:
+        rows, missing = reference.resolve_codes(model, values)
         if missing:
             raise serializers.ValidationError(
                 f"Unknown {model.__name__.lower()} codes: {', '.join(missing)}"
             )
-        return self._dedupe(cleaned)
+        return [row.code for row in rows]
 
     def validate_regions(self, values: list[str]) -> list[str]:
         return self._resolve_codes(Region, values)
@@ -0,0 +1,199 @@
+"""
+Analytics over whole series: anomalies, rolling means and linear trends.
+
+Each period (a month, a season or the annual value) is its own yearly
+series. The functions take a dataset's ``PackedDataset.table`` (one column
+per period on a shared year axis) and work on all columns at once with
+vectorised NumPy, returning compact arrays.
+"""
+
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+
+import numpy as np
+
+from weather.services.series import PackedDataset, describe
+
+# One more than the stored values, so derived series don't lose precision.
+DECIMAL_PLACES = 3
+YEAR_FILTERS = ("start_year", "end_year")
+
+
+def anomalies(dataset: PackedDataset, filters: dict, baseline_start: int, baseline_end: int) -> dict:
+    """
+    Departures of each value from its period's mean over the baseline years.
+
+    The baseline ignores the ``start_year``/``end_year`` filters, which only
+    limit the years returned.
+    """
+    years, periods, table = dataset.table(_without_years(filters))
+    in_baseline = (years >= baseline_start) & (years <= baseline_end)
+    baseline = _nanmean(table[in_baseline])
+    year, period, value = _cells(years, periods, table - baseline, filters)
+    return {
+        **describe(dataset.region, dataset.parameter),
+        "baseline": {
+            "start_year": baseline_start,
+            "end_year": baseline_end,
+            "mean": {name: _round(mean) for name, mean in zip(periods, baseline.tolist())},
+        },
+        "count": len(value),
+        "year": year,
+        "period": period,
+        "value": value,
+    }
+
+
+def rolling_means(dataset: PackedDataset, filters: dict, window: int) -> dict:
+    """
+    Trailing ``window``-year means of each period.
+
+    A year only gets a mean once the ``window`` years ending with it all have
+    values; earlier years in the window may fall before ``start_year``.
+    """
+    years, periods, table = dataset.table(_without_years(filters))
+    present = ~np.isnan(table)
+    sums = np.vstack([np.zeros((1, table.shape[1])), np.cumsum(np.where(present, table, 0.0), axis=0)])
+    counts = np.vstack([np.zeros((1, table.shape[1]), dtype=np.int64), np.cumsum(present, axis=0)])
+    means = np.full(table.shape, np.nan)
+    if len(years) >= window:
+        window_sums = sums[window:] - sums[:-window]
+        window_counts = counts[window:] - counts[:-window]
+        means[window - 1 :] = np.where(window_counts == window, window_sums / window, np.nan)
+    year, period, value = _cells(years, periods, means, filters)
+    return {
+        **describe(dataset.region, dataset.parameter),
+        "window": window,
+        "count": len(value),
+        "year": year,
+        "period": period,
+        "value": value,
+    }
+
+
+def trend(dataset: PackedDataset, filters: dict, confidence: float) -> dict:
+    """
+    Least-squares linear trend of each period, per decade, with a ``confidence`` interval.
+
+    Periods with fewer than three values get nulls.
+    """
+    years, periods, table = dataset.table(filters)
+    present = ~np.isnan(table)
+    count = present.sum(axis=0)
+    x = np.where(present, years[:, np.newaxis], 0.0)
+    y = np.where(present, table, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = x.sum(axis=0) / count
+        y_mean = y.sum(axis=0) / count
+        dx = np.where(present, x - x_mean, 0.0)
+        dy = np.where(present, y - y_mean, 0.0)
+        sxx = (dx * dx).sum(axis=0)
+        slope = (dx * dy).sum(axis=0) / sxx
+        residuals = np.where(present, dy - slope * dx, 0.0)
+        standard_error = np.sqrt((residuals * residuals).sum(axis=0) / (count - 2) / sxx)
+    margin = np.array([t_quantile((1 + confidence) / 2, n - 2) if n > 2 else np.nan for n in count.tolist()])
+    fitted = count > 2
+    slope, margin = np.where(fitted, slope, np.nan) * 10, np.where(fitted, standard_error * margin, np.nan) * 10
+
+    first_year = [int(years[column].min()) if column.any() else None for column in present.T]
+    last_year = [int(years[column].max()) if column.any() else None for column in present.T]
+    return {
+        **describe(dataset.region, dataset.parameter),
+        "confidence": confidence,
+        "period": periods,
+        "count": count.tolist(),
+        "first_year": first_year,
+        "last_year": last_year,
+        "slope_per_decade": [_round(value) for value in slope.tolist()],
+        "ci_low": [_round(value) for value in (slope - margin).tolist()],
+        "ci_high": [_round(value) for value in (slope + margin).tolist()],
+    }
+
+
+def t_quantile(probability: float, df: int) -> float:
+    """
+    Quantile of Student's t distribution with ``df`` (a positive integer) degrees of freedom.
+
+    One and two degrees of freedom have closed forms. Otherwise the
+    Cornish-Fisher expansion around the normal quantile (Abramowitz & Stegun
+    26.7.5), which is up to 4% low for small ``df`` in the far tail, is
+    refined by Newton steps on the exact distribution function, to float
+    precision.
+    """
+    if probability < 0.5:
+        return -t_quantile(1 - probability, df)
+    if df == 1:
+        return math.tan(math.pi * (probability - 0.5))
+    if df == 2:
+        q = 2 * probability - 1
+        return q * math.sqrt(2 / (1 - q * q))
+
+    z = NormalDist().inv_cdf(probability)
+    terms = [
+        (z**3 + z) / 4,
+        (5 * z**5 + 16 * z**3 + 3 * z) / 96,
+        (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / 384,
+        (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / 92160,
+    ]
+    t = z + sum(term / df ** (power + 1) for power, term in enumerate(terms))
+    log_scale = math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - math.log(df * math.pi) / 2
+    # The expansion starts below the quantile and the CDF is concave above
+    # zero, so the steps climb to it without overshooting.
+    for _ in range(20):
+        density = math.exp(log_scale - (df + 1) / 2 * math.log1p(t * t / df))
+        step = (probability - _t_cdf(t, df)) / density
+        t += step
+        if abs(step) <= 1e-12 * t:
+            break
+    return t
+
+
+def _t_cdf(t: float, df: int) -> float:
+    """Student's t distribution function for integer ``df`` (Abramowitz & Stegun 26.7.3 and 26.7.4)."""
+    theta = math.atan(t / math.sqrt(df))
+    cos2 = math.cos(theta) ** 2
+    term = total = 1.0
+    if df % 2:
+        for k in range(1, (df - 1) // 2):
+            term *= 2 * k / (2 * k + 1) * cos2
+            total += term
+        area = 2 / math.pi * (theta + (math.sin(theta) * math.cos(theta) * total if df > 1 else 0.0))
+    else:
+        for k in range(1, df // 2):
+            term *= (2 * k - 1) / (2 * k) * cos2
+            total += term
+        area = math.sin(theta) * total
+    return (1 + area) / 2
+
+
+def _without_years(filters: dict) -> dict:
+    return {name: value for name, value in filters.items() if name not in YEAR_FILTERS}
+
+
+def _nanmean(table: np.ndarray) -> np.ndarray:
+    present = ~np.isnan(table)
+    count = present.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(present, table, 0.0).sum(axis=0) / count
+
+
+def _cells(years: np.ndarray, periods: list[str], table: np.ndarray, filters: dict) -> tuple[list, list, list]:
+    """Flatten ``table`` to chronological ``year``/``period``/``value`` lists within the year filters."""
+    keep = np.ones(len(years), dtype=bool)
+    if filters.get("start_year") is not None:
+        keep &= years >= math.ceil(filters["start_year"])
+    if filters.get("end_year") is not None:
+        keep &= years <= math.floor(filters["end_year"])
+    table = table[keep]
+    rows, columns = np.nonzero(~np.isnan(table))
+    return (
+        years[keep][rows].tolist(),
+        np.array(periods, dtype=object)[columns].tolist(),
+        np.round(table[rows, columns], DECIMAL_PLACES).tolist(),
+    )
+
+
+def _round(value: float) -> float | None:
+    return None if np.isnan(value) else round(value, DECIMAL_PLACES)
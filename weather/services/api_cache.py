@@ -0,0 +1,126 @@
+"""
+Versioned response cache for the read API.
+
+Cached responses are keyed on their normalised query and on the version of the
+data scope they were built from. Record scopes are per (region, parameter),
+with wildcard scopes for queries spanning several regions or parameters, so a
+write to one dataset only retires the responses that could include it. Every
+response also depends on the reference scope (regions and parameters). A
+version is the time of its last bump in nanoseconds, which doubles as the
+``Last-Modified`` of the responses built under it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from weather.models import ClimateRecord, Parameter, Region
+
+ANY = "*"
+REFERENCE_SCOPE = "reference"
+
+
+def enabled() -> bool:
+    return settings.API_CACHE_TIMEOUT > 0
+
+
+def records_scope(region: str | None = None, parameter: str | None = None) -> str:
+    """
+    Scope of a records query filtered to ``region``/``parameter`` (None or
+    blank = any). Codes are normalised the way the filters read them, so raw
+    query values share the scope that ``invalidate`` bumps.
+    """
+    region, parameter = (region or "").strip() or ANY, (parameter or "").strip() or ANY
+    return f"records:{region.lower()}:{parameter.lower()}"
+
+
+def _version_key(scope: str) -> str:
+    return f"api:version:{scope}"
+
+
+def get_versions(scopes: Iterable[str]) -> list[int]:
+    keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            version = time.time_ns()
+            # add() so concurrent first readers settle on the same version.
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+            found[key] = version
+    return [found[key] for key in keys]
+
+
+def bump(*scopes: str) -> None:
+    version = time.time_ns()
+    cache.set_many({_version_key(scope): version for scope in scopes}, timeout=None)
+
+
+def invalidate(region_code: str, parameter_code: str) -> None:
+    """Retire cached responses that may include the dataset of ``region_code``/``parameter_code``."""
+    scopes = [records_scope(region, parameter) for region in (region_code, None) for parameter in (parameter_code, None)]
+    bump(*scopes)
+    # A request served between this bump and the commit could cache the old
+    # rows under the new version, so bump again once the writes are visible.
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: bump(*scopes))
+
+
+def invalidate_reference() -> None:
+    """Retire everything built from region and parameter details, which is every response."""
+    bump(REFERENCE_SCOPE)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: bump(REFERENCE_SCOPE))
+
+
+def invalidate_records(records: Iterable[ClimateRecord]) -> None:
+    """``invalidate`` every dataset that ``records`` belong to."""
+    pairs = {(record.region_id, record.parameter_id) for record in records}
+    if not pairs:
+        return
+    regions = dict(Region.objects.filter(pk__in={pair[0] for pair in pairs}).values_list("pk", "code"))
+    parameters = dict(Parameter.objects.filter(pk__in={pair[1] for pair in pairs}).values_list("pk", "code"))
+    for region_id, parameter_id in pairs:
+        invalidate(regions[region_id], parameters[parameter_id])
+
+
+def response_key(path: str, params, media_type: str, scopes: Iterable[str]) -> tuple[str, int]:
+    """
+    Return the cache key for a request and the latest version of its scopes.
+
+    ``params`` is a ``QueryDict``; blank values are dropped and the rest
+    sorted, so equivalent queries share an entry.
+    """
+    scopes = list(scopes)
+    versions = get_versions(scopes)
+    query = sorted((name, value) for name in params for value in params.getlist(name) if value != "")
+    raw = repr((path, query, media_type, scopes, versions))
+    return f"api:response:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}", max(versions)
+
+
+def etag(key: str) -> str:
+    # The key already covers the query and data version, so equal keys mean equal bodies.
+    return f'W/"{key.rsplit(":", 1)[-1]}"'
+
+
+def get(key: str) -> dict | None:
+    return cache.get(key)
+
+
+def store(key: str, content: bytes, content_type: str) -> None:
+    cache.set(key, {"content": content, "content_type": content_type}, timeout=settings.API_CACHE_TIMEOUT)
+
+
+def store_streamed(key: str, chunks: Iterable[bytes], content_type: str) -> Iterator[bytes]:
+    """Pass ``chunks`` through, caching the whole body once the last one has been sent."""
+    body = []
+    for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+    store(key, b"".join(body), content_type)
@@ -0,0 +1,41 @@
+"""
+Dashboard payloads.
+
+One payload carries everything the dashboard draws for a selection: the
+chronological series for the chart, the summary cards and the newest rows
+for the table. A selection change then costs one request, and the first
+paint none, since ``DashboardView`` embeds the default selection's payload.
+"""
+
+from __future__ import annotations
+
+from weather.models import ClimateRecord
+from weather.services.series import PackedDataset
+
+DEFAULT_PERIOD_TYPE = ClimateRecord.PeriodType.MONTH.value
+TABLE_ROWS = 120
+# Chart points the dashboard asks for; more than its canvas is wide.
+CHART_POINTS = 800
+
+
+def build_payload(
+    dataset: PackedDataset,
+    filters: dict,
+    max_points: int | None = None,
+    table_rows: int = TABLE_ROWS,
+) -> dict:
+    """
+    The series, summary and newest ``table_rows`` cells (newest first) of ``dataset`` under ``filters``.
+
+    ``max_points`` downsamples the chart series only; the summary and table
+    cover every cell.
+    """
+    series = dataset.series(filters)
+    payload = (series.downsample(max_points) if max_points else series).as_dict()
+    payload["summary"] = dataset.summary(filters)
+    payload["table"] = {
+        "year": series.year[: -table_rows - 1 : -1],
+        "period": series.period[: -table_rows - 1 : -1],
+        "value": series.value[: -table_rows - 1 : -1],
+    }
+    return payload
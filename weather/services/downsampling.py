@@ -0,0 +1,38 @@
+"""
+Shape-preserving downsampling for charts.
+
+Series are cut into equal buckets and each bucket keeps its lowest and
+highest point, so peaks and troughs survive however far the series is
+reduced. Bucket extremes are found with one ``nanargmin``/``nanargmax``
+over a ``(buckets, bucket size)`` reshape of the values.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+MIN_POINTS = 4
+
+
+def minmax_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Sorted indices of at most ``max_points`` points of ``values`` to keep.
+
+    The first and last points are always kept; ``max_points`` must be at
+    least ``MIN_POINTS``.
+    """
+    count = len(values)
+    if count <= max_points:
+        return np.arange(count)
+    inner = np.asarray(values[1:-1], dtype=np.float64)
+    size = math.ceil(len(inner) / ((max_points - 2) // 2))
+    buckets = math.ceil(len(inner) / size)
+    padded = np.full(buckets * size, np.nan)
+    padded[: len(inner)] = inner
+    grid = padded.reshape(buckets, size)
+    starts = np.arange(buckets) * size + 1
+    return np.unique(
+        np.concatenate([[0], starts + np.nanargmin(grid, axis=1), starts + np.nanargmax(grid, axis=1), [count - 1]])
+    )
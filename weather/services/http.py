@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+_session_pid: int | None = None
+
+
+def build_session() -> requests.Session:
+    """
+    Create a keep-alive session configured from the ``METOFFICE_HTTP_*`` settings.
+
+    Idempotent requests are retried with exponential backoff on connection
+    errors and on 429/5xx responses (honouring ``Retry-After``). Once retries
+    run out the last response is returned so callers can inspect its status.
+    """
+    retry = Retry(
+        total=settings.METOFFICE_HTTP_RETRIES,
+        backoff_factor=settings.METOFFICE_HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=settings.METOFFICE_HTTP_POOL_SIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide session, creating it on first use.
+
+    A forked child (e.g. a Celery prefork worker) gets a fresh session rather
+    than sharing the parent's sockets.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _lock:
+            if _session is None or _session_pid != pid:
+                _session = build_session()
+                _session_pid = pid
+    return _session
+
+
+def reset_session() -> None:
+    """Close the shared session so the next ``get_session`` picks up new settings."""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def timeout() -> tuple[float, float]:
+    return settings.METOFFICE_HTTP_CONNECT_TIMEOUT, settings.METOFFICE_HTTP_READ_TIMEOUT
@@ -0,0 +1,94 @@
+"""
+Queued ingests of a single dataset URL.
+
+``/api/ingest/`` records an ``IngestJob`` and hands its id to a Celery task,
+so the web worker answers at once instead of waiting on the download, parse
+and upsert. ``run_job`` performs the sync, saving each stage to the job as
+it finishes so ``/api/ingest/jobs/<id>/`` can report progress.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from django.utils import timezone
+
+from weather.models import IngestJob
+from weather.services import metoffice
+
+logger = logging.getLogger(__name__)
+
+
+def create_job(url: str, task_id: str = "") -> IngestJob:
+    """Record a queued job for ``url``; raises ``MetOfficeDatasetError`` if it names no known dataset."""
+    region, parameter = metoffice.resolve_models_from_url(url)
+    return IngestJob.objects.create(region=region, parameter=parameter, source_url=url, task_id=task_id)
+
+
+class _StageRecorder:
+    """``on_stage`` callback that times each stage from the end of the previous one."""
+
+    def __init__(self, job: IngestJob):
+        self.job = job
+        self.mark = time.perf_counter()
+
+    def __call__(self, stage: str, **details) -> None:
+        now = time.perf_counter()
+        self.job.stages[stage] = {"seconds": round(now - self.mark, 3), **details}
+        self.mark = now
+        self.job.save(update_fields=["stages"])
+
+
+def run_job(job: IngestJob, retry_downloads: bool = False) -> IngestJob:
+    """
+    Sync the job's dataset and record the outcome.
+
+    Dataset errors (bad payloads, failed downloads) fail the job; anything
+    else fails it and is re-raised. With ``retry_downloads`` a transient
+    ``MetOfficeDownloadError`` instead puts the job back in the queue, with
+    its stages cleared, and is re-raised for the caller to retry.
+    """
+    job.status = IngestJob.Status.RUNNING
+    job.started_at = timezone.now()
+    job.save(update_fields=["status", "started_at"])
+    try:
+        job.result = metoffice.sync_dataset(
+            job.region, job.parameter, source_url=job.source_url, on_stage=_StageRecorder(job)
+        )
+        job.status = IngestJob.Status.SUCCEEDED
+    except metoffice.MetOfficeDownloadError as exc:
+        if not retry_downloads:
+            logger.warning("[ingest-job] Job %s failed: %s", job.pk, exc)
+            _finish(job, exc)
+            return job
+        logger.warning("[ingest-job] Job %s will be retried: %s", job.pk, exc)
+        # The retry starts over, so drop what this attempt recorded.
+        job.status = IngestJob.Status.QUEUED
+        job.stages = {}
+        job.started_at = None
+        job.save(update_fields=["status", "stages", "started_at"])
+        raise
+    except metoffice.MetOfficeDatasetError as exc:
+        logger.warning("[ingest-job] Job %s failed: %s", job.pk, exc)
+        _finish(job, exc)
+        return job
+    except Exception as exc:
+        logger.exception("[ingest-job] Job %s failed", job.pk)
+        _finish(job, exc)
+        raise
+    _finish(job)
+    return job
+
+
+def fail_job(job: IngestJob, exc: Exception) -> None:
+    """Record ``job`` as failed with ``exc`` without running it (e.g. when it could not be queued)."""
+    _finish(job, exc)
+
+
+def _finish(job: IngestJob, exc: Exception | None = None) -> None:
+    if exc is not None:
+        job.status = IngestJob.Status.FAILED
+        job.error = str(exc)
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "result", "error", "finished_at"])
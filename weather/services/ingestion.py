@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Sequence
+from urllib.parse import urlparse
+
+from django.conf import settings
+
+from weather.models import DatasetFetchState, Parameter, Region
+from weather.services import metoffice
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter:
+    """
+    Spaces out request starts so no host sees more than ``rate`` per second.
+
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot: dict[str, float] = {}
+
+    def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def failure_result(region_code: str, parameter_code: str, exc: Exception) -> dict:
+    return {"region": region_code, "parameter": parameter_code, "error": str(exc)}
+
+
+def _prepare(
+    limiter: HostRateLimiter,
+    region: Region,
+    parameter: Parameter,
+    state: DatasetFetchState,
+    stream: bool | None,
+    offline: bool,
+) -> metoffice.PreparedDataset:
+    if not offline:
+        limiter.wait(metoffice.build_dataset_url(parameter.code, region.dataset_slug))
+    return metoffice.prepare_dataset(region, parameter, state, stream=stream, offline=offline)
+
+
+def run_ingestion(
+    regions: Sequence[Region],
+    parameters: Sequence[Parameter],
+    *,
+    force: bool = False,
+    workers: int | None = None,
+    rate_limit: float | None = None,
+    stream: bool | None = None,
+    offline: bool = False,
+    on_result: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Ingest every (region, parameter) pair, overlapping downloads.
+
+    Downloads and parsing run on a bounded thread pool; persistence happens
+    on the calling thread so only one connection writes at a time. Each
+    finished dataset is passed to ``on_result`` as either a run dict or a
+    failure dict (which carries an ``error`` key).
+
+    In streaming mode (``stream``, default ``METOFFICE_STREAM_INGEST``) the
+    workers only read up to each dataset's header; the body is downloaded and
+    parsed batch by batch while the writer persists it. The writer is then
+    the bottleneck, so datasets are opened one at a time rather than leaving
+    responses idle until it gets to them. With ``offline`` datasets are read
+    from the local mirror and the network is never used.
+    """
+    if stream is None:
+        stream = settings.METOFFICE_STREAM_INGEST
+    workers = 1 if stream else max(1, workers or settings.METOFFICE_INGEST_WORKERS)
+    # Keep at most two parsed datasets per worker waiting on the writer, and
+    # no open stream beyond the one being written.
+    backlog = 1 if stream else workers * 2
+    if rate_limit is None:
+        rate_limit = settings.METOFFICE_HOST_RATE_LIMIT
+    limiter = HostRateLimiter(rate_limit)
+
+    states = {
+        (state.region_id, state.parameter_id): state
+        for state in DatasetFetchState.objects.filter(region__in=regions, parameter__in=parameters)
+    }
+    pairs = [(region, parameter) for region in regions for parameter in parameters]
+
+    results: list[tuple[int, dict]] = []
+    jobs: dict[Future, tuple[int, Region, Parameter, DatasetFetchState]] = {}
+
+    def _store(future: Future) -> None:
+        index, region, parameter, state = jobs.pop(future)
+        try:
+            result = metoffice.store_dataset(region, parameter, state, future.result())
+        except metoffice.MetOfficeDatasetError as exc:
+            logger.warning("[ingest] Failed to ingest %s/%s: %s", region.code, parameter.code, exc)
+            result = failure_result(region.code, parameter.code, exc)
+        results.append((index, result))
+        if on_result:
+            on_result(result)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metoffice-fetch") as pool:
+        for index, (region, parameter) in enumerate(pairs):
+            state = states.get((region.id, parameter.id)) or DatasetFetchState(
+                region=region, parameter=parameter
+            )
+            if force:
+                metoffice.reset_fetch_state(state)
+            future = pool.submit(_prepare, limiter, region, parameter, state, stream, offline)
+            jobs[future] = (index, region, parameter, state)
+            if len(jobs) >= backlog:
+                done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _store(future)
+        while jobs:
+            done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+            for future in done:
+                _store(future)
+
+    return summarise_results(result for _, result in sorted(results, key=lambda item: item[0]))
+
+
+def summarise_results(results: Iterable[dict]) -> dict:
+    """Fold per-dataset run/failure dicts into the ``runs``/``failures``/``total_rows`` payload."""
+    runs: list[dict] = []
+    failures: list[dict] = []
+    for result in results:
+        (failures if "error" in result else runs).append(result)
+    return {
+        "runs": runs,
+        "failures": failures,
+        "total_rows": sum(run["rows"] for run in runs),
+        "not_modified": sum(1 for run in runs if run["status"] == metoffice.SYNC_NOT_MODIFIED),
+    }
+
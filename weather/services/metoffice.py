@@ -1,46 +1,166 @@
 from __future__ import annotations
 
+import hashlib
 import io
 import logging
+import re
 import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from pathlib import PurePosixPath
-from typing import Iterable
+from typing import Callable, Iterable, Iterator
 from urllib.parse import unquote, urlparse
 
+import numpy as np
 import pandas as pd
 import requests
 from django.conf import settings
-from django.db import OperationalError, close_old_connections
+from django.db import OperationalError, close_old_connections, connection, transaction
 from django.utils import timezone
 
-from weather.constants import ANNUAL_COLUMN, MONTH_COLUMNS, SEASON_COLUMNS
-from weather.models import ClimateRecord, Parameter, Region
+from weather.constants import PERIOD_COLUMNS
+from weather.models import ClimateRecord, DatasetFetchState, Parameter, Region
+from weather.services import api_cache, http, mirror, reference, rollups, series
 
 logger = logging.getLogger(__name__)
 
+SYNC_UPDATED = "updated"
+SYNC_NOT_MODIFIED = "not_modified"
+
+# ``on_stage(stage, **details)`` is called as each stage of a sync finishes:
+# "download" (bytes), "parse" (years) and "store" (rows, rows_written).
+StageCallback = Callable[..., None]
+
 
 class MetOfficeDatasetError(Exception):
     """Raised when a dataset cannot be fetched or parsed."""
 
 
+class MetOfficeDownloadError(MetOfficeDatasetError):
+    """Raised when a download fails for a transient reason (network error, 5xx, 429)."""
+
+
+class DatasetNotModified(Exception):
+    """Raised when the server confirms a dataset is unchanged since the last fetch."""
+
+    def __init__(self, url: str):
+        super().__init__(f"Dataset {url} not modified")
+        self.url = url
+
+
 def build_dataset_url(parameter_code: str, dataset_slug: str, order: str = "date") -> str:
     return f"{settings.METOFFICE_BASE_URL}/{parameter_code}/{order}/{dataset_slug}.txt"
 
 
-def fetch_dataset_text(parameter_code: str, dataset_slug: str) -> tuple[str, str]:
+def fetch_dataset_text(
+    parameter_code: str,
+    dataset_slug: str,
+    state: DatasetFetchState | None = None,
+    offline: bool = False,
+) -> tuple[str, str]:
     url = build_dataset_url(parameter_code, dataset_slug)
-    return fetch_dataset_text_by_url(url)
+    return fetch_dataset_text_by_url(url, state=state, offline=offline)
 
 
-def fetch_dataset_text_by_url(url: str) -> tuple[str, str]:
+def _conditional_headers(url: str, state: DatasetFetchState | None) -> dict[str, str]:
+    if state is None or state.source_url != url:
+        return {}
+    headers = {}
+    if state.etag:
+        headers["If-None-Match"] = state.etag
+    if state.last_modified:
+        headers["If-Modified-Since"] = state.last_modified
+    return headers
+
+
+def _is_transient(exc: requests.RequestException) -> bool:
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(exc, "response", None)
+    return response is not None and (response.status_code >= 500 or response.status_code == 429)
+
+
+def _request_dataset(
+    url: str,
+    state: DatasetFetchState | None,
+    stream: bool = False,
+    conditional: bool = True,
+) -> requests.Response:
+    headers = _conditional_headers(url, state) if conditional else {}
     try:
-        response = requests.get(url, timeout=30)
+        response = http.get_session().get(url, headers=headers, timeout=http.timeout(), stream=stream)
         response.raise_for_status()
     except requests.RequestException as exc:
-        raise MetOfficeDatasetError(f"Unable to download dataset {url}") from exc
-    return response.text, url
+        error_class = MetOfficeDownloadError if _is_transient(exc) else MetOfficeDatasetError
+        raise error_class(f"Unable to download dataset {url}") from exc
+    if response.status_code == 304:
+        response.close()
+        raise DatasetNotModified(url)
+    if state is not None:
+        state.etag = response.headers.get("ETag", "")
+        state.last_modified = response.headers.get("Last-Modified", "")
+    return response
+
+
+def _mirror_lookup(url: str, offline: bool) -> mirror.MirrorEntry | None:
+    """The mirrored copy to serve instead of downloading, if any."""
+    entry = mirror.lookup(url) if mirror.enabled() else None
+    if offline and entry is None:
+        raise MetOfficeDatasetError(f"Dataset {url} is not in the local mirror.")
+    return entry
+
+
+def _mirror_lost(url: str, offline: bool) -> None:
+    """Treat a mirrored payload evicted since ``_mirror_lookup`` (by another worker's prune) as a miss."""
+    logger.info("Mirrored copy of %s was evicted before it could be read", url)
+    if offline:
+        raise MetOfficeDatasetError(f"Dataset {url} is not in the local mirror.")
+
+
+def _should_revalidate(entry: mirror.MirrorEntry | None) -> bool:
+    # Without a mirrored copy to fall back on, a 304 would leave the mirror
+    # empty, so ask for the full body instead.
+    return entry is not None or not mirror.enabled()
+
+
+def fetch_dataset_text_by_url(
+    url: str,
+    state: DatasetFetchState | None = None,
+    offline: bool = False,
+) -> tuple[str, str]:
+    """
+    Download a dataset, sending the validators held on ``state`` (if any).
+
+    Raises ``DatasetNotModified`` on a 304. On a full response the new
+    validators are copied onto ``state``; saving it is left to the caller.
+    The local mirror is consulted first: ``offline`` serves only from it, and
+    a copy younger than ``METOFFICE_MIRROR_TTL`` is served without a request.
+    """
+    entry = _mirror_lookup(url, offline)
+    if entry is not None and (offline or mirror.is_fresh(entry)):
+        try:
+            return mirror.read_text(entry), url
+        except OSError:
+            _mirror_lost(url, offline)
+            entry = None
+
+    try:
+        response = _request_dataset(url, state, conditional=_should_revalidate(entry))
+    except DatasetNotModified:
+        if entry is not None:
+            mirror.touch(url)
+        raise
+    encoding = response.encoding or "utf-8"
+    if mirror.enabled():
+        mirror.store(
+            url,
+            response.content,
+            encoding,
+            response.headers.get("ETag", ""),
+            response.headers.get("Last-Modified", ""),
+        )
+    return response.content.decode(encoding, errors="replace"), url
 
 
 def _parse_last_updated_line(line: str) -> datetime | None:
@@ -61,7 +181,124 @@ def _parse_last_updated_line(line: str) -> datetime | None:
     return None
 
 
+class FixedWidthDatasetParser:
+    """
+    Incremental parser for the Met Office fixed-width text layout.
+
+    Lines are fed one at a time. The preamble is scanned for the
+    ``Last updated`` stamp until the ``year jan … ann`` header appears; data
+    lines are then buffered until ``take`` decodes them. Complete rows go
+    through NumPy's C text reader in one call; rows with blank cells (the
+    current, incomplete year) are split on the header's right-aligned column
+    edges so each value stays in its own column. Rows that don't line up with
+    the header raise ``ValueError``.
+    """
+
+    def __init__(self):
+        self.columns: list[str] | None = None
+        self.last_updated: datetime | None = None
+        self._edges: list[int] = []
+        self._lines: list[str] = []
+
+    @property
+    def value_columns(self) -> list[str]:
+        return self.columns[1:] if self.columns else []
+
+    def feed(self, line: str) -> None:
+        if self.columns is not None:
+            if line.strip():
+                self._lines.append(line)
+            return
+        normalised = line.strip().lower()
+        if normalised.startswith("last updated"):
+            self.last_updated = _parse_last_updated_line(line)
+        if normalised.startswith("year"):
+            self.columns = normalised.split()
+            self._edges = [match.end() for match in re.finditer(r"\S+", line)]
+
+    def extend(self, lines: Iterable[str]) -> None:
+        """Buffer data lines in bulk once the header has been seen."""
+        self._lines.extend(filter(str.strip, lines))
+
+    def take(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return and clear the buffered rows as ``(int16 years, float32 values[rows, columns])``."""
+        lines, self._lines = self._lines, []
+        table = np.full((len(lines), len(self.columns)), np.nan, dtype=np.float32)
+        width = self._edges[-1]
+
+        # A row is complete when it is exactly header-width and every cell's
+        # last byte (at the header edge) is filled.
+        lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+        candidates = np.flatnonzero(lengths == width)
+        complete = candidates[:0]
+        if len(candidates):
+            if len(candidates) < len(lines):
+                lines_to_check = [lines[index] for index in candidates.tolist()]
+            else:
+                lines_to_check = lines
+            block = "\n".join(lines_to_check) + "\n"
+            cell_ends = np.frombuffer(block.encode("ascii"), dtype=np.uint8).reshape(len(candidates), width + 1)
+            filled = (cell_ends[:, [edge - 1 for edge in self._edges]] != ord(" ")).all(axis=1)
+            complete = candidates[filled]
+            if not filled.all():
+                block = "\n".join([lines_to_check[index] for index in np.flatnonzero(filled).tolist()])
+        if len(complete):
+            table[complete] = np.loadtxt(io.StringIO(block.replace("---", "nan")), dtype=np.float32, ndmin=2)
+
+        is_complete = np.zeros(len(lines), dtype=bool)
+        is_complete[complete] = True
+        for index in np.flatnonzero(~is_complete).tolist():
+            table[index] = self._split_row(lines[index])
+
+        if np.isnan(table[:, 0]).any():
+            raise ValueError("Row without a year.")
+        return table[:, 0].astype(np.int16), table[:, 1:]
+
+    def _split_row(self, line: str) -> list[float]:
+        starts = [0, *self._edges[:-1]]
+        ends = [*self._edges[:-1], None]
+        tokens = [line[start:end].strip() for start, end in zip(starts, ends)]
+        if [token for token in tokens if token] != line.split():
+            raise ValueError(f"Row does not line up with the header: {line!r}")
+        return [float("nan") if token in ("", "---") else float(token) for token in tokens]
+
+
+def dataset_frame(columns: list[str], years: np.ndarray, values: np.ndarray) -> pd.DataFrame:
+    frame = pd.DataFrame(values, columns=columns, copy=False)
+    frame.insert(0, "year", years)
+    return frame
+
+
+def parse_dataset_fixed_width(content: str) -> tuple[pd.DataFrame, datetime | None]:
+    parser = FixedWidthDatasetParser()
+    lines = content.splitlines()
+    for index, line in enumerate(lines):
+        parser.feed(line)
+        if parser.columns is not None:
+            break
+    else:
+        raise MetOfficeDatasetError("Could not find dataset header row.")
+    parser.extend(lines[index + 1 :])
+    years, values = parser.take()
+    return dataset_frame(parser.value_columns, years, values), parser.last_updated
+
+
 def parse_dataset(content: str) -> tuple[pd.DataFrame, datetime | None]:
+    """
+    Parse a dataset into a year x period frame and its ``Last updated`` stamp.
+
+    Uses the fixed-width parser, falling back to ``parse_dataset_csv`` for
+    files whose rows don't line up with the header.
+    """
+    try:
+        return parse_dataset_fixed_width(content)
+    except ValueError as exc:
+        logger.info("Falling back to the CSV parser: %s", exc)
+        return parse_dataset_csv(content)
+
+
+def parse_dataset_csv(content: str) -> tuple[pd.DataFrame, datetime | None]:
+    """Parse a dataset with pandas' whitespace-separated reader, ignoring column alignment."""
     lines = content.splitlines()
     header_idx = None
     last_updated = None
@@ -87,75 +324,232 @@ def parse_dataset(content: str) -> tuple[pd.DataFrame, datetime | None]:
     return dataframe, last_updated
 
 
-def _coerce_decimal(value) -> Decimal | None:
-    if value is None:
-        return None
-    if pd.isna(value):
-        return None
-    return Decimal(str(float(value)))
+class DatasetStream:
+    """
+    A dataset parsed batch by batch while its body is still downloading.
 
+    The body is read in ``chunk_size`` pieces and hashed as it goes, so no
+    full copy of the payload is ever held. ``read_preamble`` consumes lines up
+    to the header; ``frames`` then yields one year x period frame per
+    ``batch_rows`` data rows. ``digest`` is only final once ``frames`` has been
+    exhausted, at which point the payload is also committed to the mirror.
+    """
 
-def build_records_from_dataframe(
-    dataframe: pd.DataFrame,
-    region: Region,
-    parameter: Parameter,
-    last_updated: datetime | None,
-) -> list[ClimateRecord]:
-    records: list[ClimateRecord] = []
-    fetched_at = timezone.now()
+    chunk_size = 64 * 1024
 
-    for _, row in dataframe.iterrows():
-        year = int(row["year"])
+    def __init__(
+        self,
+        chunks: Iterator[bytes],
+        url: str,
+        encoding: str = "utf-8",
+        batch_rows: int | None = None,
+        mirror_writer: mirror.MirrorWriter | None = None,
+    ):
+        self.url = url
+        self.encoding = encoding
+        self.batch_rows = max(1, batch_rows or settings.METOFFICE_STREAM_BATCH_ROWS)
+        self.parser = FixedWidthDatasetParser()
+        self._chunks = chunks
+        self._mirror_writer = mirror_writer
+        self._sha256 = hashlib.sha256()
+        self._lines = self._iter_lines()
 
-        def append_record(period_type: str, period: str, value):
-            decimal_value = _coerce_decimal(value)
-            if decimal_value is None:
+    @property
+    def last_updated(self) -> datetime | None:
+        return self.parser.last_updated
+
+    @property
+    def digest(self) -> str:
+        return self._sha256.hexdigest()
+
+    def _iter_lines(self) -> Iterator[str]:
+        pending = b""
+        try:
+            for chunk in self._chunks:
+                self._sha256.update(chunk)
+                if self._mirror_writer is not None:
+                    self._mirror_writer.write(chunk)
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    yield line.rstrip(b"\r").decode(self.encoding, errors="replace")
+        except requests.RequestException as exc:
+            raise MetOfficeDownloadError(f"Download of dataset {self.url} was interrupted") from exc
+        if pending:
+            yield pending.rstrip(b"\r").decode(self.encoding, errors="replace")
+        if self._mirror_writer is not None:
+            self._mirror_writer.commit(self.digest)
+            self._mirror_writer = None
+
+    def read_preamble(self) -> None:
+        for line in self._lines:
+            self.parser.feed(line)
+            if self.parser.columns is not None:
                 return
-            records.append(
-                ClimateRecord(
-                    region=region,
-                    parameter=parameter,
-                    year=year,
-                    period_type=period_type,
-                    period=period.lower(),
-                    value=decimal_value,
-                    source_last_updated=last_updated,
-                    fetched_at=fetched_at,
-                )
+        raise MetOfficeDatasetError("Could not find dataset header row.")
+
+    def frames(self) -> Iterator[pd.DataFrame]:
+        batch: list[str] = []
+        for line in self._lines:
+            if line.strip():
+                batch.append(line)
+            if len(batch) >= self.batch_rows:
+                yield self._decode(batch)
+                batch = []
+        if batch:
+            yield self._decode(batch)
+
+    def _decode(self, lines: list[str]) -> pd.DataFrame:
+        self.parser.extend(lines)
+        try:
+            years, values = self.parser.take()
+        except ValueError as exc:
+            logger.info("Falling back to the CSV parser for a batch: %s", exc)
+            header = " ".join(self.parser.columns)
+            return parse_dataset_csv("\n".join([header, *lines]))[0]
+        return dataset_frame(self.parser.value_columns, years, values)
+
+    def close(self) -> None:
+        self._lines.close()
+        self._chunks.close()
+        if self._mirror_writer is not None:
+            self._mirror_writer.discard()
+            self._mirror_writer = None
+
+
+def _response_chunks(response: requests.Response, chunk_size: int) -> Iterator[bytes]:
+    try:
+        yield from response.iter_content(chunk_size=chunk_size)
+    finally:
+        response.close()
+
+
+def open_dataset_stream(
+    url: str,
+    state: DatasetFetchState | None = None,
+    batch_rows: int | None = None,
+    offline: bool = False,
+) -> DatasetStream:
+    """
+    Start a streaming download and read up to the header row.
+
+    Raises ``DatasetNotModified`` on a 304, and reads from the local mirror
+    under the same rules as ``fetch_dataset_text_by_url``.
+    """
+    entry = _mirror_lookup(url, offline)
+    stream = None
+    if entry is not None and (offline or mirror.is_fresh(entry)):
+        try:
+            chunks = mirror.iter_chunks(entry, DatasetStream.chunk_size)
+        except OSError:
+            _mirror_lost(url, offline)
+            entry = None
+        else:
+            stream = DatasetStream(chunks, url, entry.encoding, batch_rows=batch_rows)
+    if stream is None:
+        try:
+            response = _request_dataset(url, state, stream=True, conditional=_should_revalidate(entry))
+        except DatasetNotModified:
+            if entry is not None:
+                mirror.touch(url)
+            raise
+        encoding = response.encoding or "utf-8"
+        writer = None
+        if mirror.enabled():
+            writer = mirror.MirrorWriter(
+                url, encoding, response.headers.get("ETag", ""), response.headers.get("Last-Modified", "")
             )
+        chunks = _response_chunks(response, DatasetStream.chunk_size)
+        stream = DatasetStream(chunks, url, encoding, batch_rows=batch_rows, mirror_writer=writer)
+    try:
+        stream.read_preamble()
+    except Exception:
+        stream.close()
+        raise
+    return stream
 
-        for month in MONTH_COLUMNS:
-            append_record(ClimateRecord.PeriodType.MONTH, month, row.get(month))
 
-        for season in SEASON_COLUMNS:
-            append_record(ClimateRecord.PeriodType.SEASON, season, row.get(season))
+VALUE_DECIMAL_PLACES = ClimateRecord._meta.get_field("value").decimal_places
+RECORD_FRAME_COLUMNS = ["year", "period_type", "period", "value"]
 
-        if ANNUAL_COLUMN in row:
-            append_record(ClimateRecord.PeriodType.ANNUAL, ANNUAL_COLUMN, row.get(ANNUAL_COLUMN))
 
-    return records
+def build_record_frame(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Flatten a parsed dataset into one row per non-missing cell.
 
+    Rows come out year by year in column order (months, seasons, annual),
+    with values rounded to the scale of ``ClimateRecord.value``.
+    """
+    columns = [(period_type, column) for period_type, column in PERIOD_COLUMNS if column in dataframe.columns]
+    if not columns or dataframe.empty:
+        return pd.DataFrame(columns=RECORD_FRAME_COLUMNS)
+
+    values = dataframe[[column for _, column in columns]].to_numpy(dtype="float64")
+    n_years, n_columns = values.shape
+    flat = values.ravel()
+    present = ~np.isnan(flat)
+
+    years = np.repeat(dataframe["year"].to_numpy(dtype="int64"), n_columns)
+    period_types = np.tile(np.array([str(period_type) for period_type, _ in columns]), n_years)
+    periods = np.tile(np.array([column for _, column in columns]), n_years)
+    return pd.DataFrame(
+        {
+            "year": years[present],
+            "period_type": period_types[present],
+            "period": periods[present],
+            "value": np.round(flat[present], VALUE_DECIMAL_PLACES),
+        }
+    )
+
+
+def records_from_frame(
+    frame: pd.DataFrame,
+    region: Region,
+    parameter: Parameter,
+    last_updated: datetime | None,
+) -> list[ClimateRecord]:
+    """Turn a ``build_record_frame`` frame into unsaved ``ClimateRecord`` instances."""
+    fetched_at = timezone.now()
+    return [
+        ClimateRecord(
+            region=region,
+            parameter=parameter,
+            year=year,
+            period_type=period_type,
+            period=period,
+            value=Decimal(str(value)),
+            source_last_updated=last_updated,
+            fetched_at=fetched_at,
+        )
+        for year, period_type, period, value in zip(
+            frame["year"].tolist(),
+            frame["period_type"].tolist(),
+            frame["period"].tolist(),
+            frame["value"].tolist(),
+        )
+    ]
 
-def persist_records(records: Iterable[ClimateRecord]) -> int:
-    records = list(records)
-    if not records:
-        return 0
 
+def build_records_from_dataframe(
+    dataframe: pd.DataFrame,
+    region: Region,
+    parameter: Parameter,
+    last_updated: datetime | None,
+) -> list[ClimateRecord]:
+    return records_from_frame(build_record_frame(dataframe), region, parameter, last_updated)
+
+
+def _retry_on_lock(operation: Callable[[], None]) -> None:
     attempts = max(1, getattr(settings, "DB_LOCK_RETRY_ATTEMPTS", 5))
     delay = max(0.0, getattr(settings, "DB_LOCK_RETRY_DELAY", 0.5))
 
     for attempt in range(1, attempts + 1):
         try:
-            ClimateRecord.objects.bulk_create(
-                records,
-                batch_size=500,
-                update_conflicts=True,
-                unique_fields=["region", "parameter", "year", "period_type", "period"],
-                update_fields=["value", "source_last_updated", "fetched_at"],
-            )
+            operation()
         except OperationalError as exc:
+            # "database is locked" (SQLite), lock timeouts and deadlocks (PostgreSQL)
             message = str(exc).lower()
-            if "locked" not in message or attempt == attempts:
+            if "lock" not in message or attempt == attempts:
                 raise
             logger.warning(
                 "Database locked during bulk insert (attempt %s/%s). Retrying in %.2fs.",
@@ -163,38 +557,456 @@ def persist_records(records: Iterable[ClimateRecord]) -> int:
                 attempts,
                 delay,
             )
-            close_old_connections()
+            # Inside an outer transaction the failed savepoint is already rolled
+            # back; closing the connection would abort the caller's transaction.
+            if not connection.in_atomic_block:
+                close_old_connections()
             if delay:
                 time.sleep(delay)
             continue
         break
 
+
+def persist_records(records: Iterable[ClimateRecord]) -> int:
+    records = list(records)
+    if not records:
+        return 0
+
+    _retry_on_lock(
+        lambda: ClimateRecord.objects.bulk_create(
+            records,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=["region", "parameter", "year", "period_type", "period"],
+            update_fields=["value", "source_last_updated", "fetched_at"],
+        )
+    )
     return len(records)
 
 
-def sync_dataset(region: Region, parameter: Parameter, source_url: str | None = None) -> dict:
-    if source_url:
-        text, url = fetch_dataset_text_by_url(source_url)
+def _copy_from(cursor, sql: str, payload: str) -> None:
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, "copy_expert"):  # psycopg2
+        raw_cursor.copy_expert(sql, io.StringIO(payload))
+    else:  # psycopg 3
+        with raw_cursor.copy(sql) as copy:
+            copy.write(payload)
+
+
+def copy_record_frame(
+    frame: pd.DataFrame,
+    region: Region,
+    parameter: Parameter,
+    last_updated: datetime | None,
+) -> int:
+    """
+    Upsert a ``build_record_frame`` frame with PostgreSQL ``COPY``.
+
+    The cells are copied into a temp table and merged
+    into ``ClimateRecord`` with one ``INSERT … ON CONFLICT DO UPDATE``; the
+    values shared by every row are bound on the merge rather than copied.
+    """
+    if frame.empty:
+        return 0
+
+    payload = frame.to_csv(sep="\t", header=False, index=False, columns=RECORD_FRAME_COLUMNS, float_format="%.2f")
+    table = ClimateRecord._meta.db_table
+    value_field = ClimateRecord._meta.get_field("value")
+
+    def _load() -> None:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE {table}_load ("
+                "year integer, period_type varchar(12), period varchar(12), "
+                f"value numeric({value_field.max_digits}, {value_field.decimal_places})"
+                ")"
+            )
+            _copy_from(cursor, f"COPY {table}_load (year, period_type, period, value) FROM STDIN", payload)
+            cursor.execute(
+                f"INSERT INTO {table} "
+                "(region_id, parameter_id, year, period_type, period, value, source_last_updated, fetched_at) "
+                f"SELECT %s, %s, year, period_type, period, value, %s, %s FROM {table}_load "
+                "ON CONFLICT (region_id, parameter_id, year, period_type, period) DO UPDATE SET "
+                "value = EXCLUDED.value, "
+                "source_last_updated = EXCLUDED.source_last_updated, "
+                "fetched_at = EXCLUDED.fetched_at",
+                [region.pk, parameter.pk, last_updated, timezone.now()],
+            )
+            cursor.execute(f"DROP TABLE {table}_load")
+
+    _retry_on_lock(_load)
+    return len(frame)
+
+
+RECORD_KEY_COLUMNS = ["year", "period_type", "period"]
+
+
+@dataclass
+class UpsertCounts:
+    """
+    Cells of a dataset that were new, changed or already stored with the same
+    value, stored cells that were deleted, and the ``(period_type, period)``
+    keys that were written or deleted.
+    """
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    periods: set[tuple[str, str]] = field(default_factory=set)
+    deleted: int = 0
+
+    @property
+    def rows(self) -> int:
+        return self.inserted + self.updated + self.unchanged
+
+    def __add__(self, other: UpsertCounts) -> UpsertCounts:
+        return UpsertCounts(
+            self.inserted + other.inserted,
+            self.updated + other.updated,
+            self.unchanged + other.unchanged,
+            self.periods | other.periods,
+            self.deleted + other.deleted,
+        )
+
+
+def _frame_periods(frame: pd.DataFrame) -> set[tuple[str, str]]:
+    return set(frame[["period_type", "period"]].drop_duplicates().itertuples(index=False, name=None))
+
+
+def diff_record_frame(
+    frame: pd.DataFrame,
+    region: Region,
+    parameter: Parameter,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compare a ``build_record_frame`` frame with the stored values in one query.
+
+    Only the years covered by ``frame`` are loaded. Returns boolean masks over
+    the frame's rows for cells that are new and cells whose value changed.
+    """
+    existing = pd.DataFrame.from_records(
+        ClimateRecord.objects.filter(
+            region=region,
+            parameter=parameter,
+            year__gte=int(frame["year"].min()),
+            year__lte=int(frame["year"].max()),
+        ).values_list(*RECORD_KEY_COLUMNS, "value"),
+        columns=[*RECORD_KEY_COLUMNS, "stored_value"],
+    )
+    existing["stored_value"] = existing["stored_value"].astype("float64")
+    merged = frame.merge(existing, on=RECORD_KEY_COLUMNS, how="left", indicator=True)
+    inserted = merged["_merge"] == "left_only"
+    # Both sides are at the column's scale, so anything beyond float noise is a change.
+    same = np.isclose(merged["value"], merged["stored_value"], rtol=0, atol=1e-6)
+    updated = ~inserted & ~same
+    return inserted.to_numpy(), updated.to_numpy()
+
+
+def delete_absent_cells(keys: pd.DataFrame, region: Region, parameter: Parameter) -> UpsertCounts:
+    """
+    Delete the stored cells of a dataset that are not in ``keys``.
+
+    ``keys`` holds the ``year``/``period_type``/``period`` columns of every
+    cell of the whole dataset, as freshly parsed, so cells the source no
+    longer has (or that an earlier parse put in the wrong column) go. An
+    empty ``keys`` deletes nothing rather than the whole dataset.
+    """
+    if keys.empty:
+        return UpsertCounts()
+    stored = pd.DataFrame.from_records(
+        ClimateRecord.objects.filter(region=region, parameter=parameter).values_list("pk", *RECORD_KEY_COLUMNS),
+        columns=["pk", *RECORD_KEY_COLUMNS],
+    )
+    merged = stored.merge(keys[RECORD_KEY_COLUMNS], on=RECORD_KEY_COLUMNS, how="left", indicator=True)
+    absent = merged[merged["_merge"] == "left_only"]
+    if absent.empty:
+        return UpsertCounts()
+
+    pks = absent["pk"].tolist()
+    _retry_on_lock(lambda: ClimateRecord.objects.filter(pk__in=pks).delete())
+    return UpsertCounts(periods=_frame_periods(absent), deleted=len(absent))
+
+
+def persist_dataset(
+    dataframe: pd.DataFrame,
+    region: Region,
+    parameter: Parameter,
+    last_updated: datetime | None,
+    incremental: bool = True,
+    complete: bool = False,
+) -> UpsertCounts:
+    """
+    Upsert a parsed dataset, using ``copy_record_frame`` on PostgreSQL and
+    ``persist_records`` (``bulk_create``) on other backends.
+
+    With ``incremental`` only new or changed cells are written (unchanged rows
+    keep their ``fetched_at``); otherwise every cell is rewritten and counted
+    as updated. ``complete`` marks ``dataframe`` as the whole dataset, so
+    stored cells it lacks are deleted (see ``delete_absent_cells``).
+
+    Rollups, the series store and cached API responses are left alone; the
+    caller refreshes them and then calls ``api_cache.invalidate``, as
+    ``store_dataset`` does, so no response is cached from half-updated data.
+    """
+    frame = build_record_frame(dataframe)
+    deleted = delete_absent_cells(frame, region, parameter) if complete else UpsertCounts()
+    if frame.empty:
+        return deleted
+    if incremental:
+        inserted, updated = diff_record_frame(frame, region, parameter)
+        frame = frame[inserted | updated]
+        counts = UpsertCounts(
+            int(inserted.sum()), int(updated.sum()), int((~inserted & ~updated).sum()), _frame_periods(frame)
+        )
     else:
-        text, url = fetch_dataset_text(parameter.code, region.dataset_slug)
-    dataframe, last_updated = parse_dataset(text)
-    records = build_records_from_dataframe(dataframe, region, parameter, last_updated)
-    saved = persist_records(records)
-    logger.info(
-        "Synced %s/%s -> %s rows",
-        region.code,
-        parameter.code,
-        saved,
+        counts = UpsertCounts(updated=len(frame), periods=_frame_periods(frame))
+
+    if not frame.empty:
+        if connection.vendor == "postgresql":
+            copy_record_frame(frame, region, parameter, last_updated)
+        else:
+            persist_records(records_from_frame(frame, region, parameter, last_updated))
+    return counts + deleted
+
+
+def load_fetch_state(region: Region, parameter: Parameter) -> DatasetFetchState:
+    state = DatasetFetchState.objects.filter(region=region, parameter=parameter).first()
+    return state or DatasetFetchState(region=region, parameter=parameter)
+
+
+def save_fetch_state(state: DatasetFetchState) -> None:
+    """
+    Save ``state``. A state loaded before its row existed is upserted by
+    dataset, as a concurrent sync of the same dataset may have created the
+    row in the meantime.
+    """
+    if state.pk is not None:
+        state.save()
+        return
+    fields = [
+        field.attname
+        for field in DatasetFetchState._meta.concrete_fields
+        if not field.primary_key and field.name not in ("region", "parameter")
+    ]
+    saved, _ = DatasetFetchState.objects.update_or_create(
+        region=state.region,
+        parameter=state.parameter,
+        defaults={name: getattr(state, name) for name in fields},
     )
+    state.pk = saved.pk
+    state._state.adding = False
+
+
+def _content_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _sync_result(
+    region: Region,
+    parameter: Parameter,
+    status: str,
+    counts: UpsertCounts,
+    url: str,
+    last_updated: datetime | None,
+) -> dict:
     return {
         "region": region.code,
         "parameter": parameter.code,
-        "rows": saved,
+        "status": status,
+        "rows": counts.rows,
+        "inserted": counts.inserted,
+        "updated": counts.updated,
+        "unchanged": counts.unchanged,
+        "deleted": counts.deleted,
         "source_url": url,
         "last_updated": last_updated.isoformat() if last_updated else None,
     }
 
 
+@dataclass
+class PreparedDataset:
+    """
+    A downloaded dataset ready to persist.
+
+    Holds either a fully parsed ``dataframe`` or, in streaming mode, an open
+    ``stream`` whose batches are parsed as they are persisted. Both are None
+    when the dataset is unchanged.
+    """
+
+    url: str
+    digest: str = ""
+    dataframe: pd.DataFrame | None = None
+    last_updated: datetime | None = None
+    stream: DatasetStream | None = None
+
+    @property
+    def modified(self) -> bool:
+        return self.dataframe is not None or self.stream is not None
+
+
+def _prepare_stream(url: str, state: DatasetFetchState, offline: bool = False) -> PreparedDataset:
+    try:
+        stream = open_dataset_stream(url, state=state, offline=offline)
+    except DatasetNotModified as exc:
+        return PreparedDataset(url=exc.url)
+
+    # The digest isn't known until the body has been read, so an unchanged
+    # "Last updated" stamp stands in for it (as long as the mirror already
+    # holds a copy to rebuild from).
+    if (
+        state.content_sha256
+        and state.source_url == url
+        and stream.last_updated is not None
+        and stream.last_updated == state.source_last_updated
+        and (not mirror.enabled() or mirror.lookup(url) is not None)
+    ):
+        stream.close()
+        if mirror.enabled():
+            mirror.touch(url)
+        return PreparedDataset(url=url)
+    return PreparedDataset(url=url, last_updated=stream.last_updated, stream=stream)
+
+
+def prepare_dataset(
+    region: Region,
+    parameter: Parameter,
+    state: DatasetFetchState,
+    source_url: str | None = None,
+    stream: bool | None = None,
+    offline: bool = False,
+    on_stage: StageCallback | None = None,
+) -> PreparedDataset:
+    """
+    Fetch and parse a dataset without touching the database.
+
+    Safe to call from worker threads; the returned value is handed to
+    ``store_dataset`` on the thread that owns the database connection. With
+    ``stream`` (default: ``METOFFICE_STREAM_INGEST``) only the preamble is
+    read here and the body is parsed while ``store_dataset`` persists it.
+    With ``offline`` the payload comes from the local mirror only.
+
+    ``on_stage`` hears about the download and parse stages; a streamed body
+    is downloaded and parsed while it is stored, so it only hears "store".
+    """
+    if stream is None:
+        stream = settings.METOFFICE_STREAM_INGEST
+    if stream:
+        url = source_url or build_dataset_url(parameter.code, region.dataset_slug)
+        return _prepare_stream(url, state, offline=offline)
+
+    try:
+        if source_url:
+            text, url = fetch_dataset_text_by_url(source_url, state=state, offline=offline)
+        else:
+            text, url = fetch_dataset_text(parameter.code, region.dataset_slug, state=state, offline=offline)
+    except DatasetNotModified as exc:
+        return PreparedDataset(url=exc.url)
+
+    if on_stage:
+        on_stage("download", bytes=len(text.encode("utf-8")))
+    digest = _content_digest(text)
+    if state.content_sha256 == digest and state.source_url == url:
+        return PreparedDataset(url=url)
+
+    dataframe, last_updated = parse_dataset(text)
+    if on_stage:
+        on_stage("parse", years=len(dataframe))
+    return PreparedDataset(url=url, digest=digest, dataframe=dataframe, last_updated=last_updated)
+
+
+def _persist_stream(region: Region, parameter: Parameter, prepared: PreparedDataset) -> UpsertCounts:
+    counts = UpsertCounts()
+    # Only the cell keys are kept, to find stored cells the dataset no longer has.
+    keys: list[pd.DataFrame] = []
+    try:
+        for frame in prepared.stream.frames():
+            counts += persist_dataset(frame, region, parameter, prepared.last_updated)
+            keys.append(build_record_frame(frame)[RECORD_KEY_COLUMNS])
+    finally:
+        prepared.stream.close()
+    prepared.digest = prepared.stream.digest
+    keys_frame = pd.concat(keys, ignore_index=True) if keys else pd.DataFrame(columns=RECORD_KEY_COLUMNS)
+    return counts + delete_absent_cells(keys_frame, region, parameter)
+
+
+def store_dataset(
+    region: Region,
+    parameter: Parameter,
+    state: DatasetFetchState,
+    prepared: PreparedDataset,
+    on_stage: StageCallback | None = None,
+) -> dict:
+    now = timezone.now()
+    state.checked_at = now
+    if not prepared.modified:
+        save_fetch_state(state)
+        logger.info("Skipped %s/%s -> not modified", region.code, parameter.code)
+        return _sync_result(
+            region, parameter, SYNC_NOT_MODIFIED, UpsertCounts(), prepared.url, state.source_last_updated
+        )
+
+    if prepared.stream is not None:
+        counts = _persist_stream(region, parameter, prepared)
+    else:
+        counts = persist_dataset(prepared.dataframe, region, parameter, prepared.last_updated, complete=True)
+    if counts.periods:
+        rollups.refresh_rollups(region, parameter, counts.periods)
+        series.refresh_store(region, parameter, {period_type for period_type, _ in counts.periods})
+        # Only now are the records and everything derived from them current.
+        api_cache.invalidate(region.code, parameter.code)
+
+    state.source_url = prepared.url
+    state.content_sha256 = prepared.digest
+    state.source_last_updated = prepared.last_updated
+    state.changed_at = now
+    save_fetch_state(state)
+    if on_stage:
+        on_stage("store", rows=counts.rows, rows_written=counts.inserted + counts.updated)
+
+    logger.info(
+        "Synced %s/%s -> %s rows (%s inserted, %s updated, %s unchanged, %s deleted)",
+        region.code,
+        parameter.code,
+        counts.rows,
+        counts.inserted,
+        counts.updated,
+        counts.unchanged,
+        counts.deleted,
+    )
+    return _sync_result(region, parameter, SYNC_UPDATED, counts, prepared.url, prepared.last_updated)
+
+
+def reset_fetch_state(state: DatasetFetchState) -> None:
+    """Drop the stored validators so the next fetch is unconditional."""
+    state.etag = state.last_modified = state.content_sha256 = ""
+
+
+def sync_dataset(
+    region: Region,
+    parameter: Parameter,
+    source_url: str | None = None,
+    force: bool = False,
+    stream: bool | None = None,
+    offline: bool = False,
+    on_stage: StageCallback | None = None,
+) -> dict:
+    """
+    Download, parse and upsert one dataset.
+
+    Datasets whose validators or content digest match the stored
+    ``DatasetFetchState`` are reported as not modified without being parsed,
+    unless ``force`` is set. See ``prepare_dataset`` for ``stream``,
+    ``offline`` and ``on_stage``.
+    """
+    state = load_fetch_state(region, parameter)
+    if force:
+        reset_fetch_state(state)
+    prepared = prepare_dataset(
+        region, parameter, state, source_url=source_url, stream=stream, offline=offline, on_stage=on_stage
+    )
+    return store_dataset(region, parameter, state, prepared, on_stage=on_stage)
+
+
 def infer_dataset_identifiers(url: str) -> tuple[str, str]:
     parsed = urlparse(url)
     if not parsed.scheme or not parsed.netloc:
@@ -216,20 +1028,21 @@ def infer_dataset_identifiers(url: str) -> tuple[str, str]:
 
 def resolve_models_from_url(url: str) -> tuple[Region, Parameter]:
     parameter_code, dataset_slug = infer_dataset_identifiers(url)
+    registry = reference.current()
     try:
-        parameter = Parameter.objects.get(code__iexact=parameter_code)
+        parameter = registry.by_code(Parameter, parameter_code)
     except Parameter.DoesNotExist as exc:
         raise MetOfficeDatasetError(f"Unknown parameter code '{parameter_code}'.") from exc
 
     try:
-        region = Region.objects.get(dataset_slug__iexact=dataset_slug)
+        region = registry.region_by_slug(dataset_slug)
     except Region.DoesNotExist as exc:
         raise MetOfficeDatasetError(f"Unknown region dataset slug '{dataset_slug}'.") from exc
 
     return region, parameter
 
 
-def sync_dataset_from_url(url: str) -> dict:
+def sync_dataset_from_url(url: str, force: bool = False) -> dict:
     region, parameter = resolve_models_from_url(url)
-    return sync_dataset(region, parameter, source_url=url)
+    return sync_dataset(region, parameter, source_url=url, force=force)
 
@@ -0,0 +1,244 @@
+"""
+On-disk mirror of raw Met Office dataset payloads.
+
+Payloads are stored once per SHA-256 under ``objects/``; ``index/`` holds one
+small JSON entry per URL pointing at the current payload, with the response
+validators and when it was fetched. Entries are evicted by age and, oldest
+first, by total size (see ``prune``).
+
+Every Celery worker process shares the mirror, so ``prune`` serialises on a
+lock file under the mirror root and leaves payloads written within the last
+``METOFFICE_MIRROR_PRUNE_GRACE`` seconds alone, as their index entries may not
+be written yet. A payload can still be evicted between ``lookup`` and a read;
+readers raise ``OSError`` then, which callers treat as a mirror miss.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MirrorEntry:
+    url: str
+    sha256: str
+    size: int
+    fetched_at: str
+    encoding: str = "utf-8"
+    etag: str = ""
+    last_modified: str = ""
+
+    @property
+    def path(self) -> Path:
+        return _object_path(self.sha256)
+
+    @property
+    def fetched(self) -> datetime:
+        return datetime.fromisoformat(self.fetched_at)
+
+
+def enabled() -> bool:
+    return bool(settings.METOFFICE_MIRROR_DIR)
+
+
+def _root() -> Path:
+    return Path(settings.METOFFICE_MIRROR_DIR)
+
+
+def _object_path(sha256: str) -> Path:
+    return _root() / "objects" / sha256[:2] / sha256
+
+
+def _index_path(url: str) -> Path:
+    return _root() / "index" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp, path)
+
+
+def _write_index(entry: MirrorEntry) -> None:
+    _atomic_write(_index_path(entry.url), json.dumps(asdict(entry)).encode("utf-8"))
+
+
+def lookup(url: str) -> MirrorEntry | None:
+    """Return the mirrored entry for ``url`` if both its index and payload exist."""
+    try:
+        entry = MirrorEntry(**json.loads(_index_path(url).read_text()))
+    except (OSError, ValueError, TypeError):
+        return None
+    return entry if entry.path.exists() else None
+
+
+def is_fresh(entry: MirrorEntry) -> bool:
+    """Whether ``entry`` is young enough to serve without asking the server."""
+    ttl = settings.METOFFICE_MIRROR_TTL
+    return ttl > 0 and timezone.now() - entry.fetched < timedelta(seconds=ttl)
+
+
+def read_text(entry: MirrorEntry) -> str:
+    """The payload of ``entry``; raises ``OSError`` if it has been evicted since ``lookup``."""
+    return entry.path.read_bytes().decode(entry.encoding, errors="replace")
+
+
+def iter_chunks(entry: MirrorEntry, chunk_size: int) -> Iterator[bytes]:
+    """
+    The payload of ``entry`` in ``chunk_size`` pieces.
+
+    The file is opened straight away, so an eviction since ``lookup`` raises
+    ``OSError`` here rather than mid-read; once open, pruning it no longer
+    affects the read.
+    """
+    handle = entry.path.open("rb")
+
+    def chunks() -> Iterator[bytes]:
+        with handle:
+            while chunk := handle.read(chunk_size):
+                yield chunk
+
+    return chunks()
+
+
+def store(url: str, content: bytes, encoding: str = "utf-8", etag: str = "", last_modified: str = "") -> MirrorEntry:
+    """Mirror ``content`` as the current payload of ``url``."""
+    sha256 = hashlib.sha256(content).hexdigest()
+    try:
+        # Restart the payload's grace period so a concurrent prune keeps it.
+        os.utime(_object_path(sha256))
+    except FileNotFoundError:
+        _atomic_write(_object_path(sha256), content)
+    entry = MirrorEntry(url, sha256, len(content), timezone.now().isoformat(), encoding, etag, last_modified)
+    _write_index(entry)
+    prune()
+    return entry
+
+
+def touch(url: str) -> None:
+    """Mark the mirrored copy of ``url`` as confirmed current (e.g. after a 304)."""
+    entry = lookup(url)
+    if entry is not None:
+        entry.fetched_at = timezone.now().isoformat()
+        _write_index(entry)
+
+
+class MirrorWriter:
+    """Mirrors a payload chunk by chunk as it streams in; nothing is visible until ``commit``."""
+
+    def __init__(self, url: str, encoding: str = "utf-8", etag: str = "", last_modified: str = ""):
+        self.url = url
+        self.encoding = encoding
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = 0
+        directory = _root() / "objects"
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        self._handle = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._handle.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self, sha256: str) -> None:
+        self._handle.close()
+        path = _object_path(sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._tmp, path)
+        _write_index(
+            MirrorEntry(
+                self.url,
+                sha256,
+                self.size,
+                timezone.now().isoformat(),
+                self.encoding,
+                self.etag,
+                self.last_modified,
+            )
+        )
+        prune()
+
+    def discard(self) -> None:
+        self._handle.close()
+        try:
+            os.unlink(self._tmp)
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def _prune_lock() -> Iterator[None]:
+    """Hold an exclusive lock on the mirror, across processes, for the duration."""
+    with (_root() / ".prune.lock").open("a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def prune() -> int:
+    """
+    Evict index entries older than ``METOFFICE_MIRROR_MAX_AGE_DAYS``, then the
+    least recently fetched ones until payloads fit ``METOFFICE_MIRROR_MAX_MB``.
+    Payloads no longer referenced by any entry are deleted once they are older
+    than ``METOFFICE_MIRROR_PRUNE_GRACE`` seconds. Returns the number of
+    entries evicted.
+    """
+    index_dir = _root() / "index"
+    if not index_dir.is_dir():
+        return 0
+    with _prune_lock():
+        entries: list[tuple[Path, MirrorEntry]] = []
+        for path in index_dir.glob("*.json"):
+            try:
+                entries.append((path, MirrorEntry(**json.loads(path.read_text()))))
+            except (OSError, ValueError, TypeError):
+                path.unlink(missing_ok=True)
+        entries.sort(key=lambda item: item[1].fetched_at, reverse=True)
+
+        cutoff = timezone.now() - timedelta(days=settings.METOFFICE_MIRROR_MAX_AGE_DAYS)
+        budget = settings.METOFFICE_MIRROR_MAX_MB * 1024 * 1024
+        kept: set[str] = set()
+        used = 0
+        evicted = 0
+        for path, entry in entries:
+            extra = 0 if entry.sha256 in kept else entry.size
+            if entry.fetched < cutoff or used + extra > budget:
+                path.unlink(missing_ok=True)
+                evicted += 1
+                continue
+            kept.add(entry.sha256)
+            used += extra
+
+        settled = time.time() - settings.METOFFICE_MIRROR_PRUNE_GRACE
+        for path in (_root() / "objects").glob("??/*"):
+            if path.name in kept or path.name.startswith(".tmp-"):
+                continue
+            try:
+                if path.stat().st_mtime < settled:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+    if evicted:
+        logger.info("Evicted %s mirrored datasets", evicted)
+    return evicted
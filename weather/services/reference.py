@@ -0,0 +1,149 @@
+"""
+In-process registry of regions and parameters.
+
+Both tables are a few rows long and change only through the admin or a
+migration, yet nearly every request needs some of their rows. Each process
+loads them once, with one query per table, into a ``ReferenceData`` with
+lookups by id, by code and (for regions) by dataset slug; codes and slugs
+match case-insensitively.
+
+The registry is reloaded when the ``api_cache`` reference version has moved
+since it was loaded (saving or deleting a region or parameter bumps it, see
+``weather.signals``) and at least every ``REFERENCE_CACHE_TIMEOUT`` seconds,
+which bounds how long a process can miss a bump made in another process
+under the local-memory cache. A lookup that misses checks the database once
+before giving up, so rows added elsewhere resolve straight away.
+
+The instances are shared by every thread of the process, so treat them as
+read-only and fetch a fresh row to edit one.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable, TypeVar
+
+from django.conf import settings
+from django.db import models
+from django.db.models.functions import Upper
+
+from weather.models import Parameter, Region
+from weather.services import api_cache
+
+Model = TypeVar("Model", Region, Parameter)
+
+
+class ReferenceData:
+    def __init__(self, version: int, regions: list[Region], parameters: list[Parameter], expires_at: float):
+        self.version = version
+        self.expires_at = expires_at
+        self.regions = regions
+        self.parameters = parameters
+        self._by_id = {model: {row.pk: row for row in rows} for model, rows in ((Region, regions), (Parameter, parameters))}
+        self._by_code = {
+            model: {row.code.upper(): row for row in rows} for model, rows in ((Region, regions), (Parameter, parameters))
+        }
+        self._regions_by_slug = {region.dataset_slug.upper(): region for region in regions}
+
+    def get(self, model: type[Model], pk: int) -> Model:
+        row = self._by_id[model].get(pk)
+        if row is None and model.objects.filter(pk=pk).exists():
+            row = reload()._by_id[model].get(pk)
+        if row is None:
+            raise model.DoesNotExist(f"No {model.__name__} with id {pk}.")
+        return row
+
+    def by_code(self, model: type[Model], code: str) -> Model:
+        row = self._by_code[model].get(code.upper())
+        if row is None and _stored(model, "code", [code]):
+            row = reload()._by_code[model].get(code.upper())
+        if row is None:
+            raise model.DoesNotExist(f"No {model.__name__} with code '{code}'.")
+        return row
+
+    def region_by_slug(self, dataset_slug: str) -> Region:
+        region = self._regions_by_slug.get(dataset_slug.upper())
+        if region is None and _stored(Region, "dataset_slug", [dataset_slug]):
+            region = reload()._regions_by_slug.get(dataset_slug.upper())
+        if region is None:
+            raise Region.DoesNotExist(f"No Region with dataset slug '{dataset_slug}'.")
+        return region
+
+    def resolve_codes(self, model: type[Model], values: Iterable[str]) -> tuple[list[Model], list[str]]:
+        """
+        Match ``values`` to ``model`` rows by code.
+
+        Returns the rows in the order first given, without duplicates, and
+        the values that matched nothing.
+        """
+        values = list(values)
+        matched, missing = self._match_codes(model, values)
+        if missing and _stored(model, "code", missing):
+            matched, missing = reload()._match_codes(model, values)
+        return matched, missing
+
+    def _match_codes(self, model: type[Model], values: list[str]) -> tuple[list[Model], list[str]]:
+        codes = self._by_code[model]
+        matched: dict[int, Model] = {}
+        missing: list[str] = []
+        for value in values:
+            row = codes.get(value.upper())
+            if row is None:
+                missing.append(value)
+            else:
+                matched.setdefault(row.pk, row)
+        return list(matched.values()), missing
+
+
+def _stored(model: type[models.Model], field: str, values: list[str]) -> bool:
+    """Whether the database has a ``model`` row whose ``field`` matches any of ``values``, ignoring case."""
+    keys = {value.upper() for value in values}
+    return model.objects.order_by().alias(key=Upper(field)).filter(key__in=keys).exists()
+
+
+_current: ReferenceData | None = None
+_lock = threading.Lock()
+
+
+def current() -> ReferenceData:
+    """The registry as of the current reference version, reloading it if that has moved or it has expired."""
+    (version,) = api_cache.get_versions([api_cache.REFERENCE_SCOPE])
+    registry = _current
+    if registry is not None and registry.version == version and time.monotonic() < registry.expires_at:
+        return registry
+    with _lock:
+        if _current is not None and _current is not registry:
+            # Another thread reloaded while this one waited.
+            return _current
+        return _load(version)
+
+
+def reload() -> ReferenceData:
+    """Load the registry from the database now, whatever its version."""
+    (version,) = api_cache.get_versions([api_cache.REFERENCE_SCOPE])
+    with _lock:
+        return _load(version)
+
+
+def _load(version: int) -> ReferenceData:
+    # Call with _lock held.
+    global _current
+    _current = ReferenceData(
+        version,
+        list(Region.objects.all()),
+        list(Parameter.objects.all()),
+        time.monotonic() + settings.REFERENCE_CACHE_TIMEOUT,
+    )
+    return _current
+
+
+def resolve_codes(model: type[models.Model], values: Iterable[str]) -> tuple[list, list[str]]:
+    """``ReferenceData.resolve_codes`` on the current registry."""
+    return current().resolve_codes(model, values)
+
+
+def clear() -> None:
+    global _current
+    with _lock:
+        _current = None
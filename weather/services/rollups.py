@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Max, Min, Q, Sum
+
+from weather.models import ClimateRecord, ClimateRollup, Parameter, Region
+
+# Record filters the rollup table can answer; any other active filter falls
+# back to aggregating the records themselves.
+ROLLUP_FILTERS = {"region", "parameter", "period_type", "period", "start_year", "end_year"}
+
+ROLLUP_UPDATE_FIELDS = [
+    "count",
+    "value_sum",
+    "min_value",
+    "max_value",
+    "first_year",
+    "last_year",
+    "yearly_values",
+    "updated_at",
+]
+
+
+def build_rollups(
+    region_id: int,
+    parameter_id: int,
+    rows: Iterable[tuple[str, str, int, Decimal]],
+) -> list[ClimateRollup]:
+    """Fold ``(period_type, period, year, value)`` rows into one rollup per period."""
+    series: dict[tuple[str, str], dict[int, Decimal]] = defaultdict(dict)
+    for period_type, period, year, value in rows:
+        series[(period_type, period)][year] = value
+
+    rollups = []
+    for (period_type, period), by_year in series.items():
+        values = list(by_year.values())
+        first_year, last_year = min(by_year), max(by_year)
+        rollups.append(
+            ClimateRollup(
+                region_id=region_id,
+                parameter_id=parameter_id,
+                period_type=period_type,
+                period=period,
+                count=len(values),
+                value_sum=sum(values),
+                min_value=min(values),
+                max_value=max(values),
+                first_year=first_year,
+                last_year=last_year,
+                yearly_values=[
+                    None if by_year.get(year) is None else float(by_year[year])
+                    for year in range(first_year, last_year + 1)
+                ],
+            )
+        )
+    return rollups
+
+
+def refresh_rollups(
+    region: Region | int,
+    parameter: Parameter | int,
+    periods: Iterable[tuple[str, str]] | None = None,
+) -> int:
+    """
+    Recompute the rollups of one dataset from its records.
+
+    ``periods`` limits the work to the ``(period_type, period)`` keys that
+    changed; by default every period of the dataset is rebuilt. Returns the
+    number of rollups written.
+    """
+    region_id = getattr(region, "pk", region)
+    parameter_id = getattr(parameter, "pk", parameter)
+    records = ClimateRecord.objects.filter(region_id=region_id, parameter_id=parameter_id, value__isnull=False)
+    stale = ClimateRollup.objects.filter(region_id=region_id, parameter_id=parameter_id)
+    if periods is not None:
+        keys = Q()
+        for period_type, period in set(periods):
+            keys |= Q(period_type=period_type, period=period)
+        if not keys:
+            return 0
+        records = records.filter(keys)
+        stale = stale.filter(keys)
+
+    rollups = build_rollups(
+        region_id,
+        parameter_id,
+        records.order_by().values_list("period_type", "period", "year", "value").iterator(),
+    )
+    with transaction.atomic():
+        if rollups:
+            stale = stale.exclude(_keys_q(rollups))
+        stale.delete()
+        ClimateRollup.objects.bulk_create(
+            rollups,
+            update_conflicts=True,
+            unique_fields=["region", "parameter", "period_type", "period"],
+            update_fields=ROLLUP_UPDATE_FIELDS,
+        )
+    return len(rollups)
+
+
+def _keys_q(rollups: list[ClimateRollup]) -> Q:
+    keys = Q()
+    for rollup in rollups:
+        keys |= Q(period_type=rollup.period_type, period=rollup.period)
+    return keys
+
+
+def rebuild_all_rollups() -> int:
+    """Rebuild every rollup from the records table, dropping those without records."""
+    pairs = set(ClimateRecord.objects.order_by().values_list("region_id", "parameter_id").distinct())
+    written = sum(refresh_rollups(region_id, parameter_id) for region_id, parameter_id in sorted(pairs))
+    rolled_up = set(ClimateRollup.objects.order_by().values_list("region_id", "parameter_id").distinct())
+    for region_id, parameter_id in rolled_up - pairs:
+        ClimateRollup.objects.filter(region_id=region_id, parameter_id=parameter_id).delete()
+    return written
+
+
+def summarise(filters: dict) -> dict | None:
+    """
+    Answer a records summary from the rollup table.
+
+    ``filters`` are the cleaned values of ``ClimateRecordFilter``. Returns
+    None when a filter can't be answered from rollups or no rollup matches,
+    in which case the caller aggregates the records instead.
+    """
+    active = {name: value for name, value in filters.items() if value not in (None, "")}
+    if set(active) - ROLLUP_FILTERS:
+        return None
+
+    rollups = ClimateRollup.objects.all()
+    if "region" in active:
+        rollups = rollups.filter(region__code__iexact=active["region"])
+    if "parameter" in active:
+        rollups = rollups.filter(parameter__code__iexact=active["parameter"])
+    if "period_type" in active:
+        rollups = rollups.filter(period_type=active["period_type"])
+    if "period" in active:
+        rollups = rollups.filter(period__iexact=active["period"])
+
+    start_year = active.get("start_year")
+    end_year = active.get("end_year")
+    if start_year is None and end_year is None:
+        totals = rollups.aggregate(
+            count=Sum("count"),
+            value_sum=Sum("value_sum"),
+            min_value=Min("min_value"),
+            max_value=Max("max_value"),
+            first_year=Min("first_year"),
+            last_year=Max("last_year"),
+        )
+        if totals["count"] is None:
+            return None
+        return {
+            "count": totals["count"],
+            "min_value": float(totals["min_value"]),
+            "max_value": float(totals["max_value"]),
+            "avg_value": float(totals["value_sum"] / totals["count"]),
+            "first_year": totals["first_year"],
+            "last_year": totals["last_year"],
+        }
+
+    # Year ranges are answered from the per-year partials of each rollup.
+    rows = list(rollups.values_list("first_year", "last_year", "yearly_values"))
+    if not rows:
+        return None
+    values: list[float] = []
+    years: list[int] = []
+    for first_year, last_year, yearly_values in rows:
+        low = first_year if start_year is None else max(first_year, math.ceil(start_year))
+        high = last_year if end_year is None else min(last_year, math.floor(end_year))
+        if low > high:
+            continue
+        for offset, value in enumerate(yearly_values[low - first_year : high - first_year + 1]):
+            if value is not None:
+                values.append(value)
+                years.append(low + offset)
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "min_value": min(values),
+        "max_value": max(values),
+        "avg_value": math.fsum(values) / len(values),
+        "first_year": min(years),
+        "last_year": max(years),
+    }
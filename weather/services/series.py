@@ -0,0 +1,419 @@
+"""
+Columnar views of one dataset's records.
+
+A ``Series`` carries the region and parameter once and the cells as parallel
+``year``/``period``/``value`` lists. Reads come from the packed
+``ClimateSeries`` store (one float32 array per period type), decoded into a
+``PackedDataset`` and sliced in memory; datasets missing from the store fall
+back to the records table via ``values_list``. Neither path builds model
+instances per cell.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Iterable
+
+import numpy as np
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.functions import Upper
+
+from weather.constants import PERIOD_COLUMNS
+from weather.models import ClimateRecord, ClimateSeries, Parameter, Region
+from weather.services import downsampling
+
+# Calendar order of periods within a year: months, seasons, then annual.
+PERIOD_ORDER = {period: index for index, (_, period) in enumerate(PERIOD_COLUMNS)}
+# Columns of each period type's packed array.
+PERIODS_BY_TYPE: dict[str, list[str]] = defaultdict(list)
+for _period_type, _period in PERIOD_COLUMNS:
+    PERIODS_BY_TYPE[_period_type].append(_period)
+
+PERIOD_NAMES = np.array([period for _, period in PERIOD_COLUMNS])
+
+STORE_DTYPE = np.dtype("<f4")
+VALUE_DECIMAL_PLACES = ClimateRecord._meta.get_field("value").decimal_places
+
+
+@dataclass
+class Series:
+    region: Region
+    parameter: Parameter
+    year: list[int]
+    period: list[str]
+    value: list[float]
+    source_last_updated: datetime | None = None
+    # Cell count before ``downsample``, if it dropped any.
+    downsampled_from: int | None = None
+
+    def as_dict(self) -> dict:
+        data = {
+            **describe(self.region, self.parameter),
+            "source_last_updated": self.source_last_updated,
+            "count": len(self.value),
+            "year": self.year,
+            "period": self.period,
+            "value": self.value,
+        }
+        if self.downsampled_from is not None:
+            data["downsampled_from"] = self.downsampled_from
+        return data
+
+    def downsample(self, max_points: int) -> Series:
+        """At most ``max_points`` cells, keeping each bucket's extremes (see ``downsampling``)."""
+        keep = downsampling.minmax_indices(np.asarray(self.value), max_points)
+        if len(keep) == len(self.value):
+            return self
+        return replace(
+            self,
+            year=np.asarray(self.year)[keep].tolist(),
+            period=np.asarray(self.period, dtype=object)[keep].tolist(),
+            value=np.asarray(self.value)[keep].tolist(),
+            downsampled_from=len(self.value),
+        )
+
+
+def describe(region: Region, parameter: Parameter) -> dict:
+    """Region and parameter details given once at the top of columnar responses."""
+    return {
+        "region": region.code,
+        "region_name": region.name,
+        "parameter": parameter.code,
+        "parameter_name": parameter.name,
+        "units": parameter.units,
+    }
+
+
+def pack(period_type: str, cells: Iterable[tuple[int, str, float]]) -> tuple[int, bytes] | None:
+    """Pack ``(year, period, value)`` cells of one period type; None if there are none."""
+    columns = {period: index for index, period in enumerate(PERIODS_BY_TYPE[period_type])}
+    cells = [(year, columns[period], value) for year, period, value in cells if period in columns]
+    if not cells:
+        return None
+    years = np.fromiter((cell[0] for cell in cells), dtype=np.int64, count=len(cells))
+    first_year = int(years.min())
+    grid = np.full((int(years.max()) - first_year + 1, len(columns)), np.nan, dtype=STORE_DTYPE)
+    grid[years - first_year, [cell[1] for cell in cells]] = [float(cell[2]) for cell in cells]
+    return first_year, grid.tobytes()
+
+
+def unpack(stored: ClimateSeries) -> np.ndarray:
+    """The stored series as a ``(years, periods)`` float32 grid."""
+    return np.frombuffer(stored.values, dtype=STORE_DTYPE).reshape(-1, len(PERIODS_BY_TYPE[stored.period_type]))
+
+
+def refresh_store(
+    region: Region | int,
+    parameter: Parameter | int,
+    period_types: Iterable[str] | None = None,
+) -> int:
+    """
+    Repack the stored series of one dataset from its records.
+
+    ``period_types`` limits the work to the types that changed; by default
+    all are rebuilt. Returns the number of series written.
+    """
+    region_id = getattr(region, "pk", region)
+    parameter_id = getattr(parameter, "pk", parameter)
+    records = ClimateRecord.objects.filter(region_id=region_id, parameter_id=parameter_id, value__isnull=False)
+    stale = ClimateSeries.objects.filter(region_id=region_id, parameter_id=parameter_id)
+    if period_types is not None:
+        period_types = set(period_types)
+        if not period_types:
+            return 0
+        records = records.filter(period_type__in=period_types)
+        stale = stale.filter(period_type__in=period_types)
+
+    packed = _pack_records(region_id, parameter_id, records)
+    with transaction.atomic():
+        stale.exclude(period_type__in=[series.period_type for series in packed]).delete()
+        ClimateSeries.objects.bulk_create(
+            packed,
+            update_conflicts=True,
+            unique_fields=["region", "parameter", "period_type"],
+            update_fields=["first_year", "values", "source_last_updated", "updated_at"],
+        )
+    return len(packed)
+
+
+def _pack_records(region_id: int, parameter_id: int, records: QuerySet[ClimateRecord]) -> list[ClimateSeries]:
+    """Unsaved ``ClimateSeries`` rows packing ``records`` of one dataset, one per period type."""
+    cells = defaultdict(list)
+    stamps = defaultdict(list)
+    for period_type, year, period, value, stamp in records.order_by().values_list(
+        "period_type", "year", "period", "value", "source_last_updated"
+    ):
+        cells[period_type].append((year, period, value))
+        if stamp is not None:
+            stamps[period_type].append(stamp)
+
+    packed = []
+    for period_type, type_cells in cells.items():
+        result = pack(period_type, type_cells)
+        if result is not None:
+            packed.append(
+                ClimateSeries(
+                    region_id=region_id,
+                    parameter_id=parameter_id,
+                    period_type=period_type,
+                    first_year=result[0],
+                    values=result[1],
+                    source_last_updated=max(stamps[period_type], default=None),
+                )
+            )
+    return packed
+
+
+def rebuild_store() -> int:
+    """Repack every dataset's series from the records table, dropping those without records."""
+    pairs = set(ClimateRecord.objects.order_by().values_list("region_id", "parameter_id").distinct())
+    written = sum(refresh_store(region_id, parameter_id) for region_id, parameter_id in sorted(pairs))
+    stored = set(ClimateSeries.objects.order_by().values_list("region_id", "parameter_id").distinct())
+    for region_id, parameter_id in stored - pairs:
+        ClimateSeries.objects.filter(region_id=region_id, parameter_id=parameter_id).delete()
+    return written
+
+
+def load_series(
+    region: Region,
+    parameter: Parameter,
+    filters: dict | None = None,
+    records: QuerySet[ClimateRecord] | None = None,
+) -> Series:
+    """
+    Read the cells of ``region``/``parameter`` in chronological order.
+
+    ``filters`` are cleaned ``ClimateRecordFilter`` values (period type,
+    period, year range) and ``records`` the matching queryset, used when the
+    dataset isn't in the store.
+    """
+    stored = list(ClimateSeries.objects.filter(region=region, parameter=parameter))
+    if stored:
+        return PackedDataset.from_store(region, parameter, stored).series(filters)
+    records = ClimateRecord.objects.all() if records is None else records
+    return _load_records(region, parameter, records)
+
+
+def load_dataset(region: Region, parameter: Parameter) -> PackedDataset:
+    """The decoded store of ``region``/``parameter``, packed from its records if it isn't stored."""
+    stored = list(ClimateSeries.objects.filter(region=region, parameter=parameter))
+    if not stored:
+        records = ClimateRecord.objects.filter(region=region, parameter=parameter, value__isnull=False)
+        stored = _pack_records(region.pk, parameter.pk, records)
+    return PackedDataset.from_store(region, parameter, stored)
+
+
+@dataclass
+class PackedDataset:
+    """The stored series of one dataset, decoded to ``(years, periods)`` grids per period type."""
+
+    region: Region
+    parameter: Parameter
+    grids: dict[str, tuple[int, np.ndarray]]
+    source_last_updated: dict[str, datetime | None]
+
+    @classmethod
+    def from_store(cls, region: Region, parameter: Parameter, stored: Iterable[ClimateSeries]) -> PackedDataset:
+        grids, stamps = {}, {}
+        for row in stored:
+            grid = unpack(row)
+            grid.flags.writeable = False
+            grids[row.period_type] = (row.first_year, grid)
+            stamps[row.period_type] = row.source_last_updated
+        return cls(region=region, parameter=parameter, grids=grids, source_last_updated=stamps)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(grid.nbytes for _, grid in self.grids.values())
+
+    def select(self, filters: dict | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray, list[str]]:
+        """
+        Slice the cells matching ``filters`` (cleaned ``ClimateRecordFilter`` values).
+
+        Returns chronological ``year``, period order and ``value`` arrays, plus
+        the period types that were read.
+        """
+        period_types, period, low, high = self._parse(filters)
+        years, orders, values = [], [], []
+        for period_type in period_types:
+            first_year, grid, columns = self._columns(period_type, period)
+            last_year = first_year + len(grid) - 1
+            first = first_year if low is None else max(first_year, low)
+            last = last_year if high is None else min(last_year, high)
+            if first > last:
+                continue
+            grid = grid[first - first_year : last - first_year + 1]
+            present = ~np.isnan(grid)
+            rows, cols = np.nonzero(present)
+            years.append(rows + first)
+            orders.append(np.array([PERIOD_ORDER[column] for column in columns])[cols])
+            values.append(grid[present])
+
+        year = np.concatenate(years) if years else np.array([], dtype=np.int64)
+        order = np.concatenate(orders) if orders else np.array([], dtype=np.int64)
+        value = np.concatenate(values) if values else np.array([], dtype=STORE_DTYPE)
+        chronological = np.lexsort((order, year))
+        # float32 holds every stored value to well within the column's scale.
+        value = np.round(value[chronological].astype(np.float64), VALUE_DECIMAL_PLACES)
+        return year[chronological], order[chronological], value, period_types
+
+    def table(self, filters: dict | None = None) -> tuple[np.ndarray, list[str], np.ndarray]:
+        """
+        The cells matching ``filters`` aligned on one year axis.
+
+        Returns consecutive ``years``, the periods in calendar order and a
+        ``(years, periods)`` float64 grid with NaN where a cell is missing.
+        """
+        period_types, period, low, high = self._parse(filters)
+        columns = [self._columns(period_type, period) for period_type in period_types]
+        first = min((first_year for first_year, _, _ in columns), default=0)
+        last = max((first_year + len(grid) - 1 for first_year, grid, _ in columns), default=-1)
+        first = first if low is None else max(first, low)
+        last = last if high is None else min(last, high)
+        years = np.arange(first, last + 1)
+        periods = [name for _, _, names in columns for name in names]
+        table = np.full((len(years), len(periods)), np.nan)
+        offset = 0
+        for first_year, grid, names in columns:
+            start, stop = max(first, first_year), min(last, first_year + len(grid) - 1)
+            if start <= stop:
+                block = grid[start - first_year : stop - first_year + 1].astype(np.float64)
+                table[start - first : stop - first + 1, offset : offset + len(names)] = block
+            offset += len(names)
+        return years, periods, np.round(table, VALUE_DECIMAL_PLACES)
+
+    def _parse(self, filters: dict | None) -> tuple[list[str], str, int | None, int | None]:
+        filters = {name: value for name, value in (filters or {}).items() if value not in (None, "")}
+        period = filters.get("period", "").lower()
+        period_types = [filters["period_type"]] if "period_type" in filters else list(PERIODS_BY_TYPE)
+        if period:
+            period_types = [period_type for period_type in period_types if period in PERIODS_BY_TYPE[period_type]]
+        period_types = [period_type for period_type in period_types if period_type in self.grids]
+        low = math.ceil(filters["start_year"]) if "start_year" in filters else None
+        high = math.floor(filters["end_year"]) if "end_year" in filters else None
+        return period_types, period, low, high
+
+    def _columns(self, period_type: str, period: str) -> tuple[int, np.ndarray, list[str]]:
+        first_year, grid = self.grids[period_type]
+        columns = PERIODS_BY_TYPE[period_type]
+        if period:
+            return first_year, grid[:, [columns.index(period)]], [period]
+        return first_year, grid, columns
+
+    def series(self, filters: dict | None = None) -> Series:
+        year, order, value, period_types = self.select(filters)
+        stamps = [self.source_last_updated[period_type] for period_type in period_types]
+        return Series(
+            region=self.region,
+            parameter=self.parameter,
+            year=year.tolist(),
+            period=PERIOD_NAMES[order].tolist(),
+            value=value.tolist(),
+            source_last_updated=max((stamp for stamp in stamps if stamp is not None), default=None),
+        )
+
+    def summary(self, filters: dict | None = None) -> dict:
+        """The ``/api/records/summary/`` aggregates of the cells matching ``filters``."""
+        year, _, value, _ = self.select(filters)
+        if not len(value):
+            return {"count": 0}
+        return {
+            "count": len(value),
+            "min_value": float(value.min()),
+            "max_value": float(value.max()),
+            "avg_value": math.fsum(value.tolist()) / len(value),
+            "first_year": int(year.min()),
+            "last_year": int(year.max()),
+        }
+
+
+def load_comparison(
+    region_codes: list[str],
+    parameter_codes: list[str],
+    periods: list[str],
+    start_year: int | None = None,
+    end_year: int | None = None,
+) -> dict:
+    """
+    Every stored series of ``region_codes`` x ``parameter_codes`` x ``periods`` on one year axis.
+
+    One query reads the packed series with their region and parameter. Each
+    series' ``value`` array is aligned with ``year`` (null where missing);
+    requested region/parameter pairs with nothing stored are listed under
+    ``missing``. Codes are matched case-insensitively and should be unique.
+    """
+    period_types = {period_type for period_type, names in PERIODS_BY_TYPE.items() if set(names) & set(periods)}
+    stored = (
+        ClimateSeries.objects.select_related("region", "parameter")
+        .alias(region_code=Upper("region__code"), parameter_code=Upper("parameter__code"))
+        .filter(
+            region_code__in=[code.upper() for code in region_codes],
+            parameter_code__in=[code.upper() for code in parameter_codes],
+            period_type__in=period_types,
+        )
+    )
+    by_dataset = defaultdict(dict)
+    for row in stored:
+        by_dataset[(row.region.code.upper(), row.parameter.code.upper())][row.period_type] = row
+
+    columns, missing = [], []
+    for region_code in region_codes:
+        for parameter_code in parameter_codes:
+            rows = by_dataset.get((region_code.upper(), parameter_code.upper()))
+            if not rows:
+                missing.append({"region": region_code, "parameter": parameter_code})
+                continue
+            for period in sorted(periods, key=PERIOD_ORDER.__getitem__):
+                row = next((row for row in rows.values() if period in PERIODS_BY_TYPE[row.period_type]), None)
+                if row is not None:
+                    index = PERIODS_BY_TYPE[row.period_type].index(period)
+                    columns.append((row, period, row.first_year, unpack(row)[:, index]))
+
+    first = min((first_year for _, _, first_year, _ in columns), default=0)
+    last = max((first_year + len(values) - 1 for _, _, first_year, values in columns), default=-1)
+    first = first if start_year is None else max(first, start_year)
+    last = last if end_year is None else min(last, end_year)
+    years = np.arange(first, last + 1)
+    table = np.full((len(columns), len(years)), np.nan)
+    for index, (_, _, first_year, values) in enumerate(columns):
+        start, stop = max(first, first_year), min(last, first_year + len(values) - 1)
+        if start <= stop:
+            table[index, start - first : stop - first + 1] = values[start - first_year : stop - first_year + 1]
+    table = np.round(table, VALUE_DECIMAL_PLACES).astype(object)
+    table[np.isnan(table.astype(np.float64))] = None
+
+    return {
+        "year": years.tolist(),
+        "series": [
+            {
+                **describe(row.region, row.parameter),
+                "period": period,
+                "source_last_updated": row.source_last_updated,
+                "value": values,
+            }
+            for (row, period, _, _), values in zip(columns, table.tolist())
+        ],
+        "missing": missing,
+    }
+
+
+def _load_records(region: Region, parameter: Parameter, records: QuerySet[ClimateRecord]) -> Series:
+    rows = (
+        records.filter(region=region, parameter=parameter, value__isnull=False)
+        .order_by()
+        .values_list("year", "period", "value", "source_last_updated")
+    )
+    rows = sorted(rows, key=lambda row: (row[0], PERIOD_ORDER.get(row[1], len(PERIOD_ORDER))))
+    stamps = [row[3] for row in rows if row[3] is not None]
+    return Series(
+        region=region,
+        parameter=parameter,
+        year=[row[0] for row in rows],
+        period=[row[1] for row in rows],
+        value=[float(row[2]) for row in rows],
+        source_last_updated=max(stamps, default=None),
+    )
@@ -0,0 +1,87 @@
+"""
+In-process cache of decoded series.
+
+Each worker keeps the ``PackedDataset`` of the datasets it has read, keyed by
+region and parameter code, so repeat series and summary reads need no SQL.
+An entry stays current while the ``api_cache`` versions of its dataset and of
+the reference data are unchanged (ingest and admin edits bump them) and for
+at most ``SERIES_CACHE_TIMEOUT`` seconds, which bounds how long a worker can
+miss a bump made in another process under the local-memory cache. Entries
+are evicted least recently used once their arrays exceed
+``SERIES_CACHE_MAX_BYTES``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from weather.models import ClimateSeries, Parameter, Region
+from weather.services import api_cache, reference
+from weather.services.series import PackedDataset
+
+
+class SeriesCache:
+    def __init__(self):
+        self._entries: OrderedDict[tuple[str, str], tuple[tuple[int, int], float, PackedDataset | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+
+    def get(self, region_code: str, parameter_code: str) -> PackedDataset | None:
+        """
+        The decoded dataset of ``region_code``/``parameter_code``, loading it on a miss.
+
+        Returns None when the cache is disabled or either code is unknown or
+        the dataset has nothing in the series store.
+        """
+        max_bytes = settings.SERIES_CACHE_MAX_BYTES
+        if max_bytes <= 0:
+            return None
+        key = (region_code.lower(), parameter_code.lower())
+        version = tuple(api_cache.get_versions([api_cache.records_scope(*key), api_cache.REFERENCE_SCOPE]))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and time.monotonic() < entry[1]:
+                self._entries.move_to_end(key)
+                return entry[2]
+
+        try:
+            dataset = self._load(*key)
+        except (Region.DoesNotExist, Parameter.DoesNotExist):
+            return None
+        # Known datasets with nothing stored are cached too, as None.
+        if dataset is not None and dataset.nbytes > max_bytes:
+            return dataset
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (version, time.monotonic() + settings.SERIES_CACHE_TIMEOUT, dataset)
+            self.nbytes += 0 if dataset is None else dataset.nbytes
+            while self.nbytes > max_bytes:
+                self._discard(next(iter(self._entries)))
+        return dataset
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _discard(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry[2] is not None:
+            self.nbytes -= entry[2].nbytes
+
+    @staticmethod
+    def _load(region_code: str, parameter_code: str) -> PackedDataset | None:
+        registry = reference.current()
+        region = registry.by_code(Region, region_code)
+        parameter = registry.by_code(Parameter, parameter_code)
+        stored = list(ClimateSeries.objects.filter(region=region, parameter=parameter))
+        if not stored:
+            return None
+        return PackedDataset.from_store(region, parameter, stored)
+
+
+datasets = SeriesCache()
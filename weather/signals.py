@@ -0,0 +1,19 @@
+"""
+Cache invalidation for reference data.
+
+Region and parameter details appear in every API response and back the
+code lookups in ``weather.services.reference``, so any save or delete of
+either model retires them, however it was made.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Parameter, Region
+from .services import api_cache
+
+
+@receiver([post_save, post_delete], sender=Region)
+@receiver([post_save, post_delete], sender=Parameter)
+def reference_data_changed(sender, **kwargs) -> None:
+    api_cache.invalidate_reference()
@@ -3,10 +3,11 @@ from __future__ import annotations
 import logging
 from typing import Iterable, Sequence
 
-from celery import shared_task
+from celery import chord, shared_task
+from django.conf import settings
 
-from weather.models import Parameter, Region
-from weather.services import metoffice
+from weather.models import IngestJob, Parameter, Region
+from weather.services import ingest_jobs, ingestion, metoffice, reference
 
 logger = logging.getLogger(__name__)
 
@@ -24,23 +25,26 @@ def _dedupe(values: Sequence[str] | None) -> list[str] | None:
 
 
 @shared_task(bind=True, name="weather.ingest_metoffice")
-def ingest_metoffice_task(self, regions: Sequence[str] | None = None, parameters: Sequence[str] | None = None):
+def ingest_metoffice_task(
+    self,
+    regions: Sequence[str] | None = None,
+    parameters: Sequence[str] | None = None,
+    force: bool = False,
+):
     """
     Trigger a Met Office ingestion run optionally scoped by region/parameter codes.
+
+    The run is split into one ``ingest_dataset_task`` per (region, parameter)
+    pair, joined by ``summarise_ingest_task``. Unchanged datasets are skipped
+    unless ``force`` is set.
     """
 
     regions = _dedupe(regions)
     parameters = _dedupe(parameters)
 
-    region_qs = Region.objects.all()
-    if regions:
-        region_qs = region_qs.filter(code__in=regions)
-    parameter_qs = Parameter.objects.all()
-    if parameters:
-        parameter_qs = parameter_qs.filter(code__in=parameters)
-
-    region_list = list(region_qs)
-    parameter_list = list(parameter_qs)
+    registry = reference.current()
+    region_list = registry.resolve_codes(Region, regions)[0] if regions else registry.regions
+    parameter_list = registry.resolve_codes(Parameter, parameters)[0] if parameters else registry.parameters
 
     if not region_list:
         message = "No regions matched the supplied filters." if regions else "No regions available to ingest."
@@ -52,36 +56,88 @@ def ingest_metoffice_task(self, regions: Sequence[str] | None = None, parameters
         logger.warning("[ingest-task] %s", message)
         return {"runs": [], "total_rows": 0, "message": message}
 
-    results: list[dict] = []
-    failures: list[dict[str, str]] = []
-    total_rows = 0
-
-    for region in region_list:
-        for parameter in parameter_list:
-            logger.info("[ingest-task] Syncing %s/%s", region.code, parameter.code)
-            try:
-                result = metoffice.sync_dataset(region, parameter)
-            except metoffice.MetOfficeDatasetError as exc:
-                logger.exception(
-                    "[ingest-task] Failed to ingest %s/%s: %s", region.code, parameter.code, exc
-                )
-                failures.append({"region": region.code, "parameter": parameter.code, "error": str(exc)})
-                continue
-            total_rows += result["rows"]
-            results.append(result)
+    header = [
+        ingest_dataset_task.s(region.code, parameter.code, force=force)
+        for region in region_list
+        for parameter in parameter_list
+    ]
+    callback = summarise_ingest_task.s(
+        regions=[region.code for region in region_list],
+        parameters=[parameter.code for parameter in parameter_list],
+    )
+    logger.info("[ingest-task] Fanning out %s dataset tasks", len(header))
+    # The chord inherits this task's id, so callers polling it get the summary payload.
+    return self.replace(chord(header, callback))
+
 
+def _retry_countdown(task) -> int:
+    """Seconds before the next attempt of ``task``: ``METOFFICE_TASK_RETRY_BACKOFF`` doubled per retry so far."""
+    return settings.METOFFICE_TASK_RETRY_BACKOFF * (2 ** task.request.retries)
+
+
+@shared_task(bind=True, name="weather.ingest_dataset", max_retries=settings.METOFFICE_TASK_MAX_RETRIES)
+def ingest_dataset_task(self, region_code: str, parameter_code: str, force: bool = False) -> dict:
+    """
+    Ingest a single (region, parameter) dataset.
+
+    Transient download errors are retried with exponential backoff; any
+    other error (or running out of retries) is returned as a failure dict so
+    the surrounding chord still completes.
+    """
+    try:
+        registry = reference.current()
+        region = registry.by_code(Region, region_code)
+        parameter = registry.by_code(Parameter, parameter_code)
+        return metoffice.sync_dataset(region, parameter, force=force)
+    except metoffice.MetOfficeDownloadError as exc:
+        if self.request.retries < self.max_retries:
+            countdown = _retry_countdown(self)
+            logger.warning(
+                "[ingest-task] Retrying %s/%s in %ss: %s", region_code, parameter_code, countdown, exc
+            )
+            raise self.retry(exc=exc, countdown=countdown)
+        logger.exception("[ingest-task] Giving up on %s/%s: %s", region_code, parameter_code, exc)
+        return ingestion.failure_result(region_code, parameter_code, exc)
+    except (metoffice.MetOfficeDatasetError, Region.DoesNotExist, Parameter.DoesNotExist) as exc:
+        logger.exception("[ingest-task] Failed to ingest %s/%s: %s", region_code, parameter_code, exc)
+        return ingestion.failure_result(region_code, parameter_code, exc)
+
+
+@shared_task(bind=True, name="weather.run_ingest_job", max_retries=settings.METOFFICE_TASK_MAX_RETRIES)
+def run_ingest_job_task(self, job_id: int) -> dict:
+    """
+    Run an ``IngestJob`` queued by ``/api/ingest/``; progress is saved on the job.
+
+    Transient download errors are retried like ``ingest_dataset_task``'s; the
+    job only fails once the retries run out.
+    """
+    try:
+        job = IngestJob.objects.select_related("region", "parameter").get(pk=job_id)
+    except IngestJob.DoesNotExist:
+        # Deleted (e.g. from the admin) while it waited in the queue.
+        logger.warning("[ingest-task] Ingest job %s no longer exists", job_id)
+        return {"job_id": job_id, "error": "Ingest job not found"}
+    try:
+        ingest_jobs.run_job(job, retry_downloads=self.request.retries < self.max_retries)
+    except metoffice.MetOfficeDownloadError as exc:
+        countdown = _retry_countdown(self)
+        logger.warning("[ingest-task] Retrying ingest job %s in %ss: %s", job_id, countdown, exc)
+        raise self.retry(exc=exc, countdown=countdown)
+    return {"job_id": job.pk, "status": job.status}
+
+
+@shared_task(bind=True, name="weather.summarise_ingest")
+def summarise_ingest_task(self, results: list[dict], regions: list[str], parameters: list[str]) -> dict:
     payload = {
         "task_id": getattr(self.request, "id", None),
-        "regions": [region.code for region in region_list],
-        "parameters": [parameter.code for parameter in parameter_list],
-        "runs": results,
-        "failures": failures,
-        "total_rows": total_rows,
+        "regions": regions,
+        "parameters": parameters,
+        **ingestion.summarise_results(results),
     }
     logger.info(
-        "[ingest-task] Completed ingestion (task_id=%s total_rows=%s)",
+        "[ingest-task] Completed ingestion (task_id=%s total_rows=%s not_modified=%s)",
         payload["task_id"],
-        total_rows,
+        payload["total_rows"],
+        payload["not_modified"],
     )
     return payload
-
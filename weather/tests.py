@@ -1,16 +1,109 @@
+import fcntl
+import gzip
+import io
+import json
+import re
+import tempfile
+import threading
+import time
 from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from unittest import mock
+from unittest import mock, skipUnless
 
+import numpy as np
+import pandas as pd
+from celery.exceptions import Retry
 from django.conf import settings
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
 from django.db.utils import OperationalError
-from django.test import TestCase, override_settings
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
-from rest_framework.test import APIClient
+from django.utils.http import http_date
+from kombu.exceptions import OperationalError as BrokerError
+from rest_framework.test import APIClient, APIRequestFactory
 
-from weather.models import ClimateRecord, Parameter, Region
-from weather.services import metoffice
+from weather import benchmarks
+from weather.admin import ClimateRecordAdmin, RegionAdmin
+from weather.api import ClimateRecordViewSet
+from weather.models import ClimateRecord, ClimateRollup, ClimateSeries, DatasetFetchState, IngestJob, Parameter, Region
+from weather.pagination import KeysetPagination
+from weather.serializers import IngestTriggerSerializer
+from weather.services import (
+    analytics,
+    api_cache,
+    dashboard,
+    downsampling,
+    http,
+    ingest_jobs,
+    ingestion,
+    metoffice,
+    mirror,
+    reference,
+    rollups,
+    series,
+)
+from weather.services.series_cache import SeriesCache, datasets
+from weather.tasks import (
+    ingest_dataset_task,
+    ingest_metoffice_task,
+    run_ingest_job_task,
+    summarise_ingest_task,
+)
+
+
+class StubDatasetServer:
+    """
+    Local HTTP/1.1 server for download tests.
+
+    Answers each GET with the next queued ``(status, headers, body)`` (the last
+    one repeats) and records each request's headers and client port.
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests: list[tuple[dict, int]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests.append((dict(self.headers), self.client_address[1]))
+                status, headers, body = server.responses.pop(0) if len(server.responses) > 1 else server.responses[0]
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}/datasets"
+
+    def start(self, test_case, **overrides) -> "StubDatasetServer":
+        thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        thread.start()
+        test_case.addCleanup(self.httpd.server_close)
+        test_case.addCleanup(self.httpd.shutdown)
+        test_case.addCleanup(http.reset_session)
+        overrides = {
+            "METOFFICE_BASE_URL": self.base_url,
+            "METOFFICE_HTTP_BACKOFF": 0,
+            "METOFFICE_MIRROR_DIR": "",
+            **overrides,
+        }
+        test_case.enterContext(override_settings(**overrides))
+        http.reset_session()
+        return self
 
 
 class MetOfficeParserTests(TestCase):
@@ -30,6 +123,37 @@ class MetOfficeParserTests(TestCase):
         )
         self.assertTrue(any(record.period == "ann" for record in records))
 
+    def test_fixed_width_parser_keeps_trailing_blanks_in_place(self):
+        dataframe, last_updated = metoffice.parse_dataset(self._sample_text())
+        self.assertEqual(dataframe["year"].dtype, "int16")
+        self.assertEqual(dataframe["jan"].dtype, "float32")
+        self.assertIsNotNone(last_updated)
+        latest = dataframe[dataframe["year"] == 2025].iloc[0]
+        self.assertAlmostEqual(float(latest["oct"]), 13.3, places=4)
+        self.assertTrue(pd.isna(latest["nov"]))
+        self.assertAlmostEqual(float(latest["win"]), 7.30, places=4)
+        self.assertAlmostEqual(float(latest["sum"]), 20.65, places=4)
+        self.assertTrue(pd.isna(latest["ann"]))
+
+    def test_parser_falls_back_for_misaligned_rows(self):
+        content = "Last updated 01-Nov-2025 10:37\nyear jan feb\n1990 1.5 2.25\n1991   --- 3.0\n"
+        with mock.patch(
+            "weather.services.metoffice.parse_dataset_csv", wraps=metoffice.parse_dataset_csv
+        ) as csv_mock:
+            dataframe, _ = metoffice.parse_dataset(content)
+        csv_mock.assert_called_once()
+        self.assertEqual(dataframe["feb"].tolist(), [2.25, 3.0])
+
+    def test_vectorised_builder_matches_legacy_builder(self):
+        dataframe, last_updated = metoffice.parse_dataset_csv(self._sample_text())
+        expected = benchmarks.legacy_build_records(dataframe, self.region, self.parameter, last_updated)
+        actual = metoffice.build_records_from_dataframe(dataframe, self.region, self.parameter, last_updated)
+
+        def _key(record):
+            return (record.year, record.period_type, record.period, str(record.value), record.source_last_updated)
+
+        self.assertEqual([_key(record) for record in actual], [_key(record) for record in expected])
+
 
 class MetOfficeSyncTests(TestCase):
     def setUp(self):
@@ -47,9 +171,444 @@ class MetOfficeSyncTests(TestCase):
             ).exists()
         )
 
+    @mock.patch("weather.services.metoffice.fetch_dataset_text")
+    def test_sync_skips_unchanged_content(self, fetch_dataset_mock):
+        fetch_dataset_mock.return_value = (Path(settings.BASE_DIR) / "sample.txt").read_text(), "test-url"
+        first = metoffice.sync_dataset(self.region, self.parameter)
+        self.assertEqual(first["status"], metoffice.SYNC_UPDATED)
+
+        with mock.patch("weather.services.metoffice.parse_dataset") as parse_mock:
+            second = metoffice.sync_dataset(self.region, self.parameter)
+        parse_mock.assert_not_called()
+        self.assertEqual(second["status"], metoffice.SYNC_NOT_MODIFIED)
+        self.assertEqual(second["rows"], 0)
+        self.assertEqual(second["last_updated"], first["last_updated"])
+
+        forced = metoffice.sync_dataset(self.region, self.parameter, force=True)
+        self.assertEqual(forced["status"], metoffice.SYNC_UPDATED)
+
+    @mock.patch("weather.services.metoffice.fetch_dataset_text")
+    def test_sync_writes_only_changed_cells(self, fetch_dataset_mock):
+        fetch_dataset_mock.return_value = (Path(settings.BASE_DIR) / "sample.txt").read_text(), "test-url"
+        first = metoffice.sync_dataset(self.region, self.parameter)
+        self.assertEqual(first["inserted"], first["rows"])
+        self.assertEqual((first["updated"], first["unchanged"]), (0, 0))
+
+        records = ClimateRecord.objects.filter(region=self.region, parameter=self.parameter)
+        stale = timezone.now() - timezone.timedelta(days=1)
+        records.update(fetched_at=stale)
+        records.filter(year=2024, period="ann").update(value=Decimal("0.01"))
+        records.filter(year=2023, period="jan").delete()
+
+        second = metoffice.sync_dataset(self.region, self.parameter, force=True)
+
+        self.assertEqual((second["inserted"], second["updated"]), (1, 1))
+        self.assertEqual(second["unchanged"], first["rows"] - 2)
+        self.assertEqual(records.filter(fetched_at__gt=stale).count(), 2)
+        self.assertNotEqual(records.get(year=2024, period="ann").value, Decimal("0.01"))
+
+    @mock.patch("weather.services.metoffice.fetch_dataset_text")
+    def test_sync_deletes_cells_missing_from_the_dataset(self, fetch_dataset_mock):
+        fetch_dataset_mock.return_value = (Path(settings.BASE_DIR) / "sample.txt").read_text(), "test-url"
+        metoffice.sync_dataset(self.region, self.parameter)
+        # What the old parser made of 2025: seasons shifted into nov/dec.
+        for period, value in (("nov", "7.30"), ("dec", "14.56")):
+            ClimateRecord.objects.create(
+                region=self.region, parameter=self.parameter, year=2025, period_type="month", period=period, value=value
+            )
+        rollups.refresh_rollups(self.region, self.parameter)
+        series.refresh_store(self.region, self.parameter)
+
+        result = metoffice.sync_dataset(self.region, self.parameter, force=True)
+
+        self.assertEqual((result["inserted"], result["updated"], result["deleted"]), (0, 0, 2))
+        records = ClimateRecord.objects.filter(region=self.region, parameter=self.parameter)
+        self.assertFalse(records.filter(year=2025, period__in=["nov", "dec"]).exists())
+        nov = ClimateRollup.objects.get(region=self.region, parameter=self.parameter, period="nov")
+        self.assertEqual(nov.last_year, 2024)
+        stored = ClimateSeries.objects.get(region=self.region, parameter=self.parameter, period_type="month")
+        self.assertTrue(np.isnan(series.unpack(stored)[-1, 10:]).all())
+
+    def test_sync_sends_validators_and_handles_304(self):
+        server = StubDatasetServer((304, {}, b"")).start(self)
+        url = metoffice.build_dataset_url(self.parameter.code, self.region.dataset_slug)
+        DatasetFetchState.objects.create(
+            region=self.region,
+            parameter=self.parameter,
+            source_url=url,
+            etag='"abc"',
+            last_modified="Sat, 01 Nov 2025 10:37:00 GMT",
+        )
+
+        result = metoffice.sync_dataset(self.region, self.parameter)
+
+        headers, _ = server.requests[0]
+        self.assertEqual(headers["If-None-Match"], '"abc"')
+        self.assertEqual(headers["If-Modified-Since"], "Sat, 01 Nov 2025 10:37:00 GMT")
+        self.assertEqual(result["status"], metoffice.SYNC_NOT_MODIFIED)
+        self.assertFalse(ClimateRecord.objects.filter(region=self.region, parameter=self.parameter).exists())
+
+
+    @mock.patch("weather.services.metoffice.fetch_dataset_text")
+    def test_store_upserts_a_state_another_sync_created(self, fetch_dataset_mock):
+        text = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        fetch_dataset_mock.return_value = text, "test-url"
+        state = metoffice.load_fetch_state(self.region, self.parameter)
+        prepared = metoffice.prepare_dataset(self.region, self.parameter, state)
+        # A concurrent sync of the same dataset saved its state first.
+        DatasetFetchState.objects.create(region=self.region, parameter=self.parameter, source_url="test-url")
+
+        metoffice.store_dataset(self.region, self.parameter, state, prepared)
+
+        stored = DatasetFetchState.objects.get(region=self.region, parameter=self.parameter)
+        self.assertEqual(stored.pk, state.pk)
+        self.assertEqual(stored.content_sha256, metoffice._content_digest(text))
+
+
+class StreamingIngestTests(TestCase):
+    def setUp(self):
+        self.region = Region.objects.get(code="UK")
+        self.parameter = Parameter.objects.get(code="Tmax")
+        self.content = (Path(settings.BASE_DIR) / "sample.txt").read_bytes()
+
+        StubDatasetServer((200, {"Content-Type": "text/plain; charset=utf-8"}, self.content)).start(self)
+
+    @override_settings(METOFFICE_STREAM_BATCH_ROWS=40)
+    def test_streaming_sync_persists_in_batches(self):
+        with (
+            mock.patch.object(metoffice.DatasetStream, "chunk_size", 256),
+            mock.patch("weather.services.metoffice.persist_dataset", wraps=metoffice.persist_dataset) as persist_mock,
+        ):
+            result = metoffice.sync_dataset(self.region, self.parameter, stream=True)
+
+        self.assertGreater(persist_mock.call_count, 1)
+        self.assertTrue(all(len(call.args[0]) <= 40 for call in persist_mock.call_args_list))
+
+        dataframe, last_updated = metoffice.parse_dataset(self.content.decode())
+        expected = len(metoffice.build_record_frame(dataframe))
+        self.assertEqual(result["rows"], expected)
+        self.assertEqual(ClimateRecord.objects.filter(region=self.region, parameter=self.parameter).count(), expected)
+        state = DatasetFetchState.objects.get(region=self.region, parameter=self.parameter)
+        self.assertEqual(state.content_sha256, metoffice._content_digest(self.content.decode()))
+        self.assertEqual(state.source_last_updated, last_updated)
+
+    def test_streaming_sync_deletes_cells_missing_from_the_dataset(self):
+        metoffice.sync_dataset(self.region, self.parameter, stream=True)
+        ClimateRecord.objects.create(
+            region=self.region, parameter=self.parameter, year=1800, period_type="annual", period="ann", value="9.99"
+        )
+
+        result = metoffice.sync_dataset(self.region, self.parameter, stream=True, force=True)
+
+        self.assertEqual((result["inserted"], result["deleted"]), (0, 1))
+        self.assertFalse(ClimateRecord.objects.filter(year=1800).exists())
+
+    def test_streaming_sync_stops_at_unchanged_stamp(self):
+        metoffice.sync_dataset(self.region, self.parameter, stream=True)
+        with mock.patch.object(metoffice.DatasetStream, "frames") as frames_mock:
+            second = metoffice.sync_dataset(self.region, self.parameter, stream=True)
+            frames_mock.assert_not_called()
+            self.assertEqual(second["status"], metoffice.SYNC_NOT_MODIFIED)
+
+            forced = metoffice.sync_dataset(self.region, self.parameter, stream=True, force=True)
+            frames_mock.assert_called_once()
+            self.assertEqual(forced["status"], metoffice.SYNC_UPDATED)
+
+
+class HTTPSessionTests(SimpleTestCase):
+    def test_downloads_share_one_keep_alive_connection(self):
+        server = StubDatasetServer((200, {}, b"year jan\n")).start(self)
+
+        metoffice.fetch_dataset_text("Tmax", "UK")
+        metoffice.fetch_dataset_text("Tmin", "UK")
+
+        self.assertIs(http.get_session(), http.get_session())
+        ports = {port for _, port in server.requests}
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(len(ports), 1)
+
+    def test_retries_server_errors_and_throttling(self):
+        server = StubDatasetServer(
+            (503, {}, b""),
+            (429, {"Retry-After": "0"}, b""),
+            (200, {}, b"year jan\n"),
+        ).start(self)
+
+        text, _ = metoffice.fetch_dataset_text("Tmax", "UK")
+
+        self.assertEqual(text, "year jan\n")
+        self.assertEqual(len(server.requests), 3)
+
+    def test_exhausted_retries_raise_a_transient_error(self):
+        server = StubDatasetServer((502, {}, b"")).start(self, METOFFICE_HTTP_RETRIES=1)
+
+        with self.assertRaises(metoffice.MetOfficeDownloadError):
+            metoffice.fetch_dataset_text("Tmax", "UK")
+        self.assertEqual(len(server.requests), 2)
+
+    def test_negotiates_gzip(self):
+        body = (Path(settings.BASE_DIR) / "sample.txt").read_bytes()
+        server = StubDatasetServer((200, {"Content-Encoding": "gzip"}, gzip.compress(body))).start(self)
+
+        text, _ = metoffice.fetch_dataset_text("Tmax", "UK")
+
+        self.assertIn("gzip", server.requests[0][0]["Accept-Encoding"])
+        self.assertEqual(text, body.decode())
+
+    def test_forked_process_gets_its_own_session(self):
+        self.addCleanup(http.reset_session)
+        parent = http.get_session()
+        with mock.patch("weather.services.http.os.getpid", return_value=-1):
+            self.assertIsNot(http.get_session(), parent)
+
+
+class DatasetMirrorTests(TestCase):
+    def setUp(self):
+        self.region = Region.objects.get(code="UK")
+        self.parameter = Parameter.objects.get(code="Tmax")
+        self.content = (Path(settings.BASE_DIR) / "sample.txt").read_bytes()
+        self.mirror_dir = self.enterContext(tempfile.TemporaryDirectory())
+
+    def _start(self, *responses, **overrides):
+        responses = responses or ((200, {"ETag": '"v1"'}, self.content),)
+        return StubDatasetServer(*responses).start(self, METOFFICE_MIRROR_DIR=self.mirror_dir, **overrides)
+
+    def test_downloads_are_mirrored_and_replayed_offline(self):
+        server = self._start()
+        url = metoffice.build_dataset_url("Tmax", "UK")
+
+        text, _ = metoffice.fetch_dataset_text("Tmax", "UK")
+        entry = mirror.lookup(url)
+        self.assertEqual(entry.sha256, metoffice._content_digest(text))
+        self.assertEqual(entry.etag, '"v1"')
+
+        offline_text, _ = metoffice.fetch_dataset_text("Tmax", "UK", offline=True)
+        self.assertEqual(offline_text, text)
+        self.assertEqual(len(server.requests), 1)
+
+        with self.assertRaises(metoffice.MetOfficeDatasetError):
+            metoffice.fetch_dataset_text("Tmin", "UK", offline=True)
+
+    def test_fresh_copies_are_served_without_a_request(self):
+        server = self._start(METOFFICE_MIRROR_TTL=3600)
+        metoffice.fetch_dataset_text("Tmax", "UK")
+        metoffice.fetch_dataset_text("Tmax", "UK")
+        self.assertEqual(len(server.requests), 1)
+
+    def test_unmirrored_dataset_is_fetched_unconditionally(self):
+        server = self._start()
+        url = metoffice.build_dataset_url("Tmax", "UK")
+        state = DatasetFetchState(region=self.region, parameter=self.parameter, source_url=url, etag='"v0"')
+
+        metoffice.fetch_dataset_text("Tmax", "UK", state=state)
+
+        self.assertNotIn("If-None-Match", server.requests[0][0])
+        self.assertIsNotNone(mirror.lookup(url))
+
+    def test_streamed_downloads_are_mirrored(self):
+        self._start()
+        result = metoffice.sync_dataset(self.region, self.parameter, stream=True)
+        ClimateRecord.objects.all().delete()
+
+        replayed = metoffice.sync_dataset(self.region, self.parameter, stream=True, offline=True, force=True)
+
+        self.assertEqual(replayed["inserted"], result["rows"])
+        entry = mirror.lookup(metoffice.build_dataset_url("Tmax", "UK"))
+        self.assertEqual(entry.path.read_bytes(), self.content)
+
+    def test_prune_evicts_old_entries_then_oldest_beyond_size(self):
+        self._start(METOFFICE_MIRROR_MAX_MB=1, METOFFICE_MIRROR_MAX_AGE_DAYS=30, METOFFICE_MIRROR_PRUNE_GRACE=0)
+        now = timezone.now()
+        payload = b"x" * 400_000
+        with mock.patch("weather.services.mirror.timezone.now", return_value=now - timezone.timedelta(days=31)):
+            mirror.store("http://example.test/stale.txt", b"stale")
+        for index in range(3):
+            with mock.patch("weather.services.mirror.timezone.now", return_value=now + timezone.timedelta(seconds=index)):
+                mirror.store(f"http://example.test/{index}.txt", payload + bytes([index]))
+
+        self.assertIsNone(mirror.lookup("http://example.test/stale.txt"))
+        self.assertIsNone(mirror.lookup("http://example.test/0.txt"))
+        self.assertIsNotNone(mirror.lookup("http://example.test/1.txt"))
+        self.assertIsNotNone(mirror.lookup("http://example.test/2.txt"))
+        self.assertEqual(len(list(Path(self.mirror_dir, "objects").glob("??/*"))), 2)
+
+    def test_prune_keeps_recent_unreferenced_payloads(self):
+        self._start(METOFFICE_MIRROR_MAX_MB=1)
+        mirror.store("http://example.test/a.txt", b"x" * 600_000)
+        mirror.store("http://example.test/b.txt", b"y" * 600_000)
+
+        self.assertIsNone(mirror.lookup("http://example.test/a.txt"))
+        self.assertEqual(len(list(Path(self.mirror_dir, "objects").glob("??/*"))), 2)
+        with override_settings(METOFFICE_MIRROR_PRUNE_GRACE=0):
+            mirror.prune()
+        self.assertEqual(len(list(Path(self.mirror_dir, "objects").glob("??/*"))), 1)
+
+    def test_prune_waits_for_the_lock_held_by_another_process(self):
+        self._start()
+        mirror.store("http://example.test/a.txt", b"a")
+        pruning = threading.Thread(target=mirror.prune)
+        with open(Path(self.mirror_dir, ".prune.lock"), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            pruning.start()
+            pruning.join(0.2)
+            self.assertTrue(pruning.is_alive())
+        pruning.join(5)
+        self.assertFalse(pruning.is_alive())
+
+    def test_payload_evicted_after_lookup_is_a_miss(self):
+        server = self._start(METOFFICE_MIRROR_TTL=3600)
+        url = metoffice.build_dataset_url("Tmax", "UK")
+        text, _ = metoffice.fetch_dataset_text("Tmax", "UK")
+        entry = mirror.lookup(url)
+        entry.path.unlink()
+
+        with mock.patch("weather.services.mirror.lookup", return_value=entry):
+            self.assertEqual(metoffice.fetch_dataset_text("Tmax", "UK")[0], text)
+            entry.path.unlink()
+            stream = metoffice.open_dataset_stream(url)
+            self.addCleanup(stream.close)
+            self.assertEqual(sum(len(frame) for frame in stream.frames()), len(metoffice.parse_dataset(text)[0]))
+            entry.path.unlink()
+            with self.assertRaises(metoffice.MetOfficeDatasetError):
+                metoffice.fetch_dataset_text("Tmax", "UK", offline=True)
+        self.assertEqual(len(server.requests), 3)
+
+    def test_command_rebuilds_from_mirror_offline(self):
+        self._start()
+        with override_settings(METOFFICE_BASE_URL="http://127.0.0.1:9/unreachable"):
+            url = metoffice.build_dataset_url("Tmax", "UK")
+            mirror.store(url, self.content)
+            call_command(
+                "ingest_metoffice", "--offline", "--regions", "UK", "--parameters", "Tmax", stdout=io.StringIO()
+            )
+
+        self.assertTrue(
+            ClimateRecord.objects.filter(region=self.region, parameter=self.parameter, year=2024, period="ann").exists()
+        )
+
+    def test_mirror_is_off_by_default(self):
+        with override_settings(METOFFICE_MIRROR_DIR=""):
+            self.assertFalse(mirror.enabled())
+            with self.assertRaisesMessage(CommandError, "METOFFICE_MIRROR_DIR"):
+                call_command("ingest_metoffice", "--offline", stdout=io.StringIO())
+
+
+class IngestionEngineTests(TestCase):
+    def setUp(self):
+        self.regions = list(Region.objects.filter(code__in=["UK", "WALES"]))
+        self.parameter = Parameter.objects.get(code="Tmax")
+
+    @mock.patch("weather.services.metoffice.fetch_dataset_text")
+    def test_run_ingestion_reports_runs_and_failures(self, fetch_dataset_mock):
+        sample = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+
+        def fake_fetch(parameter_code, dataset_slug, state=None, offline=False):
+            if dataset_slug == "Wales":
+                raise metoffice.MetOfficeDatasetError("Unable to download dataset Wales")
+            return sample, f"{parameter_code}/{dataset_slug}"
+
+        fetch_dataset_mock.side_effect = fake_fetch
+        seen: list[dict] = []
+
+        payload = ingestion.run_ingestion(
+            self.regions, [self.parameter], workers=2, rate_limit=0, on_result=seen.append
+        )
+
+        self.assertEqual([run["region"] for run in payload["runs"]], ["UK"])
+        self.assertEqual(payload["failures"][0]["region"], "WALES")
+        self.assertEqual(payload["total_rows"], payload["runs"][0]["rows"])
+        self.assertEqual(len(seen), 2)
+        self.assertTrue(ClimateRecord.objects.filter(region__code="UK").exists())
+
+    def test_streaming_runs_open_one_dataset_at_a_time(self):
+        opened: list[str] = []
+        open_counts: list[int] = []
+
+        def prepare(region, parameter, state, stream=None, offline=False):
+            opened.append(region.code)
+            open_counts.append(len(opened))
+            return metoffice.PreparedDataset(url=region.code)
+
+        def store(region, parameter, state, prepared):
+            opened.remove(region.code)
+            return {"region": region.code, "parameter": parameter.code, "status": metoffice.SYNC_NOT_MODIFIED, "rows": 0}
+
+        with (
+            mock.patch("weather.services.metoffice.prepare_dataset", side_effect=prepare) as prepare_mock,
+            mock.patch("weather.services.metoffice.store_dataset", side_effect=store),
+        ):
+            payload = ingestion.run_ingestion(
+                self.regions, [self.parameter, Parameter.objects.get(code="Tmin")], workers=4, rate_limit=0, stream=True
+            )
+
+        self.assertEqual(payload["not_modified"], 4)
+        self.assertEqual(prepare_mock.call_count, 4)
+        self.assertEqual(max(open_counts), 1)
+
+    @mock.patch("weather.services.ingestion.time.sleep")
+    @mock.patch("weather.services.ingestion.time.monotonic", return_value=100.0)
+    def test_rate_limiter_spaces_requests_per_host(self, monotonic_mock, sleep_mock):
+        limiter = ingestion.HostRateLimiter(rate=2)
+        limiter.wait("https://a.example.com/one.txt")
+        limiter.wait("https://b.example.com/one.txt")
+        limiter.wait("https://a.example.com/two.txt")
+        sleep_mock.assert_called_once_with(0.5)
+
+
+class IngestTaskFanOutTests(TestCase):
+    def test_trigger_fans_out_one_subtask_per_dataset(self):
+        with mock.patch.object(ingest_metoffice_task, "replace") as replace_mock:
+            ingest_metoffice_task.apply(
+                kwargs={"regions": ["UK", "WALES"], "parameters": ["Tmax", "Rainfall"]}
+            )
+        workflow = replace_mock.call_args.args[0]
+        self.assertEqual(len(workflow.tasks), 4)
+        self.assertEqual({task.task for task in workflow.tasks}, {"weather.ingest_dataset"})
+        self.assertEqual(workflow.body.task, "weather.summarise_ingest")
+
+    def test_summary_callback_builds_payload(self):
+        results = [
+            {"region": "UK", "parameter": "Tmax", "status": metoffice.SYNC_UPDATED, "rows": 10},
+            {"region": "UK", "parameter": "Rainfall", "status": metoffice.SYNC_NOT_MODIFIED, "rows": 0},
+            {"region": "WALES", "parameter": "Tmax", "error": "bad file"},
+        ]
+        payload = summarise_ingest_task.run(results, regions=["UK", "WALES"], parameters=["Tmax", "Rainfall"])
+        self.assertEqual(payload["total_rows"], 10)
+        self.assertEqual(payload["not_modified"], 1)
+        self.assertEqual(len(payload["runs"]), 2)
+        self.assertEqual(payload["failures"], [results[2]])
+
+    @mock.patch("weather.services.metoffice.sync_dataset")
+    def test_dataset_task_retries_transient_errors_with_backoff(self, sync_mock):
+        sync_mock.side_effect = metoffice.MetOfficeDownloadError("timeout")
+        with mock.patch.object(ingest_dataset_task, "retry", side_effect=Retry()) as retry_mock:
+            ingest_dataset_task.push_request(retries=1)
+            try:
+                with self.assertRaises(Retry):
+                    ingest_dataset_task.run("UK", "Tmax")
+            finally:
+                ingest_dataset_task.pop_request()
+        self.assertEqual(retry_mock.call_args.kwargs["countdown"], settings.METOFFICE_TASK_RETRY_BACKOFF * 2)
+
+        ingest_dataset_task.push_request(retries=ingest_dataset_task.max_retries)
+        try:
+            result = ingest_dataset_task.run("UK", "Tmax")
+        finally:
+            ingest_dataset_task.pop_request()
+        self.assertEqual(result, {"region": "UK", "parameter": "Tmax", "error": "timeout"})
+
+    @mock.patch("weather.services.metoffice.sync_dataset")
+    def test_dataset_task_reports_permanent_errors_without_retry(self, sync_mock):
+        sync_mock.side_effect = metoffice.MetOfficeDatasetError("Could not find dataset header row.")
+        with mock.patch.object(ingest_dataset_task, "retry") as retry_mock:
+            result = ingest_dataset_task.run("UK", "Tmax")
+        retry_mock.assert_not_called()
+        self.assertEqual(result["error"], "Could not find dataset header row.")
+
 
 class ClimateRecordAPITests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.region = Region.objects.get(code="UK")
         self.parameter = Parameter.objects.get(code="Rainfall")
@@ -83,7 +642,7 @@ class ClimateRecordAPITests(TestCase):
             {"region": self.region.code, "parameter": self.parameter.code, "period_type": "annual", "limit": 100},
         )
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(json.loads(response.getvalue())["count"], 2)
 
     def test_summary_endpoint_returns_stats(self):
         url = reverse("weather:records-summary")
@@ -96,32 +655,745 @@ class ClimateRecordAPITests(TestCase):
         self.assertAlmostEqual(response.data["avg_value"], 110.625)
 
 
-class DatasetIngestAPITests(TestCase):
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("weather:records-list")
+        parameter = Parameter.objects.get(code="Tmax")
+        ClimateRecord.objects.bulk_create(
+            [
+                ClimateRecord(
+                    region=region,
+                    parameter=parameter,
+                    year=year,
+                    period_type=period_type,
+                    period=period,
+                    value=Decimal("10.00"),
+                )
+                for region in Region.objects.filter(code__in=["UK", "WALES"])
+                for year in (2021, 2020)
+                for period_type, period in (("month", "jan"), ("month", "feb"), ("annual", "ann"))
+            ]
+        )
+
+    def test_pages_walk_every_record_once_in_key_order(self):
+        params = {"pagination": "keyset", "limit": 5}
+        seen = []
+        url = self.url
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.getvalue())
+            self.assertNotIn("count", data)
+            seen.extend(row["id"] for row in data["results"])
+            url, params = data["next"], None
+
+        expected = list(ClimateRecord.objects.order_by("year", "period", "id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_offset_pagination_stays_the_default(self):
+        data = json.loads(self.client.get(self.url, {"limit": 5}).getvalue())
+        self.assertEqual(data["count"], 12)
+        self.assertIn("offset=5", data["next"])
+
+    def test_offset_pages_break_ties_between_datasets_by_id(self):
+        # UK and WALES share every (year, period), so only id keeps the pages disjoint.
+        seen = []
+        for offset in range(0, 12, 5):
+            data = json.loads(self.client.get(self.url, {"limit": 5, "offset": offset}).getvalue())
+            seen.extend(row["id"] for row in data["results"])
+        expected = list(ClimateRecord.objects.order_by("year", "period", "id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_rejects_bad_cursors_and_custom_ordering(self):
+        self.assertEqual(self.client.get(self.url, {"pagination": "keyset", "cursor": "nope"}).status_code, 404)
+        response = self.client.get(self.url, {"pagination": "keyset", "ordering": "-value"})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class RecordListFastPathTests(TestCase):
+    def setUp(self):
+        dataframe, last_updated = metoffice.parse_dataset((Path(settings.BASE_DIR) / "sample.txt").read_text())
+        for code in ("UK", "WALES"):
+            metoffice.persist_dataset(dataframe, Region.objects.get(code=code), Parameter.objects.get(code="Tmax"), last_updated)
+        ClimateRecord.objects.filter(year=2000).update(fetched_at=timezone.now())
+
+    def test_matches_serializer_output_byte_for_byte(self):
+        factory = APIRequestFactory()
+        fast = ClimateRecordViewSet.as_view({"get": "list"})
+        legacy = benchmarks.LegacyClimateRecordViewSet.as_view({"get": "list"})
+        cases = [
+            {"limit": 1200, "offset": 2000},
+            {"region": "WALES", "period_type": "annual", "ordering": "-value,year", "limit": 50},
+            {"pagination": "keyset", "limit": 700, "start_year": 1999},
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                response = fast(factory.get("/api/records/", params))
+                self.assertTrue(response.streaming)
+                expected = benchmarks.response_body(legacy(factory.get("/api/records/", params)))
+                self.assertEqual(response.getvalue(), expected)
+
+    def test_stream_is_chunked_and_cached_once_drained(self):
+        cache.clear()
+        with override_settings(API_CACHE_TIMEOUT=60):
+            response = APIClient().get(reverse("weather:records-list"), {"limit": 2000})
+            chunks = list(response.streaming_content)
+            self.assertGreater(len(chunks), 4)
+            with self.assertNumQueries(0):
+                cached = APIClient().get(reverse("weather:records-list"), {"limit": 2000})
+        self.assertEqual(cached.content, b"".join(chunks))
+
+
+class SeriesAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("weather:series")
+        self.region = Region.objects.get(code="UK")
+        self.parameter = Parameter.objects.get(code="Tmax")
+        content = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        with mock.patch("weather.services.metoffice.fetch_dataset_text", return_value=(content, "test-url")):
+            metoffice.sync_dataset(self.region, self.parameter)
+
+    def test_series_matches_records_in_calendar_order(self):
+        params = {"region": "uk", "parameter": "TMAX", "start_year": 2000, "end_year": 2001}
+        with self.assertNumQueries(3):
+            data = self.client.get(self.url, params).json()
+
+        self.assertEqual(data["region"], "UK")
+        self.assertEqual(data["units"], self.parameter.units)
+        self.assertEqual(data["count"], 34)
+        self.assertEqual(data["period"][:3], ["jan", "feb", "mar"])
+        self.assertEqual(data["period"][12:17], ["win", "spr", "sum", "aut", "ann"])
+        self.assertEqual(data["year"][16:18], [2000, 2001])
+        records = ClimateRecord.objects.filter(region=self.region, parameter=self.parameter, year__in=[2000, 2001])
+        expected = {(record.year, record.period): float(record.value) for record in records}
+        self.assertEqual(dict(zip(zip(data["year"], data["period"]), data["value"])), expected)
+
+    def test_record_filters_apply(self):
+        data = self.client.get(self.url, {"region": "UK", "parameter": "Tmax", "period": "ann"}).json()
+        self.assertEqual(set(data["period"]), {"ann"})
+        self.assertEqual(data["year"], sorted(data["year"]))
+
+    def test_ingestion_packs_one_series_per_period_type(self):
+        rows = ClimateSeries.objects.filter(region=self.region, parameter=self.parameter)
+        stored = {row.period_type: row for row in rows}
+        self.assertEqual(set(stored), {"month", "season", "annual"})
+        annual = ClimateRecord.objects.filter(region=self.region, parameter=self.parameter, period="ann")
+        self.assertEqual(stored["annual"].first_year, annual.order_by("year").first().year)
+        self.assertEqual(series.unpack(stored["month"]).shape[1], 12)
+
+    def test_store_matches_records(self):
+        cases = [
+            {},
+            {"period_type": "season"},
+            {"period": "JAN"},
+            {"period": "ann", "start_year": 1990},
+            {"start_year": 1900, "end_year": 1950},
+            {"period_type": "month", "period": "win"},
+            {"end_year": 1800},
+        ]
+        base = {"region": "UK", "parameter": "Tmax"}
+        from_store = [self.client.get(self.url, {**base, **params}).json() for params in cases]
+        ClimateSeries.objects.all().delete()
+        from_records = [self.client.get(self.url, {**base, **params}).json() for params in cases]
+
+        for params, stored, raw in zip(cases, from_store, from_records):
+            with self.subTest(params=params):
+                for key in ("count", "year", "period", "value"):
+                    self.assertEqual(stored[key], raw[key])
+
+    def test_admin_edits_repack_the_series(self):
+        model_admin = ClimateRecordAdmin(ClimateRecord, admin.site)
+        record = ClimateRecord.objects.get(region=self.region, parameter=self.parameter, year=2000, period="jan")
+        record.value = Decimal("-9.87")
+        model_admin.save_model(None, record, None, True)
+
+        params = {"region": "UK", "parameter": "Tmax", "period": "jan", "start_year": 2000, "end_year": 2000}
+        self.assertEqual(self.client.get(self.url, params).json()["value"], [-9.87])
+
+    def test_max_points_keeps_extremes_and_endpoints(self):
+        base = {"region": "UK", "parameter": "Tmax", "period_type": "month"}
+        full = self.client.get(self.url, base).json()
+        data = self.client.get(self.url, {**base, "max_points": 100}).json()
+
+        self.assertLessEqual(data["count"], 100)
+        self.assertEqual(data["downsampled_from"], full["count"])
+        self.assertEqual((data["year"][0], data["period"][0]), (full["year"][0], full["period"][0]))
+        self.assertEqual((data["year"][-1], data["period"][-1]), (full["year"][-1], full["period"][-1]))
+        self.assertEqual((min(data["value"]), max(data["value"])), (min(full["value"]), max(full["value"])))
+        cells = set(zip(full["year"], full["period"], full["value"]))
+        self.assertTrue(set(zip(data["year"], data["period"], data["value"])) <= cells)
+
+        unchanged = self.client.get(self.url, {**base, "max_points": full["count"]}).json()
+        self.assertNotIn("downsampled_from", unchanged)
+        self.assertEqual(self.client.get(self.url, {**base, "max_points": 3}).status_code, 400)
+
+    def test_minmax_indices_keep_each_buckets_extremes(self):
+        values = np.sin(np.linspace(0, 20, 1001))
+        values[500] = 5.0
+        keep = downsampling.minmax_indices(values, 40)
+        self.assertLessEqual(len(keep), 40)
+        self.assertEqual((keep[0], keep[-1]), (0, 1000))
+        self.assertIn(500, keep)
+        self.assertIn(int(np.argmin(values)), keep)
+        self.assertEqual(list(downsampling.minmax_indices(values[:10], 40)), list(range(10)))
+
+    def test_requires_a_known_region_and_parameter(self):
+        response = self.client.get(self.url, {"region": "UK"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("parameter", response.json())
+        self.assertEqual(self.client.get(self.url, {"region": "ATLANTIS", "parameter": "Tmax"}).status_code, 404)
+
+
+class DashboardTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
+        self.region = Region.objects.first()
+        self.parameter = Parameter.objects.first()
+        content = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        with mock.patch("weather.services.metoffice.fetch_dataset_text", return_value=(content, "test-url")):
+            metoffice.sync_dataset(self.region, self.parameter)
+
+    def test_payload_has_series_summary_and_newest_rows(self):
+        params = {"region": self.region.code, "parameter": self.parameter.code, "period_type": "annual"}
+        data = self.client.get(reverse("weather:dashboard-data"), params).json()
+        self.assertEqual(data["year"], sorted(data["year"]))
+        self.assertEqual(data["summary"]["count"], data["count"])
+        self.assertEqual(data["summary"]["last_year"], data["year"][-1])
+        self.assertEqual(len(data["table"]["year"]), min(dashboard.TABLE_ROWS, data["count"]))
+        self.assertEqual(data["table"]["year"][:2], data["year"][:-3:-1])
 
-    @mock.patch("weather.services.metoffice.sync_dataset_from_url")
-    def test_ingest_endpoint_accepts_url(self, sync_mock):
-        sync_mock.return_value = {
-            "region": "UK",
-            "parameter": "Tmax",
-            "rows": 100,
-            "source_url": "https://example.com/Tmax/date/UK.txt",
-            "last_updated": None,
+    def test_page_embeds_the_default_selection(self):
+        response = self.client.get(reverse("weather:dashboard"))
+        match = re.search(r'<script id="dashboard-data" type="application/json">(.*?)</script>', response.content.decode(), re.S)
+        embedded = json.loads(match.group(1))
+        params = {
+            "region": self.region.code,
+            "parameter": self.parameter.code,
+            "period_type": dashboard.DEFAULT_PERIOD_TYPE,
+            "max_points": dashboard.CHART_POINTS,
         }
-        url = reverse("weather:ingest")
+        self.assertEqual(embedded, self.client.get(reverse("weather:dashboard-data"), params).json())
+
+    def test_max_points_thins_the_chart_only(self):
+        params = {"region": self.region.code, "parameter": self.parameter.code, "max_points": 50}
+        data = self.client.get(reverse("weather:dashboard-data"), params).json()
+        self.assertLessEqual(data["count"], 50)
+        self.assertEqual(data["summary"]["count"], data["downsampled_from"])
+        self.assertEqual(data["summary"]["max_value"], max(data["value"]))
+        self.assertEqual(len(data["table"]["year"]), dashboard.TABLE_ROWS)
+
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class ComparisonAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse("weather:compare")
+        self.parameter = Parameter.objects.get(code="Tmax")
+        content = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        with mock.patch("weather.services.metoffice.fetch_dataset_text", return_value=(content, "test-url")):
+            for code in ("UK", "ENGLAND"):
+                metoffice.sync_dataset(Region.objects.get(code=code), self.parameter)
+
+    def test_all_regions_cost_one_query(self):
+        codes = list(Region.objects.order_by("pk").values_list("code", flat=True))
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url, {"regions": ",".join(codes), "parameters": "tmax"}).json()
+        self.assertEqual([(item["region"], item["period"]) for item in data["series"]], [("UK", "ann"), ("ENGLAND", "ann")])
+        self.assertEqual(len(data["missing"]), len(codes) - 2)
+
+    def test_series_share_one_year_axis(self):
+        params = {"regions": ["england", "UK"], "parameters": "Tmax", "periods": "ann,JAN", "start_year": 2020}
+        data = self.client.get(self.url, params).json()
+        self.assertEqual(data["year"][0], 2020)
+        self.assertEqual([(item["region"], item["period"]) for item in data["series"]], [
+            ("ENGLAND", "jan"), ("ENGLAND", "ann"), ("UK", "jan"), ("UK", "ann"),
+        ])
+        records = ClimateRecord.objects.filter(region__code="ENGLAND", parameter=self.parameter, period="jan", year__gte=2020)
+        expected = {year: float(value) for year, value in records.values_list("year", "value") if value is not None}
+        for year, value in zip(data["year"], data["series"][0]["value"]):
+            self.assertEqual(value, expected.get(year))
+        for item in data["series"]:
+            self.assertEqual(len(item["value"]), len(data["year"]))
+
+    def test_query_is_validated(self):
+        response = self.client.get(self.url, {"regions": "UK", "periods": "ann,xyz"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"parameters", "periods"})
+
+
+class AnalyticsAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.region = Region.objects.get(code="UK")
+        self.parameter = Parameter.objects.get(code="Tmax")
+        content = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        with mock.patch("weather.services.metoffice.fetch_dataset_text", return_value=(content, "test-url")):
+            metoffice.sync_dataset(self.region, self.parameter)
+        records = ClimateRecord.objects.filter(region=self.region, parameter=self.parameter, value__isnull=False)
+        self.annual = {year: float(value) for year, value in records.filter(period="ann").values_list("year", "value")}
+
+    def _get(self, name, **params):
+        return self.client.get(reverse(f"weather:records-{name}"), {"region": "UK", "parameter": "Tmax", **params})
+
+    def test_anomalies_are_relative_to_the_baseline_mean(self):
+        data = self._get("anomalies", period="ann", start_year=2000, baseline_start=1961, baseline_end=1990).json()
+        baseline = [self.annual[year] for year in range(1961, 1991) if year in self.annual]
+        mean = sum(baseline) / len(baseline)
+        self.assertAlmostEqual(data["baseline"]["mean"]["ann"], mean, places=3)
+        self.assertEqual(data["year"][0], 2000)
+        for year, value in zip(data["year"], data["value"]):
+            self.assertAlmostEqual(value, self.annual[year] - mean, places=3)
+
+    def test_rolling_means_need_a_full_window(self):
+        data = self._get("rolling-means", period="ann", window=5).json()
+        first = min(self.annual)
+        self.assertEqual(data["year"][0], first + 4)
+        self.assertAlmostEqual(data["value"][0], sum(self.annual[first + offset] for offset in range(5)) / 5, places=3)
+        self.assertEqual(data["count"], len(data["value"]))
+
+    def test_trend_matches_least_squares_fit(self):
+        data = self._get("trend", period_type="season", start_year=1961).json()
+        self.assertEqual(data["period"], ["win", "spr", "sum", "aut"])
+
+        data = self._get("trend", period="ann", start_year=1961, confidence=0.9).json()
+        years = [year for year in self.annual if year >= 1961]
+        slope = np.polyfit(years, [self.annual[year] for year in years], 1)[0] * 10
+        self.assertAlmostEqual(data["slope_per_decade"][0], slope, places=3)
+        self.assertLess(data["ci_low"][0], data["slope_per_decade"][0])
+        self.assertGreater(data["ci_high"][0], data["slope_per_decade"][0])
+        self.assertEqual(data["count"], [len(years)])
+
+    def test_t_quantile_matches_t_tables(self):
+        table = {
+            (0.75, 1): 1.0000,
+            (0.75, 4): 0.7407,
+            (0.975, 1): 12.7062,
+            (0.975, 2): 4.3027,
+            (0.975, 3): 3.1824,
+            (0.975, 10): 2.2281,
+            (0.995, 1): 63.6567,
+            (0.995, 2): 9.9248,
+            (0.995, 3): 5.8409,
+            (0.995, 30): 2.7500,
+            (0.9995, 3): 12.9240,
+            (0.9995, 5): 6.8688,
+            (0.9995, 120): 3.3735,
+        }
+        for (probability, df), expected in table.items():
+            with self.subTest(probability=probability, df=df):
+                self.assertAlmostEqual(analytics.t_quantile(probability, df), expected, places=4)
+        self.assertAlmostEqual(analytics.t_quantile(0.025, 3), -3.1824, places=4)
+
+    def test_options_are_validated(self):
+        self.assertEqual(self._get("rolling-means", window=1).status_code, 400)
+        self.assertEqual(self._get("anomalies", baseline_start=1990, baseline_end=1961).status_code, 400)
+        self.assertEqual(self._get("trend", confidence=2).status_code, 400)
+        self.assertEqual(self.client.get(reverse("weather:records-trend"), {"region": "UK"}).status_code, 400)
+
+
+@override_settings(API_CACHE_TIMEOUT=0)
+class SeriesMemoryCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        datasets.clear()
+        self.client = APIClient()
+        self.region = Region.objects.get(code="UK")
+        self.parameter = Parameter.objects.get(code="Tmax")
+        content = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        with mock.patch("weather.services.metoffice.fetch_dataset_text", return_value=(content, "test-url")):
+            metoffice.sync_dataset(self.region, self.parameter)
+            metoffice.sync_dataset(Region.objects.get(code="ENGLAND"), self.parameter)
+
+    def test_repeat_reads_need_no_queries(self):
+        self.client.get(reverse("weather:series"), {"region": "UK", "parameter": "Tmax"})
+        with self.assertNumQueries(0):
+            data = self.client.get(reverse("weather:series"), {"region": "uk", "parameter": "tmax", "period": "ann"}).json()
+            summary = self.client.get(reverse("weather:records-summary"), {"region": "UK", "parameter": "Tmax"}).json()
+        self.assertEqual(set(data["period"]), {"ann"})
+        self.assertEqual(summary["count"], ClimateRecord.objects.filter(region=self.region, value__isnull=False).count())
+
+    def test_summary_matches_raw_aggregates(self):
+        cases = [
+            {},
+            {"period_type": "season"},
+            {"period": "JAN"},
+            {"period": "ann", "start_year": 1990},
+            {"start_year": 1900, "end_year": 1950},
+            {"end_year": 1800},
+        ]
+        url = reverse("weather:records-summary")
+        base = {"region": "UK", "parameter": "Tmax"}
+        from_memory = [self.client.get(url, {**base, **params}).json() for params in cases]
+        with override_settings(SERIES_CACHE_MAX_BYTES=0), mock.patch("weather.services.rollups.summarise", return_value=None):
+            from_records = [self.client.get(url, {**base, **params}).json() for params in cases]
+
+        for params, cached, raw in zip(cases, from_memory, from_records):
+            with self.subTest(params=params):
+                self.assertEqual(cached.keys(), raw.keys())
+                for key, value in raw.items():
+                    if isinstance(value, float):
+                        self.assertAlmostEqual(cached[key], value, places=9)
+                    else:
+                        self.assertEqual(cached[key], value)
+
+    def test_record_edits_are_seen_at_once(self):
+        params = {"region": "UK", "parameter": "Tmax", "period": "jan", "start_year": 2000, "end_year": 2000}
+        self.client.get(reverse("weather:series"), params)
+        record = ClimateRecord.objects.get(region=self.region, parameter=self.parameter, year=2000, period="jan")
+        record.value = Decimal("-9.87")
+        ClimateRecordAdmin(ClimateRecord, admin.site).save_model(None, record, None, True)
+
+        self.assertEqual(self.client.get(reverse("weather:series"), params).json()["value"], [-9.87])
+
+    def test_evicts_least_recently_used_beyond_the_ceiling(self):
+        memory = SeriesCache()
+        uk = memory.get("UK", "Tmax")
+        with override_settings(SERIES_CACHE_MAX_BYTES=uk.nbytes + 1):
+            self.assertIs(memory.get("uk", "TMAX"), uk)
+            memory.get("ENGLAND", "Tmax")
+        self.assertEqual(list(memory._entries), [("england", "tmax")])
+        self.assertLessEqual(memory.nbytes, uk.nbytes + 1)
+        self.assertIsNone(memory.get("ATLANTIS", "Tmax"))
+
+
+@override_settings(API_CACHE_TIMEOUT=0, SERIES_CACHE_MAX_BYTES=0)
+class ClimateRollupTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.region = Region.objects.get(code="UK")
+        self.parameter = Parameter.objects.get(code="Tmax")
+        self.content = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        with mock.patch("weather.services.metoffice.fetch_dataset_text", return_value=(self.content, "test-url")):
+            metoffice.sync_dataset(self.region, self.parameter)
+
+    def _summary(self, **params):
+        return self.client.get(reverse("weather:records-summary"), params).json()
+
+    def test_ingestion_builds_one_rollup_per_period(self):
+        rollups = ClimateRollup.objects.filter(region=self.region, parameter=self.parameter)
+        self.assertEqual(rollups.count(), 17)
+        annual = rollups.get(period="ann")
+        records = ClimateRecord.objects.filter(region=self.region, parameter=self.parameter, period="ann")
+        self.assertEqual(annual.count, records.count())
+        self.assertEqual(annual.first_year, records.order_by("year").first().year)
+        self.assertEqual(len(annual.yearly_values), annual.last_year - annual.first_year + 1)
+
+    def test_summary_matches_raw_aggregates(self):
+        cases = [
+            {"region": "uk", "parameter": "tmax"},
+            {"region": "UK", "parameter": "Tmax", "period_type": "season"},
+            {"region": "UK", "parameter": "Tmax", "period": "JAN"},
+            {"region": "UK", "parameter": "Tmax", "period": "ann", "start_year": 1990},
+            {"region": "UK", "parameter": "Tmax", "start_year": 1900, "end_year": 1950},
+            {"parameter": "Tmax", "end_year": 1800},
+        ]
+        with self.assertNumQueries(len(cases)):
+            from_rollups = [self._summary(**params) for params in cases]
+        ClimateRollup.objects.all().delete()
+        from_records = [self._summary(**params) for params in cases]
+
+        for params, rolled_up, raw in zip(cases, from_rollups, from_records):
+            with self.subTest(params=params):
+                self.assertEqual(rolled_up.keys(), raw.keys())
+                for key, value in raw.items():
+                    if isinstance(value, float):
+                        self.assertAlmostEqual(rolled_up[key], value, places=9)
+                    else:
+                        self.assertEqual(rolled_up[key], value)
+
+    def test_resync_refreshes_only_changed_periods(self):
+        ClimateRecord.objects.filter(
+            region=self.region, parameter=self.parameter, year=2024, period="ann"
+        ).update(value=Decimal("0.01"))
+
+        with (
+            mock.patch("weather.services.metoffice.fetch_dataset_text", return_value=(self.content, "test-url")),
+            mock.patch("weather.services.rollups.refresh_rollups", wraps=rollups.refresh_rollups) as refresh_mock,
+        ):
+            metoffice.sync_dataset(self.region, self.parameter, force=True)
+
+        self.assertEqual(refresh_mock.call_args.args[2], {(ClimateRecord.PeriodType.ANNUAL, "ann")})
+        annual = ClimateRollup.objects.get(region=self.region, parameter=self.parameter, period="ann")
+        self.assertNotIn(0.01, annual.yearly_values)
+
+    def test_admin_edits_refresh_their_rollup(self):
+        model_admin = ClimateRecordAdmin(ClimateRecord, admin.site)
+        record = ClimateRecord.objects.get(region=self.region, parameter=self.parameter, year=2024, period="ann")
+        record.value = Decimal("99.99")
+        model_admin.save_model(None, record, None, True)
+
+        annual = ClimateRollup.objects.get(region=self.region, parameter=self.parameter, period="ann")
+        self.assertEqual(annual.max_value, Decimal("99.99"))
+        self.assertEqual(annual.yearly_values[2024 - annual.first_year], 99.99)
+
+        model_admin.delete_queryset(None, ClimateRecord.objects.filter(period="ann"))
+        self.assertFalse(ClimateRollup.objects.filter(period="ann").exists())
+
+    def test_admin_edits_moving_a_record_refresh_both_keys(self):
+        other = Parameter.objects.get(code="Rainfall")
+        scope = api_cache.records_scope("UK", "Tmax")
+        before = api_cache.get_versions([scope])
+        record = ClimateRecord.objects.get(region=self.region, parameter=self.parameter, year=2024, period="ann")
+        record.parameter = other
+        ClimateRecordAdmin(ClimateRecord, admin.site).save_model(None, record, None, True)
+
+        annual = ClimateRollup.objects.get(region=self.region, parameter=self.parameter, period="ann")
+        self.assertEqual(annual.last_year, 2023)
+        self.assertEqual(ClimateRollup.objects.get(region=self.region, parameter=other, period="ann").count, 1)
+        moved = series.unpack(ClimateSeries.objects.get(region=self.region, parameter=other, period_type="annual"))
+        self.assertEqual(moved.shape, (1, 1))
+        self.assertNotEqual(api_cache.get_versions([scope]), before)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.region = Region.objects.get(code="UK")
+        self.parameter = Parameter.objects.get(code="Tmax")
+        self.dataframe, self.last_updated = metoffice.parse_dataset((Path(settings.BASE_DIR) / "sample.txt").read_text())
+        metoffice.persist_dataset(self.dataframe, self.region, self.parameter, self.last_updated)
+        self.summary_url = reverse("weather:records-summary")
+        self.params = {"region": "UK", "parameter": "Tmax", "period": "ann"}
+
+    def _after_this_second(self):
+        """Move the API's clock past the second of any version bumped so far."""
+        return mock.patch("weather.api.time.time", return_value=time.time() + 1)
+
+    def test_repeat_requests_are_served_from_cache(self):
+        self.enterContext(self._after_this_second())
+        first = self.client.get(self.summary_url, self.params)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", first)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.summary_url, dict(reversed(self.params.items())))
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_conditional_requests_get_not_modified(self):
+        self.enterContext(self._after_this_second())
+        first = self.client.get(reverse("weather:records-list"), self.params)
+
+        with self.assertNumQueries(0):
+            by_etag = self.client.get(reverse("weather:records-list"), self.params, HTTP_IF_NONE_MATCH=first["ETag"])
+            by_date = self.client.get(
+                reverse("weather:records-list"), self.params, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]
+            )
+        self.assertEqual(by_etag.status_code, 304)
+        self.assertEqual(by_date.status_code, 304)
+        self.assertEqual(by_etag["ETag"], first["ETag"])
+
+    def test_dates_do_not_validate_until_their_second_is_over(self):
+        # Ahead of the clock, so these bumps are the latest version of every scope.
+        version_second = int(time.time()) + 10
+        url = reverse("weather:records-list")
+        with mock.patch("weather.services.api_cache.time.time_ns", return_value=version_second * 1_000_000_000 + 200):
+            api_cache.invalidate("UK", "Tmax")
+        with mock.patch("weather.api.time.time", return_value=version_second + 0.5):
+            first = self.client.get(url, self.params)
+        self.assertNotIn("Last-Modified", first)
+
+        # A second bump in the same second must not be hidden behind that second's date.
+        with mock.patch("weather.services.api_cache.time.time_ns", return_value=version_second * 1_000_000_000 + 700):
+            api_cache.invalidate("UK", "Tmax")
+        with mock.patch("weather.api.time.time", return_value=version_second + 1):
+            second = self.client.get(url, self.params)
+            self.assertEqual(second["Last-Modified"], http_date(version_second + 1))
+            stale = self.client.get(url, self.params, HTTP_IF_MODIFIED_SINCE=http_date(version_second))
+            fresh = self.client.get(url, self.params, HTTP_IF_MODIFIED_SINCE=second["Last-Modified"])
+        self.assertEqual((stale.status_code, fresh.status_code), (200, 304))
+
+    def test_ingest_invalidates_only_affected_datasets(self):
+        other = Parameter.objects.get(code="Rainfall")
+        metoffice.persist_dataset(self.dataframe, self.region, other, self.last_updated)
+        queries = [
+            {"region": "UK", "parameter": "Tmax"},
+            {"region": "UK"},
+            {},
+            {"region": "UK", "parameter": "Rainfall"},
+        ]
+        before = [self.client.get(self.summary_url, params)["ETag"] for params in queries]
+
+        ClimateRecord.objects.filter(region=self.region, parameter=self.parameter).update(value=Decimal("1.00"))
+        self._sync()
+
+        after = [self.client.get(self.summary_url, params)["ETag"] for params in queries]
+        self.assertEqual([old != new for old, new in zip(before, after)], [True, True, True, False])
+
+    def test_padded_codes_share_the_scope_an_ingest_retires(self):
+        requests = [
+            (self.summary_url, {"region": " UK ", "parameter": "tmax ", "period": "ann"}),
+            (reverse("weather:compare"), {"regions": "UK ", "parameters": " Tmax"}),
+        ]
+        before = [self.client.get(url, params) for url, params in requests]
+        self.assertEqual([response.status_code for response in before], [200, 200])
+        ClimateRecord.objects.filter(region=self.region, parameter=self.parameter).update(value=Decimal("1.00"))
+        self._sync()
+
+        for (url, params), first in zip(requests, before):
+            after = self.client.get(url, params, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(after.status_code, 200)
+
+    def _sync(self):
+        content = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        with mock.patch("weather.services.metoffice.fetch_dataset_text", return_value=(content, "test-url")):
+            return metoffice.sync_dataset(self.region, self.parameter, force=True)
+
+    def test_responses_served_while_rollups_refresh_are_not_kept(self):
+        ClimateRecord.objects.filter(region=self.region, parameter=self.parameter, period="ann").update(
+            value=Decimal("1.00")
+        )
+        refresh_rollups = rollups.refresh_rollups
+        refresh_rollups(self.region, self.parameter)
+        cache.clear()
+        during = []
+
+        def refresh_after_a_request(*args, **kwargs):
+            during.append(self.client.get(self.summary_url, self.params))
+            return refresh_rollups(*args, **kwargs)
+
+        with mock.patch("weather.services.rollups.refresh_rollups", side_effect=refresh_after_a_request):
+            self._sync()
+
+        self.assertEqual(during[0].json()["max_value"], 1.0)
+        after = self.client.get(self.summary_url, self.params, HTTP_IF_NONE_MATCH=during[0]["ETag"])
+        self.assertEqual(after.status_code, 200)
+        self.assertGreater(after.json()["max_value"], 1.0)
+
+    def test_reference_data_edits_invalidate_everything(self):
+        first = self.client.get(self.summary_url, self.params)
+        self.region.name = "United Kingdom (renamed)"
+        RegionAdmin(Region, admin.site).save_model(None, self.region, None, True)
+
+        response = self.client.get(self.summary_url, self.params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+
+    @override_settings(API_CACHE_TIMEOUT=0)
+    def test_disabled_cache_sends_no_validators(self):
+        response = self.client.get(self.summary_url, self.params)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+
+class DatasetIngestAPITests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    @mock.patch("weather.tasks.run_ingest_job_task.apply_async")
+    def test_ingest_endpoint_queues_a_job(self, apply_mock):
         payload = {"url": "https://example.com/Tmax/date/UK.txt"}
-        response = self.client.post(url, payload, format="json")
+        response = self.client.post(reverse("weather:ingest"), payload, format="json")
+
         self.assertEqual(response.status_code, 202)
-        sync_mock.assert_called_once_with(payload["url"])
+        job = IngestJob.objects.get()
+        self.assertEqual((job.region.code, job.parameter.code, job.status), ("UK", "Tmax", "queued"))
+        apply_mock.assert_called_once_with((job.pk,), task_id=job.task_id)
+        self.assertEqual(response.data["id"], job.pk)
+        self.assertEqual(response["Location"], response.data["status_url"])
+        self.assertTrue(response["Location"].endswith(reverse("weather:ingest-job", args=[job.pk])))
 
-    @mock.patch("weather.services.metoffice.sync_dataset_from_url")
-    def test_ingest_endpoint_handles_errors(self, sync_mock):
-        sync_mock.side_effect = metoffice.MetOfficeDatasetError("bad url")
+    def test_ingest_endpoint_rejects_unknown_datasets(self):
         url = reverse("weather:ingest")
-        response = self.client.post(url, {"url": "https://bad.example.com/data.txt"}, format="json")
+        response = self.client.post(url, {"url": "https://bad.example.com/Nope/date/UK.txt"}, format="json")
         self.assertEqual(response.status_code, 400)
         self.assertIn("detail", response.data)
+        self.assertFalse(IngestJob.objects.exists())
+
+    def test_job_records_each_stage(self):
+        content = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        job = ingest_jobs.create_job("https://example.com/Tmax/date/UK.txt")
+        with mock.patch("weather.services.metoffice.fetch_dataset_text_by_url", return_value=(content, job.source_url)):
+            run_ingest_job_task(job.pk)
+
+        data = self.client.get(reverse("weather:ingest-job", args=[job.pk])).json()
+        self.assertEqual(data["status"], "succeeded")
+        self.assertEqual(set(data["stages"]), {"download", "parse", "store"})
+        self.assertEqual(data["stages"]["download"]["bytes"], len(content.encode("utf-8")))
+        rows = ClimateRecord.objects.filter(region=job.region, parameter=job.parameter).count()
+        self.assertEqual(data["stages"]["store"]["rows_written"], rows)
+        self.assertEqual(data["result"]["rows"], rows)
+        self.assertTrue(all(stage["seconds"] >= 0 for stage in data["stages"].values()))
+
+    @mock.patch("weather.tasks.run_ingest_job_task.apply_async")
+    def test_ingest_endpoint_fails_the_job_when_the_broker_is_down(self, apply_mock):
+        apply_mock.side_effect = BrokerError("Connection refused")
+        response = self.client.post(
+            reverse("weather:ingest"), {"url": "https://example.com/Tmax/date/UK.txt"}, format="json"
+        )
+
+        self.assertEqual(response.status_code, 503)
+        job = IngestJob.objects.get()
+        self.assertEqual((job.status, job.error), ("failed", "Connection refused"))
+        self.assertEqual((response.data["id"], response.data["status"]), (job.pk, "failed"))
+
+    def test_transient_download_errors_requeue_the_job_for_a_retry(self):
+        job = ingest_jobs.create_job("https://example.com/Tmax/date/UK.txt")
+        job.stages = {"download": {"seconds": 1.0, "bytes": 0}}
+        job.save(update_fields=["stages"])
+        error = metoffice.MetOfficeDownloadError("HTTP 503")
+        with (
+            mock.patch("weather.services.metoffice.fetch_dataset_text_by_url", side_effect=error),
+            mock.patch.object(run_ingest_job_task, "retry", side_effect=Retry()) as retry_mock,
+        ):
+            run_ingest_job_task.push_request(retries=1)
+            try:
+                with self.assertRaises(Retry):
+                    run_ingest_job_task.run(job.pk)
+            finally:
+                run_ingest_job_task.pop_request()
+
+        self.assertEqual(retry_mock.call_args.kwargs["countdown"], settings.METOFFICE_TASK_RETRY_BACKOFF * 2)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error, job.finished_at), ("queued", "", None))
+        self.assertEqual((job.stages, job.started_at), ({}, None))
+
+    def test_jobs_deleted_while_queued_are_skipped(self):
+        job = ingest_jobs.create_job("https://example.com/Tmax/date/UK.txt")
+        job_id = job.pk
+        job.delete()
+
+        with mock.patch("weather.services.metoffice.sync_dataset") as sync_mock:
+            result = run_ingest_job_task(job_id)
+
+        sync_mock.assert_not_called()
+        self.assertEqual(result, {"job_id": job_id, "error": "Ingest job not found"})
+
+    def test_failed_download_fails_the_job(self):
+        job = ingest_jobs.create_job("https://example.com/Tmax/date/UK.txt")
+        error = metoffice.MetOfficeDownloadError("HTTP 503")
+        with mock.patch("weather.services.metoffice.fetch_dataset_text_by_url", side_effect=error):
+            run_ingest_job_task.push_request(retries=run_ingest_job_task.max_retries)
+            try:
+                run_ingest_job_task.run(job.pk)
+            finally:
+                run_ingest_job_task.pop_request()
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error, job.stages), ("failed", "HTTP 503", {}))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(self.client.get(reverse("weather:ingest-job", args=[job.pk + 1])).status_code, 404)
+
+    @override_settings(INGEST_INLINE=True)
+    @mock.patch("weather.tasks.run_ingest_job_task.apply_async")
+    def test_inline_ingest_is_opt_in(self, apply_mock):
+        content = (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        url = "https://example.com/Tmax/date/UK.txt"
+        with mock.patch("weather.services.metoffice.fetch_dataset_text_by_url", return_value=(content, url)):
+            response = self.client.post(reverse("weather:ingest"), {"url": url}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "succeeded")
+        apply_mock.assert_not_called()
 
     @mock.patch("weather.tasks.ingest_metoffice_task.delay")
     def test_trigger_endpoint_enqueues_task(self, delay_mock):
@@ -141,6 +1413,88 @@ class DatasetIngestAPITests(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertIn("regions", response.data)
 
+    def test_trigger_validation_resolves_codes_in_one_query_per_model(self):
+        regions = list(Region.objects.values_list("code", flat=True))
+        parameters = list(Parameter.objects.values_list("code", flat=True))
+        payload = {
+            "regions": [code.lower() for code in regions] + regions,
+            "parameters": [code.upper() for code in parameters],
+        }
+        reference.clear()
+        with self.assertNumQueries(2):
+            self.assertTrue(IngestTriggerSerializer(data=payload).is_valid())
+        with self.assertNumQueries(0):
+            serializer = IngestTriggerSerializer(data=payload)
+            serializer.is_valid()
+        self.assertEqual(serializer.validated_data["regions"], regions)
+        self.assertEqual(serializer.validated_data["parameters"], parameters)
+
+    def test_code_lookup_follows_reference_data_changes(self):
+        self.assertEqual(reference.resolve_codes(Region, ["atlantis"])[1], ["atlantis"])
+        region = Region.objects.create(code="ATLANTIS", name="Atlantis", dataset_slug="Atlantis")
+        self.assertEqual(reference.resolve_codes(Region, ["atlantis"]), ([region], []))
+        region.delete()
+        self.assertEqual(reference.resolve_codes(Region, ["Atlantis"])[1], ["Atlantis"])
+
+
+class ReferenceRegistryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reference.clear()
+        # Rows these tests add without signals are rolled back behind the registry's back.
+        self.addCleanup(reference.clear)
+
+    def test_lookups_by_id_code_and_slug(self):
+        uk = Region.objects.get(code="UK")
+        with self.assertNumQueries(2):
+            registry = reference.current()
+        with self.assertNumQueries(0):
+            self.assertIs(reference.current(), registry)
+            self.assertEqual(registry.get(Region, uk.pk), uk)
+            self.assertEqual(registry.by_code(Region, "uk"), uk)
+            self.assertEqual(registry.region_by_slug(uk.dataset_slug.lower()), uk)
+            region, parameter = metoffice.resolve_models_from_url("https://example.com/Tmax/date/UK.txt")
+        self.assertEqual((region, parameter.code), (uk, "Tmax"))
+        self.assertEqual([region.code for region in registry.regions], list(Region.objects.values_list("code", flat=True)))
+        with self.assertRaises(Parameter.DoesNotExist):
+            registry.by_code(Parameter, "nope")
+
+    def test_edits_reload_the_registry(self):
+        registry = reference.current()
+        region = Region.objects.get(code="UK")
+        region.name = "United Kingdom (renamed)"
+        region.save()
+        self.assertIsNot(reference.current(), registry)
+        self.assertEqual(reference.current().by_code(Region, "UK").name, "United Kingdom (renamed)")
+
+    def test_edits_in_another_process_are_picked_up_after_the_timeout(self):
+        registry = reference.current()
+        other_process = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "other"}}
+        with override_settings(CACHES=other_process):
+            # The bump lands in the other process's cache only.
+            Region.objects.filter(code="UK").update(name="United Kingdom (renamed)")
+            Region.objects.get(code="UK").save()
+        self.assertIs(reference.current(), registry)
+
+        with mock.patch("weather.services.reference.time.monotonic", return_value=registry.expires_at):
+            self.assertEqual(reference.current().by_code(Region, "UK").name, "United Kingdom (renamed)")
+
+    def test_misses_check_the_database(self):
+        registry = reference.current()
+        # bulk_create sends no signals, like a save made where this process can't see the bump.
+        (region,) = Region.objects.bulk_create([Region(code="ATLANTIS", name="Atlantis", dataset_slug="Atlantis")])
+        self.assertEqual(registry.by_code(Region, "atlantis"), region)
+        self.assertEqual(reference.current().region_by_slug("ATLANTIS"), region)
+        self.assertEqual(reference.resolve_codes(Region, ["uk", "Atlantis", "nowhere"])[1], ["nowhere"])
+        with self.assertNumQueries(1), self.assertRaises(Region.DoesNotExist):
+            reference.current().by_code(Region, "nowhere")
+
+    def test_dashboard_page_reads_reference_data_from_the_registry(self):
+        reference.current()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("weather:dashboard"))
+        self.assertFalse([query for query in queries if '"weather_region"' in query["sql"] or '"weather_parameter"' in query["sql"]])
+
 
 class PersistRecordsRetryTests(TestCase):
     def setUp(self):
@@ -164,4 +1518,119 @@ class PersistRecordsRetryTests(TestCase):
         saved = metoffice.persist_records([record])
 
         self.assertEqual(saved, 1)
-        self.assertEqual(bulk_create_mock.call_count, 2)
\ No newline at end of file
+        self.assertEqual(bulk_create_mock.call_count, 2)
+
+
+@skipUnless(connection.vendor == "postgresql", "COPY loader requires PostgreSQL")
+class CopyLoaderTests(TestCase):
+    def setUp(self):
+        self.region = Region.objects.get(code="UK")
+        self.parameter = Parameter.objects.get(code="Tmax")
+        self.dataframe, self.last_updated = metoffice.parse_dataset(
+            (Path(settings.BASE_DIR) / "sample.txt").read_text()
+        )
+
+    def _stored(self):
+        return list(
+            ClimateRecord.objects.filter(region=self.region, parameter=self.parameter)
+            .order_by("year", "period_type", "period")
+            .values_list("year", "period_type", "period", "value", "source_last_updated")
+        )
+
+    def test_copy_loader_matches_bulk_create(self):
+        metoffice.persist_records(
+            metoffice.build_records_from_dataframe(self.dataframe, self.region, self.parameter, self.last_updated)
+        )
+        expected = self._stored()
+        ClimateRecord.objects.all().delete()
+
+        saved = metoffice.persist_dataset(self.dataframe, self.region, self.parameter, self.last_updated)
+
+        self.assertEqual(saved.inserted, len(expected))
+        self.assertEqual(self._stored(), expected)
+
+    def test_copy_loader_updates_existing_rows(self):
+        metoffice.persist_dataset(self.dataframe, self.region, self.parameter, None)
+        changed = self.dataframe.copy()
+        changed.loc[changed["year"] == 2024, "ann"] = 99.5
+
+        metoffice.persist_dataset(changed, self.region, self.parameter, self.last_updated)
+
+        record = ClimateRecord.objects.get(region=self.region, parameter=self.parameter, year=2024, period="ann")
+        self.assertEqual(record.value, Decimal("99.50"))
+        self.assertEqual(record.source_last_updated, self.last_updated)
+        self.assertEqual(len(self._stored()), len(metoffice.build_record_frame(self.dataframe)))
+
+    @override_settings(DB_LOCK_RETRY_ATTEMPTS=3, DB_LOCK_RETRY_DELAY=0)
+    def test_copy_loader_retries_on_lock(self):
+        with mock.patch(
+            "weather.services.metoffice._copy_from",
+            side_effect=[OperationalError("could not obtain lock on relation"), None],
+        ) as copy_mock:
+            saved = metoffice.persist_dataset(self.dataframe.head(1), self.region, self.parameter, None)
+        self.assertEqual(copy_mock.call_count, 2)
+        self.assertEqual(saved.inserted, len(metoffice.build_record_frame(self.dataframe.head(1))))
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are PostgreSQL-specific")
+@override_settings(API_CACHE_TIMEOUT=0, SERIES_CACHE_MAX_BYTES=0)
+class RecordQueryPlanTests(TransactionTestCase):
+    # Outside a transaction so VACUUM can run; the seeded regions and parameters are restored afterwards.
+    serialized_rollback = True
+
+    def setUp(self):
+        reference.clear()
+        self.addCleanup(reference.clear)
+        dataframe, last_updated = metoffice.parse_dataset((Path(settings.BASE_DIR) / "sample.txt").read_text())
+        metoffice.persist_dataset(dataframe, Region.objects.get(code="UK"), Parameter.objects.get(code="Tmax"), last_updated)
+        # Pad, rewrite, vacuum and analyse the table so the plans see realistic
+        # statistics, visibility and index sizes rather than whatever earlier
+        # tests and autovacuum left behind, and make sequential scans a last resort.
+        benchmarks.pad_records(20_000)
+        with connection.cursor() as cursor:
+            cursor.execute(f"VACUUM FULL {ClimateRecord._meta.db_table}")
+            cursor.execute(f"VACUUM ANALYZE {ClimateRecord._meta.db_table}")
+            cursor.execute("SET enable_seqscan = off")
+        self.addCleanup(connection.cursor().execute, "RESET enable_seqscan")
+
+    def _plans(self, url, params):
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(self.client.get(url, params).status_code, 200)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in captured.captured_queries:
+                cursor.execute(f"EXPLAIN {query['sql']}")
+                plans.append("\n".join(row[0] for row in cursor.fetchall()))
+        return plans
+
+    def assertPlansProbeDatasetById(self, plans):
+        for plan in plans:
+            self.assertNotIn("Seq Scan", plan)
+            # Codes are resolved to ids once, then an index is probed by both ids.
+            self.assertIn("Index Scan using region_code_upper_idx", plan)
+            self.assertIn("Index Scan using parameter_code_upper_idx", plan)
+            self.assertRegex(plan, r"Index Cond: \(\((region|parameter)_id = \$\d\) AND \((region|parameter)_id = \$\d\)")
+
+    def test_filtered_list_probes_dataset_by_id(self):
+        plans = self._plans(
+            reverse("weather:records-list"),
+            {"region": "uk", "parameter": "tmax", "period_type": "month", "period": "JAN", "start_year": 1990},
+        )
+        self.assertEqual(len(plans), 2)  # count + page
+        self.assertPlansProbeDatasetById(plans)
+        # The count is answered from the covering dataset index alone.
+        self.assertIn("Index Only Scan using climaterecord_dataset_idx", plans[0])
+
+    def test_raw_summary_probes_dataset_by_id(self):
+        with mock.patch("weather.services.rollups.summarise", return_value=None):
+            plans = self._plans(reverse("weather:records-summary"), {"region": "UK", "parameter": "Tmax", "period": "ann"})
+        self.assertPlansProbeDatasetById(plans)
+        for plan in plans:
+            self.assertIn("Index Only Scan using climaterecord_dataset_idx", plan)
+
+    def test_keyset_page_seeks_keyset_index(self):
+        cursor = KeysetPagination.encode_cursor((1990, "jan", 0))
+        plans = self._plans(reverse("weather:records-list"), {"pagination": "keyset", "cursor": cursor})
+        self.assertEqual(len(plans), 1)
+        self.assertIn("Index Scan using climaterecord_keyset_idx", plans[0])
+        self.assertNotIn("Seq Scan", plans[0])
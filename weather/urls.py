@@ -13,7 +13,11 @@ router.register("records", api.ClimateRecordViewSet, basename="records")
 urlpatterns = [
     path("", views.DashboardView.as_view(), name="dashboard"),
     path("api/", include(router.urls)),
+    path("api/series/", api.SeriesView.as_view(), name="series"),
+    path("api/compare/", api.ComparisonView.as_view(), name="compare"),
+    path("api/dashboard/", api.DashboardDataView.as_view(), name="dashboard-data"),
     path("api/ingest/", api.DatasetIngestView.as_view(), name="ingest"),
     path("api/ingest/trigger/", api.DatasetIngestTriggerView.as_view(), name="ingest-trigger"),
+    path("api/ingest/jobs/<int:pk>/", api.IngestJobView.as_view(), name="ingest-job"),
 ]
 
@@ -1,6 +1,8 @@
 from django.views.generic import TemplateView
 
 from .models import Parameter, Region
+from .services import dashboard, reference, series
+from .services.series_cache import datasets
 
 
 class DashboardView(TemplateView):
@@ -8,10 +10,24 @@ class DashboardView(TemplateView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        regions = Region.objects.all()
-        parameters = Parameter.objects.all()
+        registry = reference.current()
+        regions = registry.regions
+        parameters = registry.parameters
         context["regions"] = regions
         context["parameters"] = parameters
-        context["default_region_code"] = regions.first().code if regions else ""
-        context["default_parameter_code"] = parameters.first().code if parameters else ""
+        context["default_region_code"] = regions[0].code if regions else ""
+        context["default_parameter_code"] = parameters[0].code if parameters else ""
+        context["default_period_type"] = dashboard.DEFAULT_PERIOD_TYPE
+        context["chart_points"] = dashboard.CHART_POINTS
+        # The default selection's payload is embedded so the first paint needs no API call.
+        context["dashboard_data"] = (
+            self._default_payload(regions[0], parameters[0]) if regions and parameters else None
+        )
         return context
+
+    @staticmethod
+    def _default_payload(region: Region, parameter: Parameter) -> dict:
+        dataset = datasets.get(region.code, parameter.code) or series.load_dataset(region, parameter)
+        return dashboard.build_payload(
+            dataset, {"period_type": dashboard.DEFAULT_PERIOD_TYPE}, max_points=dashboard.CHART_POINTS
+        )